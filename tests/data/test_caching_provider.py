@@ -0,0 +1,154 @@
+"""Read-through provider cache tests."""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+from pathlib import Path
+from tempfile import TemporaryDirectory
+import unittest
+
+import duckdb
+import pandas as pd
+
+from tradepilot import db
+from tradepilot.data.caching_provider import CachingProvider
+from tradepilot.data.mock_provider import MockProvider
+
+
+class RecordingProvider(MockProvider):
+    """Mock provider with window-stable bars that records upstream calls."""
+
+    def __init__(self) -> None:
+        self.calls: list[tuple[str, str, str]] = []
+        self.answer_empty = False
+
+    def get_stock_catalog(self) -> pd.DataFrame:
+        self.calls.append(("stock_catalog", "", ""))
+        return pd.DataFrame({"code": ["600519"], "name": ["贵州茅台"]})
+
+    def get_stock_daily(
+        self, stock_code: str, start_date: str, end_date: str
+    ) -> pd.DataFrame:
+        self.calls.append((stock_code, start_date, end_date))
+        if self.answer_empty:
+            return pd.DataFrame()
+        dates = pd.bdate_range(start_date, end_date)
+        return pd.DataFrame(
+            {
+                "date": dates,
+                "stock_code": stock_code,
+                "close": [float(day.day) for day in dates],
+            }
+        )
+
+
+class CachingProviderTests(unittest.TestCase):
+    """Verify cached windows, gap fetches and freshness rules."""
+
+    def setUp(self) -> None:
+        self._temp_dir = TemporaryDirectory()
+        root = Path(self._temp_dir.name)
+        self.conn = duckdb.connect(str(root / "cache.duckdb"))
+        db._init_tables(self.conn)
+        self.now = datetime(2025, 3, 14, 10, 0)
+        self.upstream = RecordingProvider()
+        self.provider = CachingProvider(
+            self.upstream,
+            conn=self.conn,
+            cache_root=root / "provider_cache",
+            clock=lambda: self.now,
+        )
+
+    def tearDown(self) -> None:
+        self.conn.close()
+        self._temp_dir.cleanup()
+
+    def test_repeat_window_is_served_from_cache_and_extensions_fetch_gaps(
+        self,
+    ) -> None:
+        first = self.provider.get_stock_daily("600519", "2025-01-01", "2025-01-31")
+        again = self.provider.get_stock_daily("600519", "2025-01-06", "2025-01-10")
+        wider = self.provider.get_stock_daily("600519", "2024-12-20", "2025-02-07")
+
+        self.assertEqual(
+            self.upstream.calls,
+            [
+                ("600519", "2025-01-01", "2025-01-31"),
+                ("600519", "2024-12-20", "2024-12-31"),
+                ("600519", "2025-02-03", "2025-02-07"),
+            ],
+        )
+        self.assertEqual(len(first), 23)
+        self.assertEqual(len(again), 5)
+        self.assertEqual(
+            pd.to_datetime(wider["date"]).dt.date.tolist(),
+            [day.date() for day in pd.bdate_range("2024-12-20", "2025-02-07")],
+        )
+
+    def test_today_stays_refetchable_until_the_close(self) -> None:
+        self.provider.get_stock_daily("600519", "2025-03-10", "2025-03-14")
+        self.provider.get_stock_daily("600519", "2025-03-10", "2025-03-14")
+        self.now = datetime(2025, 3, 14, 16, 0)
+        self.provider.get_stock_daily("600519", "2025-03-10", "2025-03-14")
+        self.provider.get_stock_daily("600519", "2025-03-10", "2025-03-14")
+
+        self.assertEqual(
+            self.upstream.calls,
+            [
+                ("600519", "2025-03-10", "2025-03-14"),
+                ("600519", "2025-03-14", "2025-03-14"),
+                ("600519", "2025-03-14", "2025-03-14"),
+            ],
+        )
+        files = self.conn.execute("SELECT COUNT(*) FROM provider_cache_files")
+        self.assertEqual(files.fetchone()[0], 2)
+
+    def test_empty_refetch_keeps_the_cached_unsettled_bar(self) -> None:
+        self.provider.get_stock_daily("600519", "2025-03-10", "2025-03-14")
+        self.upstream.answer_empty = True
+        window = self.provider.get_stock_daily("600519", "2025-03-10", "2025-03-14")
+
+        self.assertEqual(len(self.upstream.calls), 2)
+        self.assertEqual(
+            pd.to_datetime(window["date"]).dt.date.tolist()[-1],
+            datetime(2025, 3, 14).date(),
+        )
+        files = self.conn.execute("SELECT COUNT(*) FROM provider_cache_files")
+        self.assertEqual(files.fetchone()[0], 1)
+
+    def test_refreshed_view_refetches_cached_windows(self) -> None:
+        self.provider.get_stock_daily("600519", "2025-01-06", "2025-01-10")
+        refreshed = self.provider.refreshed()
+        refreshed.get_stock_daily("600519", "2025-01-06", "2025-01-10")
+        refreshed.get_stock_catalog()
+        refreshed.get_stock_catalog()
+        window = self.provider.get_stock_daily("600519", "2025-01-06", "2025-01-10")
+
+        self.assertEqual(
+            self.upstream.calls,
+            [
+                ("600519", "2025-01-06", "2025-01-10"),
+                ("600519", "2025-01-06", "2025-01-10"),
+                ("stock_catalog", "", ""),
+                ("stock_catalog", "", ""),
+            ],
+        )
+        self.assertEqual(len(window), 5)
+        files = self.conn.execute(
+            "SELECT COUNT(*) FROM provider_cache_files WHERE dataset_name = ?",
+            ["stock_daily"],
+        )
+        self.assertEqual(files.fetchone()[0], 1)
+
+    def test_catalog_snapshot_refreshes_after_its_ttl(self) -> None:
+        self.provider.get_stock_catalog()
+        cached = self.provider.get_stock_catalog()
+        self.now += timedelta(days=1)
+        self.provider.get_stock_catalog()
+
+        self.assertEqual(cached["code"].tolist(), ["600519"])
+        self.assertEqual(len(self.upstream.calls), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,103 @@
+"""Source rate limiter and request executor tests."""
+
+from __future__ import annotations
+
+import threading
+import unittest
+
+from tradepilot.data.rate_limit import (
+    RateLimitedClient,
+    RateLimiter,
+    RequestExecutor,
+    TokenBucket,
+    parse_quotas,
+)
+
+
+class FakeClock:
+    """Monotonic clock that only advances when a caller sleeps."""
+
+    def __init__(self) -> None:
+        self.now = 0.0
+        self.sleeps: list[float] = []
+
+    def __call__(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+class RecordingApi:
+    """API stand-in recording which endpoints were called."""
+
+    source = "fake"
+
+    def __init__(self) -> None:
+        self.calls: list[str] = []
+
+    def daily(self, trade_date: str) -> str:
+        self.calls.append(f"daily:{trade_date}")
+        return trade_date
+
+    def trade_cal(self) -> str:
+        self.calls.append("trade_cal")
+        return "calendar"
+
+
+class RateLimitTests(unittest.TestCase):
+    """Verify token pacing, family routing and ordered fan-out."""
+
+    def test_bucket_allows_a_burst_then_paces_to_the_quota(self) -> None:
+        clock = FakeClock()
+        bucket = TokenBucket(120, capacity=2, clock=clock, sleep=clock.sleep)
+
+        waits = [bucket.acquire() for _ in range(4)]
+
+        self.assertEqual(waits, [0.0, 0.0, 0.5, 0.5])
+        self.assertEqual(clock.now, 1.0)
+
+    def test_client_calls_draw_from_their_endpoint_family(self) -> None:
+        clock = FakeClock()
+        limiter = RateLimiter(
+            {"tushare": 60, "tushare.quotes": 600}, clock=clock, sleep=clock.sleep
+        )
+        api = RecordingApi()
+        client = RateLimitedClient(api, limiter, {"daily": "tushare.quotes"}, "tushare")
+
+        self.assertEqual(client.source, "fake")
+        for day in ("20250206", "20250207"):
+            client.daily(day)
+        client.trade_cal()
+        client.trade_cal()
+
+        self.assertEqual(
+            api.calls, ["daily:20250206", "daily:20250207", "trade_cal", "trade_cal"]
+        )
+        self.assertEqual(clock.sleeps, [1.0])
+        self.assertEqual(limiter.quota("tushare.reference"), 60)
+        self.assertEqual(limiter.quota("akshare.baidu"), 200)
+
+    def test_executor_keeps_order_and_runs_requests_concurrently(self) -> None:
+        barrier = threading.Barrier(3, timeout=5)
+
+        def fetch(item: int) -> int:
+            barrier.wait()
+            return item * 10
+
+        self.assertEqual(RequestExecutor(3).map(fetch, [1, 2, 3]), [10, 20, 30])
+        self.assertEqual(RequestExecutor(1).map(str, [1, 2]), ["1", "2"])
+
+    def test_parse_quotas_rejects_malformed_entries(self) -> None:
+        self.assertEqual(
+            parse_quotas(" tushare.quotes=450, akshare=90 ,"),
+            {"tushare.quotes": 450.0, "akshare": 90.0},
+        )
+        for text in ("tushare", "akshare=fast", "=10", "tushare=0"):
+            with self.assertRaises(ValueError):
+                parse_quotas(text)
+
+
+if __name__ == "__main__":
+    unittest.main()
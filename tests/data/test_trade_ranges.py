@@ -0,0 +1,268 @@
+"""Materialized trade-date range tests."""
+
+from __future__ import annotations
+
+from datetime import date, datetime
+from pathlib import Path
+from tempfile import TemporaryDirectory
+import unittest
+from unittest.mock import patch
+
+import duckdb
+import pandas as pd
+
+from tradepilot import db
+from tradepilot.config import DataProviderType
+from tradepilot.data.mock_provider import MockProvider
+from tradepilot.data.trade_ranges import (
+    materialized_ranges,
+    missing_trade_ranges,
+    record_materialized_range,
+    record_trade_dates,
+    subtract_ranges,
+)
+from tradepilot.ingestion.models import SyncRequest
+from tradepilot.ingestion.service import IngestionService
+
+_BAR_COLUMNS = [
+    "stock_code",
+    "date",
+    "open",
+    "high",
+    "low",
+    "close",
+    "volume",
+    "amount",
+    "turnover",
+]
+
+
+class RecordingIndexProvider(MockProvider):
+    """Mock provider that records index-daily windows."""
+
+    def __init__(self) -> None:
+        self.calls: list[tuple[str, str, str]] = []
+
+    def get_index_daily(
+        self, index_code: str, start_date: str, end_date: str
+    ) -> pd.DataFrame:
+        self.calls.append((index_code, start_date, end_date))
+        return super().get_index_daily(index_code, start_date, end_date)
+
+
+class RecordingStockProvider(MockProvider):
+    """Mock provider that records per-code stock-daily windows."""
+
+    def __init__(self) -> None:
+        self.calls: list[tuple[str, str, str]] = []
+
+    def get_stock_daily(
+        self, stock_code: str, start_date: str, end_date: str
+    ) -> pd.DataFrame:
+        self.calls.append((stock_code, start_date, end_date))
+        return super().get_stock_daily(stock_code, start_date, end_date)
+
+    def get_stock_weekly(
+        self, stock_code: str, start_date: str, end_date: str
+    ) -> pd.DataFrame:
+        return pd.DataFrame(columns=_BAR_COLUMNS)
+
+    def get_stock_monthly(
+        self, stock_code: str, start_date: str, end_date: str
+    ) -> pd.DataFrame:
+        return pd.DataFrame(columns=_BAR_COLUMNS)
+
+
+class CrossSectionClient:
+    """Enabled Tushare client stand-in answering market-wide queries."""
+
+    enabled = True
+
+    def __init__(self, suspended: tuple[str, ...] = ()) -> None:
+        self.sessions: list[str] = []
+        # Sessions on which every requested code is suspended.
+        self.suspended = set(suspended)
+
+    def get_stock_daily_cross_section(
+        self, trade_date: str, stock_codes: list[str]
+    ) -> tuple[pd.DataFrame, bool]:
+        self.sessions.append(trade_date)
+        codes = [] if trade_date in self.suspended else sorted(stock_codes)
+        frame = pd.DataFrame(
+            {"stock_code": codes, "date": pd.Timestamp(trade_date)}, dtype=object
+        )
+        for column in _BAR_COLUMNS[2:]:
+            frame[column] = 1.0
+        return frame.loc[:, _BAR_COLUMNS], True
+
+
+class TradeRangeTests(unittest.TestCase):
+    """Verify interval bookkeeping against the trading calendar."""
+
+    def setUp(self) -> None:
+        self._temp_dir = TemporaryDirectory()
+        self.conn = duckdb.connect(str(Path(self._temp_dir.name) / "ranges.duckdb"))
+        db._init_tables(self.conn)
+        # New Year's Day, then the Spring Festival closure from 01-28 to 02-04.
+        holidays = {date(2025, 1, 1), *pd.date_range("2025-01-28", "2025-02-04").date}
+        self.conn.executemany(
+            "INSERT INTO trading_calendar VALUES ('SSE', ?, ?, NULL)",
+            [
+                [day, day.weekday() < 5 and day not in holidays]
+                for day in pd.date_range("2025-01-01", "2025-02-07").date
+            ],
+        )
+
+    def tearDown(self) -> None:
+        self.conn.close()
+        self._temp_dir.cleanup()
+
+    def test_subtract_ranges_returns_uncovered_days(self) -> None:
+        covered = [
+            (date(2025, 1, 5), date(2025, 1, 10)),
+            (date(2025, 1, 11), date(2025, 1, 12)),
+        ]
+
+        self.assertEqual(
+            subtract_ranges(covered, date(2025, 1, 1), date(2025, 1, 20)),
+            [
+                (date(2025, 1, 1), date(2025, 1, 4)),
+                (date(2025, 1, 13), date(2025, 1, 20)),
+            ],
+        )
+        self.assertEqual(
+            subtract_ranges(covered, date(2025, 1, 6), date(2025, 1, 9)), []
+        )
+
+    def test_missing_ranges_skip_closed_sessions(self) -> None:
+        record_materialized_range(
+            self.conn, "index_daily", "000001", date(2025, 1, 2), date(2025, 1, 27)
+        )
+
+        self.assertEqual(
+            missing_trade_ranges(
+                self.conn, "index_daily", "000001", date(2025, 1, 1), date(2025, 2, 7)
+            ),
+            [(date(2025, 2, 5), date(2025, 2, 7))],
+        )
+        self.assertEqual(
+            missing_trade_ranges(
+                self.conn, "index_daily", "000001", date(2025, 1, 4), date(2025, 2, 4)
+            ),
+            [],
+        )
+
+    def test_seeded_runs_break_at_skipped_sessions(self) -> None:
+        held = [
+            day.date()
+            for day in pd.bdate_range("2025-01-20", "2025-02-07")
+            if day.date() != date(2025, 1, 22)
+        ]
+        record_trade_dates(self.conn, "stock_daily", "600519", held)
+
+        self.assertEqual(
+            materialized_ranges(self.conn, "stock_daily", "600519"),
+            [
+                (date(2025, 1, 20), date(2025, 1, 21)),
+                (date(2025, 1, 23), date(2025, 2, 7)),
+            ],
+        )
+
+    def test_market_sync_fetches_only_sessions_not_yet_stored(self) -> None:
+        upstream = RecordingIndexProvider()
+        service = IngestionService()
+        request = SyncRequest(
+            index_codes=["000001"], start_date="2025-01-20", end_date="2025-02-07"
+        )
+        with (
+            patch("tradepilot.ingestion.service.get_provider", return_value=upstream),
+            patch("tradepilot.ingestion.service.get_conn", return_value=self.conn),
+            patch(
+                "tradepilot.ingestion.service.market_now",
+                return_value=datetime(2025, 2, 7, 16, 0),
+            ),
+            patch.object(service, "_sync_tushare_supplement", return_value=0),
+        ):
+            self.conn.execute("""
+                INSERT INTO index_daily (index_code, date, close)
+                SELECT '000001', range::DATE, 3200.0
+                FROM range(DATE '2025-01-20', DATE '2025-02-07', INTERVAL 1 DAY)
+                WHERE isodow(range) < 6
+                """)
+            service._do_market_sync(request)
+            service._do_market_sync(request)
+
+        self.assertEqual(upstream.calls, [("000001", "2025-02-07", "2025-02-07")])
+
+    def test_market_sync_plans_per_date_or_per_code_fetches(self) -> None:
+        upstream = RecordingStockProvider()
+        client = CrossSectionClient()
+        service = IngestionService()
+        service._tushare = client
+        watchlist = SyncRequest(
+            stock_codes=["600519", "000001", "300750"],
+            start_date="2025-02-06",
+            end_date="2025-02-07",
+        )
+        history = SyncRequest(
+            stock_codes=["601318"], start_date="2025-01-02", end_date="2025-02-07"
+        )
+        with (
+            patch("tradepilot.ingestion.service.get_provider", return_value=upstream),
+            patch("tradepilot.ingestion.service.get_conn", return_value=self.conn),
+            patch(
+                "tradepilot.ingestion.service.DATA_PROVIDER", DataProviderType.TUSHARE
+            ),
+            patch(
+                "tradepilot.ingestion.service.market_now",
+                return_value=datetime(2025, 2, 7, 16, 0),
+            ),
+            patch.object(service, "_sync_tushare_supplement", return_value=0),
+        ):
+            service._do_market_sync(watchlist)
+            service._do_market_sync(history)
+            service._do_market_sync(watchlist)
+
+        self.assertEqual(client.sessions, ["2025-02-06", "2025-02-07"])
+        self.assertEqual(upstream.calls, [("601318", "2025-01-02", "2025-02-07")])
+        stored = self.conn.execute(
+            "SELECT COUNT(*) FROM stock_daily WHERE date >= DATE '2025-02-06'"
+        )
+        self.assertEqual(stored.fetchone()[0], 8)
+
+    def test_session_with_every_code_suspended_counts_as_answered(self) -> None:
+        client = CrossSectionClient(suspended=("2025-02-06",))
+        service = IngestionService()
+        service._tushare = client
+        request = SyncRequest(
+            stock_codes=["600519", "000001", "300750"],
+            start_date="2025-02-06",
+            end_date="2025-02-07",
+        )
+        with (
+            patch(
+                "tradepilot.ingestion.service.get_provider",
+                return_value=RecordingStockProvider(),
+            ),
+            patch("tradepilot.ingestion.service.get_conn", return_value=self.conn),
+            patch(
+                "tradepilot.ingestion.service.DATA_PROVIDER", DataProviderType.TUSHARE
+            ),
+            patch(
+                "tradepilot.ingestion.service.market_now",
+                return_value=datetime(2025, 2, 7, 16, 0),
+            ),
+            patch.object(service, "_sync_tushare_supplement", return_value=0),
+        ):
+            service._do_market_sync(request)
+            service._do_market_sync(request)
+
+        self.assertEqual(client.sessions, ["2025-02-06", "2025-02-07"])
+        self.assertEqual(
+            materialized_ranges(self.conn, "stock_daily", "600519"),
+            [(date(2025, 2, 6), date(2025, 2, 7))],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,153 @@
+"""Tushare client normalization tests."""
+
+from __future__ import annotations
+
+from pathlib import Path
+from tempfile import TemporaryDirectory
+import unittest
+from unittest.mock import patch
+
+import duckdb
+import pandas as pd
+
+from tradepilot import db
+from tradepilot.data.tushare_client import TushareClient
+
+
+class CrossSectionPro:
+    """Tushare pro API stand-in answering trade-date queries."""
+
+    def __init__(self) -> None:
+        self.calls: list[str] = []
+
+    def daily(self, trade_date: str, fields: str) -> pd.DataFrame:
+        self.calls.append("daily")
+        return self._bars(["600519.SH", "000001.SZ", "300750.SZ"], trade_date)
+
+    def fund_daily(self, trade_date: str, fields: str) -> pd.DataFrame:
+        self.calls.append("fund_daily")
+        return self._bars(["510300.SH"], trade_date)
+
+    def daily_basic(self, trade_date: str, fields: str) -> pd.DataFrame:
+        self.calls.append("daily_basic")
+        return pd.DataFrame(
+            {"ts_code": ["600519.SH", "000001.SZ"], "turnover_rate": [0.5, 1.5]}
+        )
+
+    def _bars(self, codes: list[str], trade_date: str) -> pd.DataFrame:
+        return pd.DataFrame(
+            {
+                "ts_code": codes,
+                "trade_date": trade_date,
+                "open": 1.0,
+                "high": 2.0,
+                "low": 0.5,
+                "close": 1.5,
+                "vol": 100.0,
+                "amount": 150.0,
+            }
+        )
+
+
+class RangeQueryPro:
+    """Tushare pro API stand-in recording market range queries."""
+
+    def __init__(self) -> None:
+        self.calls: list[tuple[str, str, str, str]] = []
+
+    def daily_info(self, start_date: str, end_date: str, fields: str) -> pd.DataFrame:
+        self.calls.append(("daily_info", start_date, end_date, ""))
+        frame = pd.DataFrame(
+            {"trade_date": [start_date], "ts_code": "SH_A", "com_count": 1700}
+        )
+        for column in fields.split(","):
+            if column not in frame.columns:
+                frame[column] = 1.0
+        return frame
+
+    def margin(self, start_date: str, end_date: str, exchange_id: str) -> pd.DataFrame:
+        self.calls.append(("margin", start_date, end_date, exchange_id))
+        return pd.DataFrame(
+            {"trade_date": [start_date, end_date], "rzye": 1.0, "rzmre": 0.1}
+        )
+
+
+class TushareClientTests(unittest.TestCase):
+    """Verify market-wide queries and calendar-driven range requests."""
+
+    def test_cross_section_fans_out_requested_codes(self) -> None:
+        pro = CrossSectionPro()
+        client = TushareClient()
+        client._pro = pro
+
+        frame, reported = client.get_stock_daily_cross_section(
+            "2025-02-07", ["600519", "000001", "510300"]
+        )
+
+        self.assertTrue(reported)
+        self.assertEqual(pro.calls, ["daily", "fund_daily", "daily_basic"])
+        self.assertEqual(frame["stock_code"].tolist(), ["000001", "510300", "600519"])
+        self.assertEqual(frame["date"].tolist(), [pd.Timestamp("2025-02-07")] * 3)
+        self.assertEqual(frame["turnover"].tolist()[::2], [1.5, 0.5])
+        self.assertTrue(pd.isna(frame["turnover"].iloc[1]))
+
+        market, _ = client.get_stock_daily_cross_section("2025-02-07")
+
+        self.assertEqual(len(market), 3)
+        self.assertEqual(pro.calls.count("fund_daily"), 1)
+
+    def test_cross_section_skips_turnover_when_no_requested_code_traded(
+        self,
+    ) -> None:
+        pro = CrossSectionPro()
+        client = TushareClient()
+        client._pro = pro
+
+        frame, reported = client.get_stock_daily_cross_section("2025-02-07", ["688001"])
+
+        self.assertTrue(reported)
+        self.assertTrue(frame.empty)
+        self.assertEqual(pro.calls, ["daily"])
+
+    def test_market_loops_query_ranges_of_open_sessions(self) -> None:
+        with TemporaryDirectory() as temp_dir:
+            conn = duckdb.connect(str(Path(temp_dir) / "calendar.duckdb"))
+            db._init_tables(conn)
+            closed = set(pd.date_range("2025-01-28", "2025-02-04").date)
+            conn.executemany(
+                "INSERT INTO trading_calendar VALUES ('SSE', ?, ?, NULL)",
+                [
+                    [day, day.weekday() < 5 and day not in closed]
+                    for day in pd.date_range("2025-01-25", "2025-02-09").date
+                ],
+            )
+            pro = RangeQueryPro()
+            client = TushareClient()
+            client._pro = pro
+            with (
+                patch("tradepilot.data.tushare_client.get_conn", return_value=conn),
+                patch("tradepilot.data.tushare_client._MARGIN_WINDOW_SESSIONS", 2),
+            ):
+                stats = client.get_market_daily_stats("2025-01-25", "2025-02-09")
+                margin = client.get_margin_data("2025-01-25", "2025-02-09")
+                weekend = client.get_market_daily_stats("2025-02-08", "2025-02-09")
+            conn.close()
+
+        self.assertEqual(
+            pro.calls,
+            [
+                ("daily_info", "20250127", "20250207", ""),
+                ("margin", "20250127", "20250205", "SSE"),
+                ("margin", "20250127", "20250205", "SZSE"),
+                ("margin", "20250206", "20250207", "SSE"),
+                ("margin", "20250206", "20250207", "SZSE"),
+            ],
+        )
+        self.assertEqual(stats["listed_count"].tolist(), [1700])
+        self.assertEqual(len(margin), 8)
+        self.assertEqual(margin["stock_code"].tolist()[:2], ["SSE", "SSE"])
+        self.assertTrue(weekend.empty)
+
+
+if __name__ == "__main__":
+    unittest.main()
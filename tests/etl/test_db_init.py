@@ -89,6 +89,80 @@ class DuckDBInitTests(unittest.TestCase):
         self.assertIs(first_conn, second_conn)
         self.assertTrue(db._initialized)
 
+    def test_allocate_stage_b_ids_reserves_blocks_past_existing_ids(self) -> None:
+        """Skip hand-written ids once and serve later ids from the block."""
+
+        conn = db.get_conn()
+        conn.execute("""
+            INSERT INTO etl_ingestion_runs (
+                run_id, job_name, dataset_name, source_name,
+                trigger_mode, status, started_at
+            ) VALUES (
+                40, 'legacy', 'reference.instruments', 'tushare',
+                'manual', 'success', CURRENT_TIMESTAMP
+            )
+            """)
+
+        first = db.allocate_stage_b_ids(conn, "etl_ingestion_runs_run_id_seq", 2)
+        second = db.allocate_stage_b_ids(conn, "etl_ingestion_runs_run_id_seq")
+        sequence_value = conn.execute(
+            "SELECT currval('etl_ingestion_runs_run_id_seq')"
+        ).fetchone()[0]
+
+        self.assertEqual(first, [41, 42])
+        self.assertEqual(second, [43])
+        self.assertGreaterEqual(sequence_value, 40 + db._ID_BLOCK_SIZE)
+
+    def test_allocate_stage_b_ids_is_disjoint_across_threads(self) -> None:
+        """Hand concurrent workers non-overlapping ids."""
+
+        conn = db.get_conn()
+        allocated: list[int] = []
+        guard = threading.Lock()
+
+        def allocate() -> None:
+            cursor = conn.cursor()
+            try:
+                for _ in range(50):
+                    ids = db.allocate_stage_b_ids(
+                        cursor, "etl_validation_results_validation_id_seq", 7
+                    )
+                    with guard:
+                        allocated.extend(ids)
+            finally:
+                cursor.close()
+
+        threads = [threading.Thread(target=allocate) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(allocated), 4 * 50 * 7)
+        self.assertEqual(len(set(allocated)), len(allocated))
+
+    def test_allocate_stage_b_ids_restarts_for_a_recreated_file(self) -> None:
+        """Drop cached blocks when a database file is replaced at its path."""
+
+        conn = db.get_conn()
+        db.allocate_stage_b_ids(conn, "etl_raw_batches_raw_batch_id_seq", 3)
+        conn.close()
+        db.DB_PATH.unlink()
+        db._thread_local = threading.local()
+        db._initialized = False
+
+        recreated = db.allocate_stage_b_ids(
+            db.get_conn(), "etl_raw_batches_raw_batch_id_seq", 2
+        )
+
+        self.assertEqual(recreated, [1, 2])
+
+    def test_allocate_stage_b_ids_rejects_unknown_sequences(self) -> None:
+        """Only allocate from registered Stage B sequences."""
+
+        with self.assertRaises(KeyError):
+            db.allocate_stage_b_ids(db.get_conn(), "legacy_seq")
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,118 @@
+"""Contract tests for the DuckDB lakehouse query layer."""
+
+from __future__ import annotations
+
+from datetime import date, timedelta
+from pathlib import Path
+from tempfile import TemporaryDirectory
+import unittest
+
+import duckdb
+import pandas as pd
+
+from tradepilot import db
+from tradepilot.etl.models import StorageZone
+from tradepilot.etl.query import read_dataset_arrow
+from tradepilot.etl.storage import (
+    read_dataset_partition,
+    write_dataset_delta_parquet,
+    write_dataset_parquet,
+)
+
+_DATASET = "market.etf_daily"
+_KEYS = ["code", "trade_date"]
+
+
+def _month_frame(year: int, month: int) -> pd.DataFrame:
+    start = date(year, month, 1)
+    days = [start + timedelta(days=offset) for offset in range(28)]
+    return pd.DataFrame(
+        {
+            "code": ["a"] * len(days),
+            "trade_date": days,
+            "close": [float(day.day) for day in days],
+            "volume": [day.day * 100 for day in days],
+        }
+    )
+
+
+class QueryReadTests(unittest.TestCase):
+    """Verify projected, date-bounded reads through DuckDB."""
+
+    def test_read_matches_partition_merge_inside_window(self) -> None:
+        """Merge deltas like the pandas reader and keep only the window."""
+
+        parts = [("year", 2026), ("month", "04")]
+        with TemporaryDirectory() as temp_dir:
+            root = Path(temp_dir)
+            write_dataset_parquet(
+                _month_frame(2026, 4), _DATASET, StorageZone.NORMALIZED, parts, root
+            )
+            for run_id, close in ((12, 40.0), (3, 30.0)):
+                delta = _month_frame(2026, 4).iloc[[5]].assign(close=close)
+                write_dataset_delta_parquet(
+                    delta, _DATASET, StorageZone.NORMALIZED, parts, run_id, root
+                )
+
+            table = read_dataset_arrow(
+                _DATASET,
+                StorageZone.NORMALIZED,
+                _KEYS,
+                start=date(2026, 4, 3),
+                end=date(2026, 4, 9),
+                columns=["trade_date", "close"],
+                lakehouse_root=root,
+            )
+            merged = read_dataset_partition(
+                _DATASET, StorageZone.NORMALIZED, parts, _KEYS, lakehouse_root=root
+            )
+
+        expected = merged[
+            merged["trade_date"].between(date(2026, 4, 3), date(2026, 4, 9))
+        ]
+        self.assertEqual(table.column_names, ["trade_date", "close"])
+        self.assertEqual(
+            table.column("trade_date").to_pylist(), expected["trade_date"].tolist()
+        )
+        self.assertEqual(table.column("close").to_pylist(), expected["close"].tolist())
+        self.assertIn(40.0, table.column("close").to_pylist())
+
+    def test_cataloged_read_only_scans_overlapping_files(self) -> None:
+        """Use the manifest to skip months outside the window."""
+
+        conn = duckdb.connect()
+        db._init_tables(conn)
+        with TemporaryDirectory() as temp_dir:
+            root = Path(temp_dir)
+            for month in (1, 2, 3):
+                write_dataset_parquet(
+                    _month_frame(2026, month),
+                    _DATASET,
+                    StorageZone.NORMALIZED,
+                    [("year", 2026), ("month", f"{month:02d}")],
+                    root,
+                    conn=conn,
+                )
+            january = root / "normalized" / _DATASET / "2026" / "01"
+            (january / "part-00000.parquet").unlink()
+
+            table = read_dataset_arrow(
+                _DATASET,
+                StorageZone.NORMALIZED,
+                _KEYS,
+                start=date(2026, 2, 27),
+                end=date(2026, 3, 2),
+                lakehouse_root=root,
+                conn=conn,
+            )
+        conn.close()
+
+        self.assertEqual(
+            table.column("trade_date").to_pylist(),
+            [date(2026, 2, 27), date(2026, 2, 28), date(2026, 3, 1), date(2026, 3, 2)],
+        )
+        self.assertEqual(table.column_names, ["code", "trade_date", "close", "volume"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -2,25 +2,37 @@
 
 from __future__ import annotations
 
-from datetime import date
+from datetime import UTC, date, datetime
 import json
 from pathlib import Path
 from tempfile import TemporaryDirectory
 import threading
+import time
 import unittest
+from unittest.mock import patch
 
 import pandas as pd
+import pyarrow.parquet as pq
 
 from tradepilot import db
+from tradepilot.etl.benchmarks import (
+    benchmark_pipeline,
+    benchmark_validation_persistence,
+    compare_with_baseline,
+)
 from tradepilot.etl.datasets import DatasetDefinition
+from tradepilot.etl.manifest import list_partition_months
 from tradepilot.etl.models import (
     DatasetCategory,
     DependencyType,
     IngestionRequest,
+    PartitionLayout,
+    PartitionWriteMode,
     RunStatus,
     SourceFetchResult,
     StorageZone,
     TriggerMode,
+    ValidationResultRecord,
     ValidationStatus,
 )
 from tradepilot.etl.normalizers import (
@@ -29,13 +41,17 @@ from tradepilot.etl.normalizers import (
     MarketDailyNormalizer,
     TradingCalendarNormalizer,
 )
-from tradepilot.etl.service import ETLService
+from tradepilot.etl.service import ETLService, _BatchStream, _RssSampler
+from tradepilot.etl.storage import stored_content_hash
 from tradepilot.etl.sources.tushare import TushareSourceAdapter
 from tradepilot.etl.validators import (
+    ChunkedValidation,
     InstrumentValidator,
     MarketDailyValidator,
+    ReferenceDataCache,
     TradingCalendarValidator,
     has_blocking_failures,
+    validation_counts,
 )
 
 
@@ -148,6 +164,20 @@ class EmptyReferenceMockTushareClient(MockTushareClient):
         )
 
 
+class TwoEtfMockTushareClient(MockTushareClient):
+    """Mock client whose ETF catalog lists two funds."""
+
+    def get_etf_catalog(self) -> pd.DataFrame:
+        return pd.DataFrame(
+            {
+                "code": ["510300.SH", "510500.SH"],
+                "name": ["沪深300ETF", "中证500ETF"],
+                "list_date": ["20120528", "20130315"],
+                "delist_date": [None, None],
+            }
+        )
+
+
 class FullCalendarMockTushareClient(MockTushareClient):
     """Mock client that returns complete natural-day calendar windows."""
 
@@ -167,6 +197,23 @@ class FullCalendarMockTushareClient(MockTushareClient):
         )
 
 
+class FailingWindowMockTushareClient(FullCalendarMockTushareClient):
+    """Full-calendar mock that records fetch threads and fails one window."""
+
+    def __init__(self, failing_start: str) -> None:
+        super().__init__()
+        self.failing_start = failing_start
+        self.fetch_threads: set[str] = set()
+
+    def get_trade_calendar(
+        self, start_date: str, end_date: str, exchange: str = "SSE"
+    ) -> pd.DataFrame:
+        self.fetch_threads.add(threading.current_thread().name)
+        if start_date == self.failing_start:
+            raise RuntimeError(f"calendar endpoint unavailable for {start_date}")
+        return super().get_trade_calendar(start_date, end_date, exchange)
+
+
 class StageBSourceNormalizerValidatorTests(unittest.TestCase):
     """Verify Stage B source, normalizer, and validator contracts."""
 
@@ -456,6 +503,116 @@ class StageBSourceNormalizerValidatorTests(unittest.TestCase):
             )
         )
 
+    def test_validators_report_row_failures_as_columnar_frame(self) -> None:
+        trade_dates = pd.date_range("2026-01-01", periods=60, freq="D").date
+        daily = pd.DataFrame(
+            {
+                "instrument_id": ["510300.SH"] * 60,
+                "trade_date": trade_dates,
+                "open": [4.0] * 60,
+                "high": [4.2] * 60,
+                "low": [3.9] * 60,
+                "close": [None] * 59 + [4.1],
+                "pre_close": [4.0] * 60,
+                "change": [0.1] * 60,
+                "pct_chg": [2.5] * 60,
+                "volume": [100.0] * 60,
+                "amount": [400.0] * 60,
+            }
+        )
+        context = {"dataset_name": "market.etf_daily", "run_id": 3}
+
+        frame = MarketDailyValidator().validate_frame(daily, context)
+        records = MarketDailyValidator().validate(daily, context)
+
+        close_rows = frame[frame["check_name"] == "market_daily.close_required"]
+        self.assertEqual(len(close_rows), 51)
+        self.assertEqual(close_rows["subject_key"].iloc[0], "510300.SH|2026-01-01")
+        self.assertTrue(pd.isna(close_rows["subject_key"].iloc[-1]))
+        self.assertEqual(close_rows["metric_value"].iloc[-1], 59.0)
+        self.assertTrue(has_blocking_failures(frame))
+        self.assertEqual(len(records), len(frame))
+        self.assertEqual(
+            [record.subject_key for record in records],
+            [None if pd.isna(key) else key for key in frame["subject_key"]],
+        )
+        self.assertEqual(validation_counts(frame), validation_counts(records))
+
+    def test_chunked_validation_matches_whole_frame_validation(self) -> None:
+        daily = pd.DataFrame(
+            {
+                "instrument_id": ["510300.SH", "510500.SH", "510300.SH"],
+                "trade_date": [date(2026, 4, 24)] * 3,
+                "open": [4.0, 5.0, 4.0],
+                "high": [4.2, 5.2, 4.2],
+                "low": [3.9, 4.9, 3.9],
+                "close": [4.1, None, 4.1],
+                "pre_close": [4.0, 5.0, 4.0],
+                "change": [0.1, 0.0, 0.1],
+                "pct_chg": [2.5, 0.0, 2.5],
+                "volume": [100.0, 100.0, 100.0],
+                "amount": [400.0, 500.0, 400.0],
+            }
+        )
+        context = {"dataset_name": "market.etf_daily", "run_id": 3}
+        columns = ["check_name", "status", "subject_key", "metric_value"]
+
+        chunked = ChunkedValidation(MarketDailyValidator(), context)
+        for start in range(len(daily)):
+            chunked.add(daily.iloc[start : start + 1].reset_index(drop=True))
+        streamed = chunked.finish()
+        whole = MarketDailyValidator().validate_frame(daily, context)
+
+        def ordered(frame: pd.DataFrame) -> pd.DataFrame:
+            return frame[columns].sort_values(columns[:3]).reset_index(drop=True)
+
+        pd.testing.assert_frame_equal(ordered(streamed), ordered(whole))
+        self.assertIn(
+            "market_daily.duplicate_business_key", set(streamed["check_name"].tolist())
+        )
+
+    def test_tushare_source_batches_instruments_when_streaming(self) -> None:
+        client = MockTushareClient()
+        source = TushareSourceAdapter(client)
+
+        batches = list(
+            source.fetch_batches(
+                "market.etf_daily",
+                IngestionRequest(
+                    request_start=date(2026, 4, 24),
+                    request_end=date(2026, 4, 24),
+                    context={
+                        "instrument_ids": ["510300.SH", "510500.SH", "510300.SH"],
+                        "fetch_batch_size": 1,
+                    },
+                ),
+            )
+        )
+
+        self.assertEqual([batch.row_count for batch in batches], [1, 1])
+        self.assertEqual(client.etf_daily_calls, ["510300.SH", "510500.SH"])
+        self.assertEqual({batch.source_endpoint for batch in batches}, {"fund_daily"})
+
+    def test_reference_cache_reloads_only_after_invalidation(self) -> None:
+        cache = ReferenceDataCache()
+        loads: list[int] = []
+
+        def load() -> pd.DataFrame:
+            loads.append(1)
+            return pd.DataFrame({"instrument_id": [f"51030{len(loads)}.SH"]})
+
+        first = cache.get("instruments", "canonical_instruments", load)
+        second = cache.get("instruments", "canonical_instruments", load)
+        cache.invalidate("canonical_trading_calendar")
+        third = cache.get("instruments", "canonical_instruments", load)
+        cache.invalidate("canonical_instruments")
+        fourth = cache.get("instruments", "canonical_instruments", load)
+
+        self.assertIs(first, second)
+        self.assertIs(first, third)
+        self.assertEqual(len(loads), 2)
+        self.assertEqual(fourth["instrument_id"].tolist(), ["510302.SH"])
+
     def test_calendar_validator_runs_continuity_rules(self) -> None:
         calendar = pd.DataFrame(
             {
@@ -671,6 +828,126 @@ class StageBServiceIntegrationTests(unittest.TestCase):
         self.assertEqual(result.status, RunStatus.SUCCESS)
         self.assertGreater(result.run_id, 50)
 
+    def test_sync_session_reuses_reference_lookups_until_written(self) -> None:
+        request = IngestionRequest(
+            request_start=date(2026, 4, 24),
+            request_end=date(2026, 4, 24),
+            context={"instrument_ids": ["510300.SH"]},
+        )
+        self.service.run_dataset_sync("market.etf_daily", request)
+        cache = self.service._reference_cache
+        instruments_generation = cache.generation("canonical_instruments")
+        cached_instruments = cache._entries["instruments"][1]
+
+        result = self.service.run_dataset_sync("market.etf_daily", request)
+
+        self.assertEqual(result.status, RunStatus.SUCCESS)
+        self.assertIs(cache._entries["instruments"][1], cached_instruments)
+        self.service.run_dataset_sync(
+            "reference.instruments",
+            IngestionRequest(context={"instrument_type": "etf"}),
+        )
+        self.assertGreater(
+            cache.generation("canonical_instruments"), instruments_generation
+        )
+
+    def test_streamed_source_batches_land_as_one_raw_batch(self) -> None:
+        self.service = ETLService(
+            conn=self.conn,
+            source_adapters=[TushareSourceAdapter(TwoEtfMockTushareClient())],
+            lakehouse_root=Path(self._temp_dir.name) / "lakehouse",
+        )
+
+        result = self.service.run_dataset_sync(
+            "market.etf_daily",
+            IngestionRequest(
+                request_start=date(2026, 4, 24),
+                request_end=date(2026, 4, 24),
+                context={
+                    "instrument_ids": ["510300.SH", "510500.SH"],
+                    "fetch_batch_size": 1,
+                },
+            ),
+        )
+
+        self.assertEqual(result.status, RunStatus.SUCCESS)
+        self.assertEqual(result.records_discovered, 2)
+        self.assertEqual(result.records_written, 2)
+        self.assertEqual(len(result.raw_batch_ids), 1)
+        storage_path, row_count = self.conn.execute(
+            "SELECT storage_path, row_count FROM etl_raw_batches WHERE raw_batch_id = ?",
+            [result.raw_batch_ids[0]],
+        ).fetchone()
+        self.assertEqual(row_count, 2)
+        raw_file = Path(self._temp_dir.name) / "lakehouse" / storage_path
+        self.assertEqual(pq.ParquetFile(raw_file).num_row_groups, 2)
+
+    def test_validation_results_persist_as_one_block(self) -> None:
+        records = [
+            ValidationResultRecord(
+                validation_id=0,
+                run_id=7,
+                raw_batch_id=None if index == 0 else 3,
+                dataset_name="market.etf_daily",
+                check_name=f"market_daily.check_{index}",
+                check_level="row",
+                status=ValidationStatus.PASS,
+                metric_value=None if index == 0 else float(index),
+                created_at=datetime(2026, 4, 24, 8, 0),
+            )
+            for index in range(3)
+        ]
+
+        self.service._persist_validation_results(records)
+        self.service._persist_validation_results([])
+
+        rows = self.conn.execute("""
+            SELECT validation_id, raw_batch_id, metric_value, check_name
+            FROM etl_validation_results
+            WHERE run_id = 7
+            ORDER BY validation_id
+            """).fetchall()
+        self.assertEqual(len(rows), 3)
+        ids = [row[0] for row in rows]
+        self.assertEqual(ids, list(range(ids[0], ids[0] + 3)))
+        self.assertEqual(rows[0][1:3], (None, None))
+        self.assertEqual(rows[2][1:], (3, 2.0, "market_daily.check_2"))
+
+    def test_validation_persistence_benchmark_reports_each_count(self) -> None:
+        rows = benchmark_validation_persistence([1, 5], repeats=1)
+
+        self.assertEqual([row["result_count"] for row in rows], [1, 5])
+        self.assertTrue(all(row["best_seconds"] >= 0 for row in rows))
+
+    def test_pipeline_benchmark_times_stages_and_flags_regressions(self) -> None:
+        report = benchmark_pipeline(6, 1)
+
+        scenarios = {row["scenario"]: row for row in report["scenarios"]}
+        self.assertEqual(
+            {row["status"] for row in report["scenarios"]},
+            {RunStatus.SUCCESS.value},
+        )
+        self.assertEqual(report["instrument_count"], 6)
+        self.assertEqual(
+            set(scenarios["market.etf_daily.resync"]["stage_seconds"]),
+            {
+                "fetch",
+                "raw_landing",
+                "normalize",
+                "validate",
+                "validation_persistence",
+                "write",
+                "watermark",
+            },
+        )
+        self.assertIn("derived.etf_aw_regime_score.build", scenarios)
+        self.assertEqual(compare_with_baseline(report, report), [])
+        faster = json.loads(json.dumps(report))
+        for row in faster["scenarios"]:
+            row["total_seconds"] /= 10
+        regressions = compare_with_baseline(report, faster, noise_floor_seconds=0)
+        self.assertEqual(len(regressions), len(report["scenarios"]))
+
     def test_freshness_dependency_checks_watermark_recency(self) -> None:
         definition = DatasetDefinition(
             dataset_name="market.test_daily",
@@ -739,6 +1016,321 @@ class StageBServiceIntegrationTests(unittest.TestCase):
         self.assertEqual(inserted, 0)
         self.assertEqual(updated, 1)
 
+    def test_sync_records_stage_metrics_and_percentiles(self) -> None:
+        request = IngestionRequest(
+            request_start=date(2026, 4, 24),
+            request_end=date(2026, 4, 24),
+            context={"instrument_ids": ["510300.SH"]},
+        )
+        first = self.service.run_dataset_sync("market.etf_daily", request)
+        second = self.service.run_dataset_sync("market.etf_daily", request)
+
+        stages = {
+            row["stage_name"]: row
+            for row in self.service.list_run_stages("market.etf_daily", first.run_id)
+        }
+        rewrite = {
+            row["stage_name"]: row
+            for row in self.service.list_run_stages("market.etf_daily", second.run_id)
+        }
+        # The rerun reads back the partition file the first run wrote.
+        self.assertEqual(stages["write"]["bytes_read"], 0)
+        self.assertEqual(
+            rewrite["write"]["bytes_read"], stages["write"]["bytes_written"]
+        )
+        self.assertEqual(
+            set(stages),
+            {
+                "fetch",
+                "raw_landing",
+                "normalize",
+                "validate",
+                "validation_persistence",
+                "write",
+                "watermark",
+                "total",
+            },
+        )
+        self.assertEqual(stages["fetch"]["rows_processed"], 1)
+        self.assertGreater(stages["fetch"]["bytes_read"], 0)
+        self.assertGreater(stages["raw_landing"]["bytes_written"], 0)
+        self.assertGreater(stages["write"]["bytes_written"], 0)
+        self.assertEqual(stages["total"]["status"], RunStatus.SUCCESS.value)
+        self.assertIsNotNone(stages["total"]["peak_rss_mb"])
+
+        percentiles = self.service.stage_duration_percentiles(
+            "market.etf_daily", bucket=None
+        )
+        by_stage = {row["stage_name"]: row for row in percentiles}
+        self.assertEqual(by_stage["write"]["run_count"], 2)
+        self.assertLessEqual(
+            by_stage["write"]["p50_seconds"], by_stage["write"]["p95_seconds"]
+        )
+        daily = self.service.stage_duration_percentiles("market.etf_daily")
+        self.assertEqual(
+            {pd.Timestamp(row["period_start"]).date() for row in daily},
+            {datetime.now(UTC).date()},
+        )
+        with self.assertRaises(ValueError):
+            self.service.stage_duration_percentiles(bucket="hour")
+
+    def test_market_resync_of_identical_rows_skips_partition_write(self) -> None:
+        request = IngestionRequest(
+            request_start=date(2026, 4, 24),
+            request_end=date(2026, 4, 24),
+            context={"instrument_ids": ["510300.SH"]},
+        )
+        first = self.service.run_dataset_sync("market.etf_daily", request)
+        partition_file = (
+            Path(self._temp_dir.name)
+            / "lakehouse"
+            / "normalized"
+            / "market.etf_daily"
+            / "2026"
+            / "04"
+            / "part-00000.parquet"
+        )
+        first_mtime = partition_file.stat().st_mtime_ns
+
+        second = self.service.run_dataset_sync("market.etf_daily", request)
+
+        self.assertEqual(first.partitions_unchanged, 0)
+        self.assertEqual(second.status, RunStatus.SUCCESS)
+        self.assertEqual(second.partitions_unchanged, 1)
+        self.assertEqual(partition_file.stat().st_mtime_ns, first_mtime)
+        partitions_written = self.conn.execute(
+            "SELECT partitions_written FROM etl_ingestion_runs WHERE run_id = ?",
+            [second.run_id],
+        ).fetchone()[0]
+        self.assertEqual(partitions_written, 0)
+        stored = pd.read_parquet(partition_file)
+        self.assertEqual(stored["raw_batch_id"].tolist(), first.raw_batch_ids)
+
+    def test_delta_write_mode_merges_on_read_and_compacts(self) -> None:
+        service = ETLService(
+            conn=self.conn,
+            source_adapters=[TushareSourceAdapter(MockTushareClient())],
+            lakehouse_root=Path(self._temp_dir.name) / "lakehouse",
+            partition_write_mode=PartitionWriteMode.DELTA,
+        )
+        request = IngestionRequest(
+            request_start=date(2026, 4, 24),
+            request_end=date(2026, 4, 24),
+            context={"instrument_ids": ["510300.SH"]},
+        )
+
+        first = service.run_dataset_sync("market.etf_daily", request)
+        second = service.run_dataset_sync("market.etf_daily", request)
+
+        self.assertEqual(first.status, RunStatus.SUCCESS)
+        self.assertEqual(second.status, RunStatus.SUCCESS)
+        partition_dir = (
+            Path(self._temp_dir.name)
+            / "lakehouse"
+            / "normalized"
+            / "market.etf_daily"
+            / "2026"
+            / "04"
+        )
+        self.assertEqual(
+            sorted(path.name for path in partition_dir.glob("*.parquet")),
+            sorted(
+                [
+                    f"part-delta-{first.run_id}.parquet",
+                    f"part-delta-{second.run_id}.parquet",
+                ]
+            ),
+        )
+        inserted, updated = self.conn.execute(
+            """
+            SELECT records_inserted, records_updated
+            FROM etl_ingestion_runs
+            WHERE run_id = ?
+            """,
+            [second.run_id],
+        ).fetchone()
+        self.assertEqual((inserted, updated), (0, 1))
+        merged = service._read_partitioned_dataset(
+            "market.etf_daily",
+            date(2026, 4, 1),
+            date(2026, 4, 30),
+            StorageZone.NORMALIZED,
+        )
+        self.assertEqual(len(merged), 1)
+
+        summary = service.compact_dataset_partitions("market.etf_daily")
+
+        self.assertEqual(summary["partitions_compacted"], 1)
+        self.assertEqual(summary["delta_files_removed"], 2)
+        self.assertEqual(
+            [path.name for path in partition_dir.glob("*.parquet")],
+            ["part-00000.parquet"],
+        )
+        compacted = service._read_partitioned_dataset(
+            "market.etf_daily",
+            date(2026, 4, 1),
+            date(2026, 4, 30),
+            StorageZone.NORMALIZED,
+        )
+        pd.testing.assert_frame_equal(compacted, merged)
+        self.assertEqual(
+            [
+                (row["file_path"], row["file_kind"])
+                for row in service.list_lakehouse_partitions("market.etf_daily")
+            ],
+            [("normalized/market.etf_daily/2026/04/part-00000.parquet", "base")],
+        )
+
+    def test_partition_manifest_records_writes_and_prunes_reads(self) -> None:
+        request = IngestionRequest(
+            request_start=date(2026, 4, 24),
+            request_end=date(2026, 4, 24),
+            context={"instrument_ids": ["510300.SH"]},
+        )
+        result = self.service.run_dataset_sync("market.etf_daily", request)
+
+        self.assertEqual(result.status, RunStatus.SUCCESS)
+        rows = self.service.list_lakehouse_partitions("market.etf_daily")
+        self.assertEqual(len(rows), 1)
+        row = rows[0]
+        partition_file = Path(self._temp_dir.name) / "lakehouse" / row["file_path"]
+        self.assertEqual(row["storage_zone"], "normalized")
+        self.assertEqual((row["partition_year"], row["partition_month"]), (2026, 4))
+        self.assertEqual(row["row_count"], 1)
+        self.assertEqual(row["min_date"], date(2026, 4, 24))
+        self.assertEqual(row["max_date"], date(2026, 4, 24))
+        self.assertEqual(row["schema_version"], "market_daily_v1")
+        self.assertEqual(row["byte_size"], partition_file.stat().st_size)
+        self.assertEqual(row["content_hash"], stored_content_hash(partition_file))
+
+        # A partition the manifest does not know about is never opened.
+        stray = partition_file.parent.parent / "03" / "part-00000.parquet"
+        stray.parent.mkdir(parents=True)
+        pd.read_parquet(partition_file).to_parquet(stray, index=False)
+        frame = self.service._read_partitioned_dataset(
+            "market.etf_daily",
+            date(2026, 3, 1),
+            date(2026, 4, 30),
+            StorageZone.NORMALIZED,
+        )
+        self.assertEqual(len(frame), 1)
+        self.assertEqual(
+            list_partition_months(
+                self.conn,
+                "market.etf_daily",
+                StorageZone.NORMALIZED,
+                date(2026, 4, 25),
+                date(2026, 5, 31),
+            ),
+            [],
+        )
+
+    def test_layout_migration_moves_files_and_keeps_reads(self) -> None:
+        request = IngestionRequest(
+            request_start=date(2026, 4, 24),
+            request_end=date(2026, 4, 24),
+            context={"instrument_ids": ["510300.SH"]},
+        )
+        self.service.run_dataset_sync("market.etf_daily", request)
+        window = (date(2026, 4, 1), date(2026, 4, 30), StorageZone.NORMALIZED)
+        before = self.service._read_partitioned_dataset("market.etf_daily", *window)
+
+        summary = self.service.migrate_partition_layout(PartitionLayout.HIVE)
+        again = self.service.migrate_partition_layout(PartitionLayout.HIVE)
+
+        lakehouse = Path(self._temp_dir.name) / "lakehouse"
+        moved = {
+            (entry["dataset_name"], entry["storage_zone"])
+            for entry in summary["datasets"]
+        }
+        self.assertIn(("market.etf_daily", "raw"), moved)
+        self.assertIn(("market.etf_daily", "normalized"), moved)
+        self.assertEqual(again["datasets"], [])
+        rows = self.service.list_lakehouse_partitions("market.etf_daily")
+        self.assertEqual(
+            [row["file_path"] for row in rows],
+            ["normalized/market.etf_daily/year=2026/month=04/part-00000.parquet"],
+        )
+        raw_paths = [
+            row[0]
+            for row in self.conn.execute(
+                "SELECT storage_path FROM etl_raw_batches WHERE dataset_name = ?",
+                ["market.etf_daily"],
+            ).fetchall()
+        ]
+        self.assertTrue(raw_paths)
+        for raw_path in raw_paths:
+            self.assertIn("/year=2026/month=04/", raw_path)
+            self.assertTrue((lakehouse / raw_path).is_file())
+        after = self.service._read_partitioned_dataset("market.etf_daily", *window)
+        pd.testing.assert_frame_equal(before, after)
+
+        self.service.run_dataset_sync("market.etf_daily", request)
+        self.assertFalse(
+            (lakehouse / "normalized" / "market.etf_daily" / "2026").exists()
+        )
+
+    def test_multi_dataset_sync_runs_dependencies_before_dependents(self) -> None:
+        results = self.service.run_multi_dataset_sync(
+            [
+                "market.etf_daily",
+                "reference.instruments",
+                "reference.trading_calendar",
+            ],
+            IngestionRequest(
+                request_start=date(2026, 4, 24),
+                request_end=date(2026, 4, 24),
+                context={"instrument_ids": ["510300.SH"]},
+            ),
+            max_workers=3,
+        )
+
+        self.assertEqual(
+            list(results),
+            [
+                "market.etf_daily",
+                "reference.instruments",
+                "reference.trading_calendar",
+            ],
+        )
+        self.assertTrue(
+            all(result.status == RunStatus.SUCCESS for result in results.values())
+        )
+        self.assertGreater(
+            results["market.etf_daily"].run_id,
+            results["reference.instruments"].run_id,
+        )
+        self.assertGreater(
+            results["market.etf_daily"].run_id,
+            results["reference.trading_calendar"].run_id,
+        )
+        run_count = self.conn.execute("""
+            SELECT COUNT(*) FROM etl_ingestion_runs
+            WHERE dataset_name IN ('reference.instruments', 'reference.trading_calendar')
+            """).fetchone()[0]
+        self.assertEqual(run_count, 2)
+
+    def test_multi_dataset_sync_rejects_dependency_cycles(self) -> None:
+        for dataset_name, upstream in (
+            ("market.cycle_a", "market.cycle_b"),
+            ("market.cycle_b", "market.cycle_a"),
+        ):
+            self.service.registry.register_dataset(
+                DatasetDefinition(
+                    dataset_name=dataset_name,
+                    category=DatasetCategory.MARKET,
+                    grain="instrument_trade_date",
+                    primary_source="tushare",
+                    storage_zone=StorageZone.NORMALIZED,
+                    dependencies=[upstream],
+                )
+            )
+
+        with self.assertRaisesRegex(ValueError, "dependency cycle"):
+            self.service.run_multi_dataset_sync(
+                ["market.cycle_a", "market.cycle_b"], IngestionRequest()
+            )
+
     def test_calendar_full_history_bootstrap_runs_monthly_backfill(self) -> None:
         client = FullCalendarMockTushareClient()
         service = ETLService(
@@ -837,6 +1429,121 @@ class StageBServiceIntegrationTests(unittest.TestCase):
         self.assertEqual(count_after_second, count_after_first)
         self.assertEqual(watermark_after_first, (date(2026, 3, 31), 99))
 
+    def test_calendar_bootstrap_pipelines_windows_with_one_run_each(self) -> None:
+        client = FailingWindowMockTushareClient(failing_start="")
+        service = ETLService(
+            conn=self.conn,
+            source_adapters=[TushareSourceAdapter(client)],
+            lakehouse_root=Path(self._temp_dir.name) / "bootstrap-lakehouse",
+        )
+
+        result = service.run_bootstrap(
+            "reference.trading_calendar.full_history",
+            start=date(2026, 1, 1),
+            end=date(2026, 4, 30),
+        )
+
+        self.assertEqual(result["status"], RunStatus.SUCCESS.value)
+        self.assertEqual(result["windows_processed"], 4)
+        self.assertTrue(
+            all(name.startswith("etl-pipeline") for name in client.fetch_threads)
+        )
+        runs = self.conn.execute("""
+            SELECT request_start, status
+            FROM etl_ingestion_runs
+            WHERE dataset_name = 'reference.trading_calendar'
+            ORDER BY run_id
+            """).fetchall()
+        self.assertEqual(
+            runs,
+            [(date(2026, month, 1), RunStatus.SUCCESS.value) for month in range(1, 5)],
+        )
+        self.assertEqual(
+            [run["run_id"] for run in result["runs"]],
+            sorted(run["run_id"] for run in result["runs"]),
+        )
+
+    def test_calendar_bootstrap_pipeline_stops_after_failed_window(self) -> None:
+        client = FailingWindowMockTushareClient(failing_start="2026-02-01")
+        service = ETLService(
+            conn=self.conn,
+            source_adapters=[TushareSourceAdapter(client)],
+            lakehouse_root=Path(self._temp_dir.name) / "bootstrap-lakehouse",
+        )
+
+        result = service.run_bootstrap(
+            "reference.trading_calendar.full_history",
+            start=date(2026, 1, 1),
+            end=date(2026, 6, 30),
+        )
+
+        self.assertEqual(result["status"], RunStatus.FAILED.value)
+        self.assertIn("2026-02-01", result["error_message"])
+        statuses = [row[0] for row in self.conn.execute("""
+                SELECT status
+                FROM etl_ingestion_runs
+                WHERE dataset_name = 'reference.trading_calendar'
+                ORDER BY run_id
+                """).fetchall()]
+        self.assertEqual(statuses, [RunStatus.SUCCESS.value, RunStatus.FAILED.value])
+        self.assertEqual(len(result["runs"]), 2)
+        covered_after_failure = self.conn.execute("""
+            SELECT COUNT(*)
+            FROM canonical_trading_calendar
+            WHERE trade_date >= DATE '2026-02-01'
+            """).fetchone()[0]
+        self.assertEqual(covered_after_failure, 0)
+
+    def test_services_share_dataset_locks(self) -> None:
+        other = ETLService(conn=self.conn.cursor(), source_adapters=[])
+
+        self.assertIs(
+            other._locks.dataset("market.etf_daily"),
+            self.service._locks.dataset("market.etf_daily"),
+        )
+
+    def test_batch_stream_holds_a_bounded_number_of_batches(self) -> None:
+        produced: list[int] = []
+
+        def batches():
+            for index in range(10):
+                produced.append(index)
+                yield index
+                if index == 5:
+                    raise RuntimeError("source dropped")
+
+        stream = _BatchStream(1)
+        feeder = threading.Thread(
+            target=stream.feed, args=(batches(), lambda: False), daemon=True
+        )
+        feeder.start()
+        received: list[int] = []
+        with self.assertRaisesRegex(RuntimeError, "source dropped"):
+            for batch in stream:
+                if not received:
+                    # One batch queued and one waiting to be queued at most.
+                    self.assertLessEqual(len(produced), 3)
+                received.append(batch)
+        stream.drain()
+        feeder.join(timeout=5)
+
+        self.assertEqual(received, list(range(6)))
+        self.assertFalse(feeder.is_alive())
+
+    def test_rss_sampler_reports_each_block_its_own_peak(self) -> None:
+        resident = [100 * 1024 * 1024]
+        sampler = _RssSampler(interval=0.005)
+        with patch("tradepilot.etl.service._current_rss_bytes", lambda: resident[0]):
+            token = sampler.enter()
+            resident[0] = 300 * 1024 * 1024
+            time.sleep(0.05)
+            resident[0] = 100 * 1024 * 1024
+            spiking = sampler.exit(token)
+            idle = sampler.exit(sampler.enter())
+
+        self.assertEqual(spiking, 300.0)
+        self.assertEqual(idle, 100.0)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -12,7 +12,7 @@ import unittest
 import pandas as pd
 
 from tradepilot import db
-from tradepilot.etl.models import IngestionRequest, RunStatus
+from tradepilot.etl.models import IngestionRequest, RunStatus, StorageZone
 from tradepilot.etl.service import ETLService
 from tradepilot.etl.sources.tushare import TushareSourceAdapter
 
@@ -490,6 +490,58 @@ class StageCRebalanceCalendarTests(unittest.TestCase):
         self.assertTrue(pd.isna(frame["adj_pct_chg"].iloc[0]))
         self.assertAlmostEqual(frame["adj_pct_chg"].iloc[1], 11.1, places=6)
 
+    def test_derived_etf_aw_sleeve_daily_rebuilds_only_dirty_months(self) -> None:
+        client = AdjFactorMockTushareClient()
+        service = ETLService(
+            conn=self.conn,
+            source_adapters=[TushareSourceAdapter(client)],
+            lakehouse_root=Path(self._temp_dir.name) / "panel-lakehouse",
+        )
+        service.run_bootstrap("reference.etf_aw_sleeves.frozen_v1")
+        self._insert_calendar_window(date(2024, 1, 15), date(2024, 2, 2))
+
+        def sync(start: date, end: date) -> None:
+            for dataset_name in ("market.etf_daily", "market.etf_adj_factor"):
+                service.run_dataset_sync(
+                    dataset_name,
+                    IngestionRequest(
+                        request_start=start,
+                        request_end=end,
+                        context={"instrument_ids": ["510300.SH"]},
+                    ),
+                )
+
+        sync(date(2024, 1, 22), date(2024, 1, 23))
+        first = service.run_bootstrap("derived.etf_aw_sleeve_daily.build")
+        idle = service.run_bootstrap("derived.etf_aw_sleeve_daily.build")
+        sync(date(2024, 2, 1), date(2024, 2, 2))
+        update = service.run_bootstrap("derived.etf_aw_sleeve_daily.build")
+        sync(date(2024, 1, 15), date(2024, 1, 16))
+        backfill = service.run_bootstrap("derived.etf_aw_sleeve_daily.build")
+
+        self.assertEqual(first["status"], RunStatus.SUCCESS.value)
+        self.assertEqual(first["requested_start"], "2016-01-01")
+        self.assertEqual(first["records_written"], 2)
+        self.assertEqual(idle["rebuild_mode"], "incremental")
+        self.assertIsNone(idle["dirty_start"])
+        self.assertEqual(idle["records_written"], 0)
+        self.assertEqual(update["status"], RunStatus.SUCCESS.value)
+        self.assertEqual(update["dirty_start"], "2024-02-01")
+        self.assertEqual(update["requested_start"], "2024-02-01")
+        self.assertEqual(update["records_written"], 2)
+        # A backfill behind the fetch watermark still dirties its own month.
+        self.assertEqual(backfill["dirty_start"], "2024-01-15")
+        self.assertEqual(backfill["requested_start"], "2024-01-01")
+        self.assertEqual(backfill["records_written"], 6)
+        panel = service._read_partitioned_dataset(
+            "derived.etf_aw_sleeve_daily",
+            date(2024, 2, 1),
+            date(2024, 2, 29),
+            StorageZone.DERIVED,
+        )
+        # The look-back reaches January, so February's first return is known.
+        self.assertFalse(panel["adj_pct_chg"].isna().any())
+
     def test_derived_etf_aw_sleeve_daily_uses_adjustment_available_rows(
         self,
     ) -> None:
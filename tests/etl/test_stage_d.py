@@ -3,20 +3,30 @@
 from __future__ import annotations
 
 from datetime import date, timedelta
+import math
 from pathlib import Path
+import random
 from tempfile import TemporaryDirectory
 import threading
 import unittest
+from unittest.mock import patch
 
 import pandas as pd
 
 from tradepilot import db
-from tradepilot.etl.models import RunStatus
+from tradepilot.etl import read_models
+from tradepilot.etl.latest_index import record_partition_pointers
+from tradepilot.etl.manifest import manifest_generation
+from tradepilot.etl.models import RunStatus, StorageZone
 from tradepilot.etl.read_models import (
     get_latest_etf_aw_snapshot,
     list_etf_aw_snapshots,
 )
-from tradepilot.etl.service import ETLService
+from tradepilot.etl.service import (
+    _ETF_AW_SNAPSHOT_WINDOWS,
+    ETLService,
+    _sample_snapshot_features,
+)
 
 
 class StageDRebalanceSnapshotTests(unittest.TestCase):
@@ -75,6 +85,16 @@ class StageDRebalanceSnapshotTests(unittest.TestCase):
         self.assertAlmostEqual(equity["return_6m"], (1.001**126) - 1, places=8)
         self.assertEqual(equity["volatility_3m"], 0)
         self.assertEqual(equity["max_drawdown_6m"], 0)
+        stages = {
+            row["stage_name"]: row
+            for row in self.service.list_run_stages("derived.etf_aw_rebalance_snapshot")
+        }
+        self.assertEqual(set(stages), {"read", "write", "total"})
+        self.assertGreater(stages["read"]["bytes_read"], 0)
+        self.assertEqual(stages["write"]["rows_processed"], 5)
+        self.assertEqual(
+            stages["total"]["profile_name"], "derived.etf_aw_rebalance_snapshot.build"
+        )
 
     def test_missing_rebalance_row_still_outputs_frozen_universe(self) -> None:
         self._insert_rebalance(date(2024, 7, 22))
@@ -169,6 +189,47 @@ class StageDRebalanceSnapshotTests(unittest.TestCase):
             frame.duplicated(["calendar_name", "rebalance_date", "sleeve_code"]).any()
         )
 
+    def test_worker_processes_match_in_process_build(self) -> None:
+        self._insert_rebalance(date(2024, 6, 20))
+        self._insert_rebalance(date(2024, 7, 22))
+        self._write_sleeve_daily(
+            date(2024, 1, 1),
+            date(2024, 7, 22),
+            missing={("518850.SH", date(2024, 7, 22))},
+        )
+        self._insert_watermarks(date(2024, 7, 22))
+
+        builds: list[dict[str, pd.DataFrame]] = []
+        for max_workers in (None, 3):
+            built: dict[str, pd.DataFrame] = {}
+            for profile_name, dataset_name in (
+                (
+                    "derived.etf_aw_rebalance_snapshot.build",
+                    "derived.etf_aw_rebalance_snapshot",
+                ),
+                ("derived.etf_aw_regime_score.build", "derived.etf_aw_regime_score"),
+            ):
+                result = self.service.run_bootstrap(
+                    profile_name,
+                    start=date(2024, 6, 1),
+                    end=date(2024, 7, 31),
+                    max_workers=max_workers,
+                )
+                self.assertEqual(result["status"], RunStatus.SUCCESS.value)
+                built[dataset_name] = self.service._read_partitioned_dataset(
+                    dataset_name,
+                    date(2024, 6, 1),
+                    date(2024, 7, 31),
+                    StorageZone.DERIVED,
+                ).drop(columns=["ingested_at"])
+            builds.append(built)
+
+        serial, parallel = builds
+        self.assertEqual(len(parallel["derived.etf_aw_rebalance_snapshot"]), 10)
+        self.assertEqual(len(parallel["derived.etf_aw_regime_score"]), 2)
+        for dataset_name, frame in serial.items():
+            pd.testing.assert_frame_equal(parallel[dataset_name], frame)
+
     def test_read_service_returns_latest_snapshot_contract(self) -> None:
         self._insert_rebalance(date(2024, 7, 22))
         self._write_sleeve_daily(date(2024, 1, 1), date(2024, 7, 22))
@@ -211,6 +272,122 @@ class StageDRebalanceSnapshotTests(unittest.TestCase):
         assert snapshot is not None
         self.assertEqual(snapshot["rebalance_date"], "2024-07-22")
 
+    def test_read_service_caches_until_snapshot_write(self) -> None:
+        self._insert_rebalance(date(2024, 7, 22))
+        self._write_sleeve_daily(date(2024, 1, 1), date(2024, 7, 22))
+        self._insert_watermarks(date(2024, 7, 22))
+        self.service.run_bootstrap(
+            "derived.etf_aw_rebalance_snapshot.build",
+            start=date(2024, 7, 1),
+            end=date(2024, 7, 31),
+        )
+
+        with patch(
+            "tradepilot.etl.read_models._read_latest_etf_aw_snapshot_partition",
+            wraps=read_models._read_latest_etf_aw_snapshot_partition,
+        ) as reader:
+            first = get_latest_etf_aw_snapshot(
+                lakehouse_root=self.lakehouse_root, conn=self.conn
+            )
+            assert first is not None
+            first["sleeves"].clear()
+            cached = get_latest_etf_aw_snapshot(
+                lakehouse_root=self.lakehouse_root, conn=self.conn
+            )
+            self.assertEqual(reader.call_count, 1)
+            assert cached is not None
+            self.assertEqual(len(cached["sleeves"]), 5)
+
+            self._insert_rebalance(date(2024, 8, 22))
+            self._write_sleeve_daily(date(2024, 1, 1), date(2024, 8, 22))
+            self.service.run_bootstrap(
+                "derived.etf_aw_rebalance_snapshot.build",
+                start=date(2024, 8, 1),
+                end=date(2024, 8, 31),
+            )
+            refreshed = get_latest_etf_aw_snapshot(
+                lakehouse_root=self.lakehouse_root, conn=self.conn
+            )
+            self.assertEqual(reader.call_count, 2)
+            # Another process writing the dataset only moves the stored counter.
+            self.conn.execute("""
+                UPDATE lakehouse_generations
+                SET generation = generation + 1
+                WHERE dataset_name = 'derived.etf_aw_rebalance_snapshot'
+                """)
+            get_latest_etf_aw_snapshot(
+                lakehouse_root=self.lakehouse_root, conn=self.conn
+            )
+
+        self.assertEqual(reader.call_count, 3)
+        assert refreshed is not None
+        self.assertEqual(refreshed["rebalance_date"], "2024-08-22")
+
+    def test_latest_index_backfills_and_points_at_one_partition(self) -> None:
+        self._insert_rebalance(date(2024, 7, 22))
+        self._insert_rebalance(date(2024, 8, 22))
+        self._write_sleeve_daily(date(2024, 1, 1), date(2024, 8, 22))
+        self._insert_watermarks(date(2024, 8, 22))
+        self.service.run_bootstrap(
+            "derived.etf_aw_rebalance_snapshot.build",
+            start=date(2024, 7, 1),
+            end=date(2024, 7, 31),
+        )
+        # Simulate a lakehouse written before the index existed.
+        self.conn.execute("DELETE FROM etl_derived_latest")
+        self.service.run_bootstrap(
+            "derived.etf_aw_rebalance_snapshot.build",
+            start=date(2024, 8, 1),
+            end=date(2024, 8, 31),
+        )
+
+        indexed = self.conn.execute("""
+            SELECT DISTINCT rebalance_date, partition_path
+            FROM etl_derived_latest
+            ORDER BY rebalance_date
+            """).fetchall()
+        with patch(
+            "tradepilot.etl.read_models.read_dataset_partition",
+            wraps=read_models.read_dataset_partition,
+        ) as reader:
+            snapshot = get_latest_etf_aw_snapshot(
+                as_of_date=date(2024, 8, 1),
+                lakehouse_root=self.lakehouse_root,
+                conn=self.conn,
+            )
+
+        prefix = "derived/derived.etf_aw_rebalance_snapshot"
+        self.assertEqual(
+            indexed,
+            [
+                (date(2024, 7, 22), f"{prefix}/2024/07"),
+                (date(2024, 8, 22), f"{prefix}/2024/08"),
+            ],
+        )
+        self.assertEqual(reader.call_count, 1)
+        assert snapshot is not None
+        self.assertEqual(snapshot["rebalance_date"], "2024-07-22")
+
+    def test_index_update_advances_generation_after_the_partition_write(
+        self,
+    ) -> None:
+        dataset_name = "derived.etf_aw_rebalance_snapshot"
+        before = manifest_generation(self.conn, dataset_name, StorageZone.DERIVED)
+
+        record_partition_pointers(
+            self.conn,
+            dataset_name,
+            2024,
+            7,
+            f"derived/{dataset_name}/2024/07",
+            pd.DataFrame(
+                {"rebalance_date": [date(2024, 7, 22)], "calendar_name": ["m"]}
+            ),
+        )
+
+        after = manifest_generation(self.conn, dataset_name, StorageZone.DERIVED)
+        self.assertEqual(after[0], before[0] + 1)
+
     def test_read_service_defends_against_invalid_snapshot_partition(self) -> None:
         path = self._snapshot_file_path(2024, 7)
         path.parent.mkdir(parents=True, exist_ok=True)
@@ -356,5 +533,85 @@ class StageDRebalanceSnapshotTests(unittest.TestCase):
         )
 
 
+class StageDSnapshotFeatureTests(unittest.TestCase):
+    """Verify rolling snapshot features match per-date trailing windows."""
+
+    def test_sampled_features_match_per_date_windows(self) -> None:
+        rng = random.Random(7)
+        rows: list[dict] = []
+        price = 10.0
+        current = date(2023, 1, 2)
+        while current <= date(2024, 6, 28):
+            if current.weekday() < 5:
+                price *= 1 + rng.gauss(0, 0.01)
+                rows.append(
+                    {
+                        "trade_date": current,
+                        "adj_close": None if rng.random() < 0.05 else price,
+                        "adj_pct_chg": (
+                            None if rng.random() < 0.05 else rng.gauss(0, 1)
+                        ),
+                    }
+                )
+            current += timedelta(days=1)
+        panel = pd.DataFrame(rows).sample(frac=1, random_state=3)
+        sample_dates = [date(2022, 12, 30)] + [
+            date(2023, 1, 2) + timedelta(days=offset) for offset in range(0, 560, 9)
+        ]
+
+        sampled = _sample_snapshot_features(panel, sample_dates)
+
+        for sample_date in sample_dates:
+            expected_features, expected_checks = _trailing_window_features(
+                panel[panel["trade_date"] <= sample_date]
+            )
+            features, checks = sampled[sample_date]
+            self.assertEqual(checks, expected_checks, sample_date)
+            for key, expected in expected_features.items():
+                if expected is None:
+                    self.assertIsNone(features[key], (sample_date, key))
+                else:
+                    self.assertAlmostEqual(
+                        features[key], expected, places=10, msg=(sample_date, key)
+                    )
+
+
+def _trailing_window_features(available: pd.DataFrame) -> tuple[dict, dict]:
+    """Recompute snapshot features from one date's trailing rows."""
+
+    available = available.sort_values("trade_date")
+    features: dict[str, float | None] = {}
+    checks: dict[str, dict] = {}
+    for key in ("return_1m", "return_3m", "return_6m"):
+        window, minimum = _ETF_AW_SNAPSHOT_WINDOWS[key]
+        values = available["adj_close"].dropna().astype(float).tail(window + 1)
+        observations = max(len(values) - 1, 0)
+        checks[key] = {"observations": observations, "partial": observations < minimum}
+        features[key] = (
+            float(values.iloc[-1] / values.iloc[0] - 1)
+            if observations >= minimum and values.iloc[0] > 0
+            else None
+        )
+    window, minimum = _ETF_AW_SNAPSHOT_WINDOWS["volatility_3m"]
+    returns = available["adj_pct_chg"].dropna().astype(float).tail(window) / 100
+    checks["volatility_3m"] = {
+        "observations": len(returns),
+        "partial": len(returns) < minimum,
+    }
+    features["volatility_3m"] = (
+        float(returns.std(ddof=1) * math.sqrt(252)) if len(returns) >= minimum else None
+    )
+    window, minimum = _ETF_AW_SNAPSHOT_WINDOWS["max_drawdown_6m"]
+    values = available["adj_close"].dropna().astype(float).tail(window)
+    checks["max_drawdown_6m"] = {
+        "observations": len(values),
+        "partial": len(values) < minimum,
+    }
+    features["max_drawdown_6m"] = (
+        float((values / values.cummax() - 1).min()) if len(values) >= minimum else None
+    )
+    return features, checks
+
+
 if __name__ == "__main__":
     unittest.main()
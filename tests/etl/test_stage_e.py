@@ -8,10 +8,13 @@ from tempfile import TemporaryDirectory
 import json
 import threading
 import unittest
+from unittest.mock import patch
 
 import pandas as pd
 
 from tradepilot import db
+from tradepilot.etl import read_models
+from tradepilot.etl.latest_index import latest_rebalance_pointer
 from tradepilot.etl.models import RunStatus
 from tradepilot.etl.read_models import get_latest_etf_aw_regime_context
 from tradepilot.etl.service import ETLService
@@ -331,6 +334,48 @@ class StageERegimeScoreTests(unittest.TestCase):
         self.assertNotIn("target_weight", context)
         self.assertNotIn("trade_action", context)
 
+    def test_read_service_reads_only_the_indexed_latest_date(self) -> None:
+        rows = [
+            self._row("510300.SH", "equity_large", 0.02, 0.04, 0.06),
+            self._row("511010.SH", "bond", -0.02, -0.04, -0.06),
+        ]
+        august = [
+            {
+                **row,
+                "calendar_month": "2024-08",
+                "rebalance_date": date(2024, 8, 22),
+                "effective_date": date(2024, 8, 22),
+            }
+            for row in rows
+        ]
+        self._write_snapshot(rows + august)
+        self.service.run_bootstrap(
+            "derived.etf_aw_regime_score.build",
+            start=date(2024, 7, 1),
+            end=date(2024, 8, 31),
+        )
+
+        pointer = latest_rebalance_pointer(
+            self.conn, "derived.etf_aw_regime_score", date(2024, 8, 1)
+        )
+        with patch(
+            "tradepilot.etl.read_models.read_dataset_arrow",
+            wraps=read_models.read_dataset_arrow,
+        ) as reader:
+            context = get_latest_etf_aw_regime_context(
+                as_of_date=date(2024, 8, 1),
+                lakehouse_root=self.lakehouse_root,
+                conn=self.conn,
+            )
+
+        assert pointer is not None
+        self.assertEqual(pointer.rebalance_date, date(2024, 7, 22))
+        self.assertEqual(pointer.scorer_version, "v1")
+        self.assertEqual((pointer.partition_year, pointer.partition_month), (2024, 7))
+        self.assertEqual(reader.call_args.kwargs["start"], date(2024, 7, 22))
+        assert context is not None
+        self.assertEqual(context["rebalance_date"], "2024-07-22")
+
     def test_invalid_rebalance_date_is_ignored_by_read_service(self) -> None:
         path = self._score_file_path(2024, 7)
         path.parent.mkdir(parents=True, exist_ok=True)
@@ -2,15 +2,32 @@
 
 from __future__ import annotations
 
+from datetime import date
 from pathlib import Path
 from tempfile import TemporaryDirectory
 import unittest
+from unittest.mock import patch
 
-from tradepilot.etl.models import StorageZone
+import duckdb
+import pandas as pd
+import pyarrow.parquet as pq
+
+from tradepilot import db
+from tradepilot.etl.manifest import list_partition_files, list_partition_months
+from tradepilot.etl.models import ParquetWriteProfile, PartitionLayout, StorageZone
 from tradepilot.etl.storage import (
     build_partition_path,
     build_zone_path,
+    catalog_dataset_files,
     ensure_zone_roots,
+    list_delta_files,
+    list_month_partitions,
+    migrate_dataset_layout,
+    open_raw_parquet_stream,
+    read_dataset_partition,
+    stored_content_hash,
+    write_dataset_delta_parquet,
+    write_dataset_parquet,
 )
 
 
@@ -86,5 +103,368 @@ class StoragePathTests(unittest.TestCase):
             )
 
 
+class StorageDeltaTests(unittest.TestCase):
+    """Verify append-only delta files and merge-on-read."""
+
+    def test_read_dataset_partition_applies_deltas_in_run_order(self) -> None:
+        """Let the newest delta win for each business key."""
+
+        parts = [("year", 2026), ("month", "04")]
+        with TemporaryDirectory() as temp_dir:
+            root = Path(temp_dir)
+            write_dataset_parquet(
+                pd.DataFrame({"code": ["a", "b"], "close": [1.0, 2.0]}),
+                "market.etf_daily",
+                StorageZone.NORMALIZED,
+                parts,
+                lakehouse_root=root,
+            )
+            for run_id, close in ((12, 4.0), (3, 3.0)):
+                write_dataset_delta_parquet(
+                    pd.DataFrame({"code": ["b"], "close": [close]}),
+                    "market.etf_daily",
+                    StorageZone.NORMALIZED,
+                    parts,
+                    run_id,
+                    lakehouse_root=root,
+                )
+
+            merged = read_dataset_partition(
+                "market.etf_daily",
+                StorageZone.NORMALIZED,
+                parts,
+                ["code"],
+                lakehouse_root=root,
+            )
+            deltas = list_delta_files(
+                build_partition_path(
+                    "market.etf_daily", StorageZone.NORMALIZED, parts, root
+                )
+            )
+
+        self.assertEqual(
+            [path.name for path in deltas],
+            ["part-delta-3.parquet", "part-delta-12.parquet"],
+        )
+        self.assertEqual(merged["code"].tolist(), ["a", "b"])
+        self.assertEqual(merged["close"].tolist(), [1.0, 4.0])
+
+
+class StorageContentHashTests(unittest.TestCase):
+    """Verify partition writes are skipped when content is unchanged."""
+
+    def test_identical_content_skips_rewrite(self) -> None:
+        """Ignore lineage columns and skip rewriting identical rows."""
+
+        parts = [("year", 2026), ("month", "04")]
+        frame = pd.DataFrame(
+            {"code": ["a", "b"], "close": [1.0, 2.0], "raw_batch_id": [1, 1]}
+        )
+        with TemporaryDirectory() as temp_dir:
+            root = Path(temp_dir)
+            first = write_dataset_parquet(
+                frame, "market.etf_daily", StorageZone.NORMALIZED, parts, root
+            )
+            first_mtime = first.path.stat().st_mtime_ns
+            reloaded = write_dataset_parquet(
+                frame.assign(raw_batch_id=2),
+                "market.etf_daily",
+                StorageZone.NORMALIZED,
+                parts,
+                root,
+            )
+            reloaded_mtime = first.path.stat().st_mtime_ns
+            changed = write_dataset_parquet(
+                frame.assign(close=[1.0, 3.0]),
+                "market.etf_daily",
+                StorageZone.NORMALIZED,
+                parts,
+                root,
+            )
+            stored_hash = stored_content_hash(changed.path)
+            stored = pd.read_parquet(changed.path)
+
+        self.assertFalse(first.unchanged)
+        self.assertTrue(reloaded.unchanged)
+        self.assertEqual(reloaded.content_hash, first.content_hash)
+        self.assertEqual(reloaded_mtime, first_mtime)
+        self.assertFalse(changed.unchanged)
+        self.assertNotEqual(changed.content_hash, first.content_hash)
+        self.assertEqual(stored_hash, changed.content_hash)
+        self.assertEqual(stored["close"].tolist(), [1.0, 3.0])
+
+    def test_file_without_recorded_hash_is_rewritten(self) -> None:
+        """Rewrite files that predate content hashes once."""
+
+        parts = [("year", 2026), ("month", "04")]
+        frame = pd.DataFrame({"code": ["a"], "close": [1.0]})
+        with TemporaryDirectory() as temp_dir:
+            root = Path(temp_dir)
+            legacy = build_partition_path(
+                "market.etf_daily", StorageZone.NORMALIZED, parts, root
+            )
+            legacy.mkdir(parents=True)
+            frame.to_parquet(legacy / "part-00000.parquet", index=False)
+
+            result = write_dataset_parquet(
+                frame, "market.etf_daily", StorageZone.NORMALIZED, parts, root
+            )
+            stored_hash = stored_content_hash(result.path)
+
+        self.assertFalse(result.unchanged)
+        self.assertEqual(stored_hash, result.content_hash)
+
+
+class StorageManifestTests(unittest.TestCase):
+    """Verify partition files are cataloged in the DuckDB manifest."""
+
+    def test_first_cataloged_write_adopts_existing_files(self) -> None:
+        """Register older files from their footers before the first write."""
+
+        conn = duckdb.connect()
+        db._init_tables(conn)
+        with TemporaryDirectory() as temp_dir:
+            root = Path(temp_dir)
+            write_dataset_parquet(
+                pd.DataFrame(
+                    {
+                        "code": ["a", "b"],
+                        "trade_date": [date(2026, 3, 2), date(2026, 3, 31)],
+                    }
+                ),
+                "market.etf_daily",
+                StorageZone.NORMALIZED,
+                [("year", 2026), ("month", "03")],
+                root,
+            )
+            write_dataset_parquet(
+                pd.DataFrame({"code": ["a"], "trade_date": [date(2026, 4, 1)]}),
+                "market.etf_daily",
+                StorageZone.NORMALIZED,
+                [("year", 2026), ("month", "04")],
+                root,
+                conn=conn,
+                schema_version="market_daily_v1",
+            )
+            rows = list_partition_files(conn, "market.etf_daily")
+            april_only = list_partition_months(
+                conn,
+                "market.etf_daily",
+                StorageZone.NORMALIZED,
+                start=date(2026, 4, 1),
+            )
+            recataloged = catalog_dataset_files(
+                conn, "market.etf_daily", StorageZone.NORMALIZED, root
+            )
+        conn.close()
+
+        self.assertEqual(
+            [(row["partition_month"], row["row_count"]) for row in rows],
+            [(3, 2), (4, 1)],
+        )
+        self.assertEqual(
+            (rows[0]["min_date"], rows[0]["max_date"]),
+            (date(2026, 3, 2), date(2026, 3, 31)),
+        )
+        self.assertEqual(april_only, [(2026, 4)])
+        self.assertEqual(recataloged, 2)
+
+
+class StorageWriteProfileTests(unittest.TestCase):
+    """Verify dataset write profiles shape canonical parquet files."""
+
+    def test_profile_sorts_rows_and_bounds_row_groups(self) -> None:
+        """Keep each instrument in its own row group range with statistics."""
+
+        profile = ParquetWriteProfile(
+            sort_columns=["instrument_id", "trade_date"],
+            row_group_size=10,
+            compression="zstd",
+            compression_level=3,
+            dictionary_columns=["instrument_id"],
+            bloom_filter_columns=["instrument_id"],
+        )
+        days = [date(2026, 4, day) for day in range(1, 11)]
+        frame = pd.DataFrame(
+            {
+                "instrument_id": [f"51030{index}.SH" for index in range(3)] * 10,
+                "trade_date": [day for day in days for _ in range(3)],
+                "close": [float(index) for index in range(30)],
+            }
+        )
+        with TemporaryDirectory() as temp_dir:
+            result = write_dataset_parquet(
+                frame,
+                "market.etf_daily",
+                StorageZone.NORMALIZED,
+                [("year", 2026), ("month", "04")],
+                Path(temp_dir),
+                profile=profile,
+            )
+            metadata = pq.read_metadata(result.path)
+            stored = pd.read_parquet(result.path)
+
+        groups = [metadata.row_group(index) for index in range(metadata.num_row_groups)]
+        self.assertEqual(len(groups), 3)
+        self.assertEqual(
+            [
+                (group.column(0).statistics.min, group.column(0).statistics.max)
+                for group in groups
+            ],
+            [(f"51030{index}.SH", f"51030{index}.SH") for index in range(3)],
+        )
+        self.assertEqual(groups[0].column(0).compression, "ZSTD")
+        self.assertEqual(
+            [column.column_index for column in groups[0].sorting_columns],
+            [0, 1],
+        )
+        self.assertEqual(stored["trade_date"].tolist()[:10], days)
+
+
+class StorageLayoutTests(unittest.TestCase):
+    """Verify plain and hive-style partition directory layouts."""
+
+    def test_new_dataset_uses_configured_layout_and_keeps_it(self) -> None:
+        """Name new partitions from config, later ones from what is on disk."""
+
+        with TemporaryDirectory() as temp_dir:
+            root = Path(temp_dir)
+            frame = pd.DataFrame({"code": ["a"], "close": [1.0]})
+            with patch("tradepilot.etl.storage.LAKEHOUSE_PARTITION_LAYOUT", "hive"):
+                first = write_dataset_parquet(
+                    frame,
+                    "market.etf_daily",
+                    StorageZone.NORMALIZED,
+                    [("year", 2026), ("month", "03")],
+                    root,
+                )
+            second = write_dataset_parquet(
+                frame,
+                "market.etf_daily",
+                StorageZone.NORMALIZED,
+                [("year", 2026), ("month", "04")],
+                root,
+            )
+            months = list_month_partitions(
+                "market.etf_daily", StorageZone.NORMALIZED, root
+            )
+
+        self.assertEqual(
+            first.relative_path,
+            "normalized/market.etf_daily/year=2026/month=03/part-00000.parquet",
+        )
+        self.assertEqual(
+            second.relative_path,
+            "normalized/market.etf_daily/year=2026/month=04/part-00000.parquet",
+        )
+        self.assertEqual([month for month, _ in months], [(2026, 3), (2026, 4)])
+
+    def test_interrupted_migration_swap_is_finished(self) -> None:
+        """Move a staged tree into place when the crash left no dataset root."""
+
+        with TemporaryDirectory() as temp_dir:
+            root = Path(temp_dir)
+            parts = [("year", 2026), ("month", "04")]
+            write_dataset_parquet(
+                pd.DataFrame({"code": ["a"], "close": [1.0]}),
+                "market.etf_daily",
+                StorageZone.NORMALIZED,
+                parts,
+                root,
+            )
+            dataset_root = build_zone_path(
+                "market.etf_daily", StorageZone.NORMALIZED, root
+            )
+            staged = dataset_root.with_name(f".{dataset_root.name}.migrating")
+            (staged / "year=2026").mkdir(parents=True)
+            (dataset_root / "2026" / "04").rename(staged / "year=2026" / "month=04")
+            previous = dataset_root.with_name(f".{dataset_root.name}.previous")
+            dataset_root.rename(previous)
+
+            renames = migrate_dataset_layout(
+                "market.etf_daily",
+                StorageZone.NORMALIZED,
+                PartitionLayout.HIVE,
+                lakehouse_root=root,
+            )
+            merged = read_dataset_partition(
+                "market.etf_daily", StorageZone.NORMALIZED, parts, ["code"], root
+            )
+            leftovers = sorted(path.name for path in dataset_root.parent.iterdir())
+
+        self.assertEqual(renames, {})
+        self.assertEqual(merged["close"].tolist(), [1.0])
+        self.assertEqual(leftovers, ["market.etf_daily"])
+
+
+class StorageRawStreamTests(unittest.TestCase):
+    """Verify streamed raw batches land atomically in row groups."""
+
+    def test_raw_stream_writes_one_row_group_per_chunk(self) -> None:
+        """Write non-empty chunks as row groups behind one atomic replace."""
+
+        parts = [("year", 2026), ("month", "04")]
+        with TemporaryDirectory() as temp_dir:
+            root = Path(temp_dir)
+            writer = open_raw_parquet_stream("market.etf_daily", parts, 7, root)
+            writer.write(pd.DataFrame({"code": ["a"], "note": [None]}))
+            writer.write(pd.DataFrame({"code": pd.Series(dtype="object")}))
+            writer.write(pd.DataFrame({"code": ["b", "c"], "note": ["x", None]}))
+            self.assertEqual(list(root.rglob("batch-7.parquet")), [])
+
+            result = writer.close()
+            parquet = pq.ParquetFile(result.path)
+            frame = pd.read_parquet(result.path)
+
+            aborted = open_raw_parquet_stream("market.etf_daily", parts, 8, root)
+            aborted.write(pd.DataFrame({"code": ["d"]}))
+            aborted.abort()
+            leftovers = [path.name for path in root.rglob("*batch-8*")]
+
+        self.assertEqual(result.row_count, 3)
+        self.assertEqual(result.path.name, "batch-7.parquet")
+        self.assertEqual(parquet.num_row_groups, 2)
+        self.assertEqual(frame["code"].tolist(), ["a", "b", "c"])
+        self.assertEqual(leftovers, [])
+
+    def test_raw_stream_fills_null_column_from_later_chunk(self) -> None:
+        """Adopt a real type for a column that started out all-null."""
+
+        parts = [("year", 2026), ("month", "04")]
+        with TemporaryDirectory() as temp_dir:
+            root = Path(temp_dir)
+            writer = open_raw_parquet_stream("market.etf_daily", parts, 7, root)
+            writer.write(pd.DataFrame({"code": ["a"], "close": [None]}))
+            writer.write(pd.DataFrame({"code": ["b"], "close": [1.5]}))
+            result = writer.close()
+            parquet = pq.ParquetFile(result.path)
+            frame = pd.read_parquet(result.path)
+            stored_hash = stored_content_hash(result.path)
+
+        self.assertEqual(str(parquet.schema_arrow.field("close").type), "double")
+        self.assertEqual(parquet.num_row_groups, 2)
+        self.assertTrue(pd.isna(frame["close"].iloc[0]))
+        self.assertEqual(frame["close"].iloc[1], 1.5)
+        self.assertEqual(stored_hash, result.content_hash)
+
+    def test_raw_stream_widens_integer_column_to_float(self) -> None:
+        """Promote an integer column when a later chunk carries floats."""
+
+        parts = [("year", 2026), ("month", "04")]
+        with TemporaryDirectory() as temp_dir:
+            root = Path(temp_dir)
+            writer = open_raw_parquet_stream("market.etf_daily", parts, 7, root)
+            writer.write(pd.DataFrame({"code": ["a"], "volume": [3]}))
+            writer.write(pd.DataFrame({"code": ["b"], "volume": [2.5]}))
+            result = writer.close()
+            parquet = pq.ParquetFile(result.path)
+            frame = pd.read_parquet(result.path)
+
+        self.assertEqual(str(parquet.schema_arrow.field("volume").type), "double")
+        self.assertEqual(frame["volume"].tolist(), [3.0, 2.5])
+        self.assertEqual(frame["code"].tolist(), ["a", "b"])
+        self.assertEqual(result.row_count, 2)
+
+
 if __name__ == "__main__":
     unittest.main()
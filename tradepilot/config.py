@@ -44,6 +44,12 @@ LAKEHOUSE_ROOT = DATA_ROOT / "lakehouse"
 LAKEHOUSE_RAW_ROOT = LAKEHOUSE_ROOT / "raw"
 LAKEHOUSE_NORMALIZED_ROOT = LAKEHOUSE_ROOT / "normalized"
 LAKEHOUSE_DERIVED_ROOT = LAKEHOUSE_ROOT / "derived"
+# Directory naming for new datasets: "plain" (2024/03) or "hive" (year=2024/month=03).
+# Datasets that already have partitions keep the layout found on disk.
+LAKEHOUSE_PARTITION_LAYOUT = _env("LAKEHOUSE_PARTITION_LAYOUT", "plain") or "plain"
+# Parquet files behind the read-through provider cache, indexed in DuckDB.
+PROVIDER_CACHE_ROOT = DATA_ROOT / "provider_cache"
+PROVIDER_CACHE_ENABLED = (_env("PROVIDER_CACHE_ENABLED", "1") or "1") != "0"
 BILIBILI_STORAGE_PATH = DATA_ROOT / "bilibili"
 RESEARCH_REPORT_ROOT = Path(
     _env("RESEARCH_REPORT_ROOT", "/Volumes/Data/research_report")
@@ -52,3 +58,7 @@ RESEARCH_REPORT_ROOT = Path(
 TUSHARE_TOKEN: str | None = _env("TUSHARE_TOKEN")
 TUSHARE_ENABLED: bool = bool(TUSHARE_TOKEN)
 AKSHARE_TUSHARE_FALLBACK_ENABLED = True
+# Per-minute quotas overriding the defaults, e.g. "tushare.quotes=500,akshare=120".
+SOURCE_RATE_LIMITS = _env("SOURCE_RATE_LIMITS", "") or ""
+# Source requests a client keeps in flight when fanning out over dates.
+SOURCE_MAX_WORKERS = int(_env("SOURCE_MAX_WORKERS", "4") or "4")
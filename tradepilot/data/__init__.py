@@ -1,30 +1,41 @@
 """Structured data provider factory and exports."""
 
-from tradepilot.config import DATA_PROVIDER, DataProviderType
+from tradepilot.config import DATA_PROVIDER, PROVIDER_CACHE_ENABLED, DataProviderType
 from tradepilot.data.provider import DataProvider
 
 _provider: DataProvider | None = None
 
 
 def get_provider() -> DataProvider:
-    """Return the configured structured data provider (singleton)."""
+    """Return the configured structured data provider (singleton).
+
+    Remote providers are wrapped in a read-through ``CachingProvider`` unless
+    ``PROVIDER_CACHE_ENABLED`` is off; mock data is never cached.
+    """
     global _provider
     if _provider is not None:
         return _provider
+    provider: DataProvider
     if DATA_PROVIDER == DataProviderType.AKSHARE:
         from tradepilot.data.akshare_provider import AKShareProvider
 
-        _provider = AKShareProvider()
+        provider = AKShareProvider()
     elif DATA_PROVIDER == DataProviderType.TUSHARE:
         from tradepilot.data.tushare_provider import TushareProvider
 
-        _provider = TushareProvider()
+        provider = TushareProvider()
     elif DATA_PROVIDER == DataProviderType.MOCK:
         from tradepilot.data.mock_provider import MockProvider
 
         _provider = MockProvider()
+        return _provider
     else:
         raise ValueError(f"unsupported DATA_PROVIDER: {DATA_PROVIDER}")
+    if PROVIDER_CACHE_ENABLED:
+        from tradepilot.data.caching_provider import CachingProvider
+
+        provider = CachingProvider(provider)
+    _provider = provider
     return _provider
 
 
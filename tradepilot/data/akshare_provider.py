@@ -8,7 +8,6 @@ the provider logs the error and falls back to MockProvider.
 
 from __future__ import annotations
 
-import time
 from typing import cast
 
 import akshare as ak
@@ -17,6 +16,11 @@ from loguru import logger
 
 from tradepilot.config import AKSHARE_TUSHARE_FALLBACK_ENABLED
 from tradepilot.data.provider import DataProvider, sanitize_for_json
+from tradepilot.data.rate_limit import (
+    RateLimitedClient,
+    shared_rate_limiter,
+    shared_request_executor,
+)
 from tradepilot.data.tushare_client import TushareClient
 
 # Column rename maps: akshare Chinese → our English schema
@@ -52,8 +56,12 @@ _SECTOR_CONS_RENAME = {
     "名称": "stock_name",
 }
 
-# Default inter-request pause to avoid rate limits (seconds).
-_REQUEST_PAUSE = 0.3
+# Rate-limit families of akshare functions by upstream site; East Money
+# endpoints use the default "akshare" family.
+_ENDPOINT_FAMILIES = {
+    "index_stock_info": "akshare.csindex",
+    "stock_zh_valuation_baidu": "akshare.baidu",
+}
 
 
 def _fmt_date(date_str: str) -> str:
@@ -71,12 +79,15 @@ class AKShareProvider(DataProvider):
 
     def __init__(self) -> None:
         self._tushare = TushareClient()
+        self._ak = RateLimitedClient(
+            ak, shared_rate_limiter(), _ENDPOINT_FAMILIES, "akshare"
+        )
+        self._executor = shared_request_executor()
         logger.info("AKShareProvider initialised")
 
     def get_stock_catalog(self) -> pd.DataFrame:
         try:
-            time.sleep(_REQUEST_PAUSE)
-            stocks = ak.stock_zh_a_spot_em()
+            stocks = self._ak.stock_zh_a_spot_em()
             normalized = stocks.rename(columns={"代码": "code", "名称": "name"}).copy()
             normalized = cast(
                 pd.DataFrame,
@@ -93,8 +104,7 @@ class AKShareProvider(DataProvider):
 
     def get_index_catalog(self) -> pd.DataFrame:
         try:
-            time.sleep(_REQUEST_PAUSE)
-            indices = ak.index_stock_info()
+            indices = self._ak.index_stock_info()
             normalized = indices.rename(
                 columns={"index_code": "code", "display_name": "name"}
             ).copy()
@@ -139,8 +149,7 @@ class AKShareProvider(DataProvider):
     ) -> pd.DataFrame:
         """Shared helper for daily/weekly/monthly stock history."""
         try:
-            time.sleep(_REQUEST_PAUSE)
-            df = ak.stock_zh_a_hist(
+            df = self._ak.stock_zh_a_hist(
                 symbol=stock_code,
                 period=period,
                 start_date=_fmt_date(start_date),
@@ -212,8 +221,7 @@ class AKShareProvider(DataProvider):
     ) -> pd.DataFrame:
         """Return daily OHLCV data for an index."""
         try:
-            time.sleep(_REQUEST_PAUSE)
-            df = ak.index_zh_a_hist(
+            df = self._ak.index_zh_a_hist(
                 symbol=index_code,
                 period="daily",
                 start_date=_fmt_date(start_date),
@@ -251,10 +259,9 @@ class AKShareProvider(DataProvider):
         instrument.  Maps ``主力净流入-净额`` to ``net_inflow``.
         """
         try:
-            time.sleep(_REQUEST_PAUSE)
             # Determine market prefix for akshare
             market = "sh" if etf_code.startswith(("5", "6")) else "sz"
-            df = ak.stock_individual_fund_flow(stock=etf_code, market=market)
+            df = self._ak.stock_individual_fund_flow(stock=etf_code, market=market)
             df = df.rename(
                 columns={
                     "日期": "date",
@@ -308,8 +315,7 @@ class AKShareProvider(DataProvider):
     def get_northbound_flow(self, start_date: str, end_date: str) -> pd.DataFrame:
         """Return northbound capital flow data."""
         try:
-            time.sleep(_REQUEST_PAUSE)
-            df = ak.stock_hsgt_hist_em(symbol="北向资金")
+            df = self._ak.stock_hsgt_hist_em(symbol="北向资金")
             df = df.rename(columns=_NORTHBOUND_RENAME)
             df["date"] = pd.to_datetime(df["date"], errors="coerce")
             start = pd.to_datetime(start_date)
@@ -350,12 +356,15 @@ class AKShareProvider(DataProvider):
                 "pb": "市净率",
                 "market_cap": "总市值",
             }
-            merged: pd.DataFrame | None = None
-            for col_name, indicator in indicators.items():
-                time.sleep(_REQUEST_PAUSE)
-                df = ak.stock_zh_valuation_baidu(
+
+            def fetch(indicator: str) -> pd.DataFrame:
+                return self._ak.stock_zh_valuation_baidu(
                     symbol=stock_code, indicator=indicator, period="全部"
                 )
+
+            frames = self._executor.map(fetch, indicators.values())
+            merged: pd.DataFrame | None = None
+            for col_name, df in zip(indicators, frames):
                 df.columns = ["date", col_name]
                 df["date"] = pd.to_datetime(df["date"], errors="coerce")
                 if merged is None:
@@ -419,8 +428,7 @@ class AKShareProvider(DataProvider):
     ) -> pd.DataFrame:
         """Return stock members for a sector (industry board)."""
         try:
-            time.sleep(_REQUEST_PAUSE)
-            df = ak.stock_board_industry_cons_em(symbol=sector)
+            df = self._ak.stock_board_industry_cons_em(symbol=sector)
             df = df.rename(columns=_SECTOR_CONS_RENAME)
             result = pd.DataFrame(
                 {
@@ -451,16 +459,14 @@ class AKShareProvider(DataProvider):
         This is an expensive operation; cache results in DuckDB for repeated use.
         """
         try:
-            time.sleep(_REQUEST_PAUSE)
-            boards = ak.stock_board_industry_name_em()
+            boards = self._ak.stock_board_industry_name_em()
             matches: list[str] = []
             for _, row in boards.iterrows():
                 sector_name = row.get("板块名称", "")
                 if not sector_name:
                     continue
-                time.sleep(_REQUEST_PAUSE)
                 try:
-                    members = ak.stock_board_industry_cons_em(symbol=sector_name)
+                    members = self._ak.stock_board_industry_cons_em(symbol=sector_name)
                     if stock_code in members["代码"].values:
                         matches.append(sector_name)
                 except Exception:
@@ -0,0 +1,461 @@
+"""Read-through local cache in front of a structured data provider."""
+
+from __future__ import annotations
+
+from collections.abc import Callable, Mapping
+import copy
+from dataclasses import dataclass
+from datetime import date, datetime, time, timedelta
+from pathlib import Path
+import threading
+from uuid import uuid4
+
+import duckdb
+import pandas as pd
+from loguru import logger
+
+from tradepilot import db
+from tradepilot.config import PROVIDER_CACHE_ROOT
+from tradepilot.data.provider import DataProvider, sanitize_for_json
+from tradepilot.data.trade_ranges import (
+    market_now,
+    missing_trade_ranges,
+    record_materialized_range,
+)
+
+# Coverage rows live in ``materialized_ranges`` under prefixed dataset names.
+_COVERAGE_PREFIX = "provider_cache."
+# Catalog and membership snapshots older than this are refetched.
+_SNAPSHOT_TTL = timedelta(hours=12)
+# Files kept per cached series before they are folded into one.
+_COMPACT_AFTER_FILES = 16
+
+
+@dataclass(frozen=True)
+class CacheRule:
+    """Freshness rule for one date-ranged provider dataset.
+
+    A date's rows are final ``settle_lag_days`` calendar days after it, once
+    the market clock passes ``settle_time``. Coverage is only recorded up to
+    the last final date, so today's bar stays refetchable until the close.
+    """
+
+    settle_time: time = time(15, 30)
+    settle_lag_days: int = 0
+    date_column: str = "date"
+    # Columns that, with the date, identify one row within a cached series.
+    key_columns: tuple[str, ...] = ()
+
+    def last_settled_date(self, now: datetime) -> date:
+        settled = now.date() - timedelta(days=self.settle_lag_days)
+        if now.time() < self.settle_time:
+            settled -= timedelta(days=1)
+        return settled
+
+
+DEFAULT_CACHE_RULES: dict[str, CacheRule] = {
+    "stock_daily": CacheRule(),
+    "index_daily": CacheRule(),
+    "etf_flow": CacheRule(settle_time=time(17, 0)),
+    "stock_valuation": CacheRule(settle_time=time(18, 0)),
+    # Margin balances for a session are published the next morning.
+    "margin_data": CacheRule(
+        settle_time=time(9, 30), settle_lag_days=1, key_columns=("stock_code",)
+    ),
+    "northbound_flow": CacheRule(settle_time=time(17, 0)),
+    "sector_data": CacheRule(settle_time=time(17, 0), key_columns=("sector",)),
+}
+
+
+class CachingProvider(DataProvider):
+    """Serve provider data from local parquet files indexed in DuckDB.
+
+    Date-ranged datasets record which days each series already holds and
+    fetch only the missing open-session ranges from ``upstream``. Catalogs
+    and sector memberships are cached as snapshots. Weekly and monthly bars
+    aggregate over their window, so they are passed through uncached.
+    """
+
+    def __init__(
+        self,
+        upstream: DataProvider,
+        *,
+        conn: duckdb.DuckDBPyConnection | None = None,
+        cache_root: Path | None = None,
+        rules: Mapping[str, CacheRule] | None = None,
+        clock: Callable[[], datetime] | None = None,
+    ) -> None:
+        self.upstream = upstream
+        self.cache_root = cache_root or PROVIDER_CACHE_ROOT
+        self.rules = {**DEFAULT_CACHE_RULES, **(rules or {})}
+        self._conn = conn
+        self._clock = clock or market_now
+        self._guard = threading.Lock()
+        self._series_locks: dict[tuple[str, str], threading.Lock] = {}
+        # Serializes metadata statements when one connection is shared.
+        self._metadata = threading.Lock()
+        self._refresh = False
+
+    def refreshed(self) -> CachingProvider:
+        """Return a view of this cache that refetches every window it serves.
+
+        Fetched rows still replace the cached ones, so later reads through
+        either provider see the refreshed data.
+        """
+
+        view = copy.copy(self)
+        view._refresh = True
+        return view
+
+    def get_stock_catalog(self) -> pd.DataFrame:
+        return self._snapshot("stock_catalog", "", self.upstream.get_stock_catalog)
+
+    def get_index_catalog(self) -> pd.DataFrame:
+        return self._snapshot("index_catalog", "", self.upstream.get_index_catalog)
+
+    def get_stock_daily(
+        self, stock_code: str, start_date: str, end_date: str
+    ) -> pd.DataFrame:
+        return self._ranged(
+            "stock_daily",
+            stock_code,
+            start_date,
+            end_date,
+            lambda start, end: self.upstream.get_stock_daily(stock_code, start, end),
+        )
+
+    def get_stock_weekly(
+        self, stock_code: str, start_date: str, end_date: str
+    ) -> pd.DataFrame:
+        return self.upstream.get_stock_weekly(stock_code, start_date, end_date)
+
+    def get_stock_monthly(
+        self, stock_code: str, start_date: str, end_date: str
+    ) -> pd.DataFrame:
+        return self.upstream.get_stock_monthly(stock_code, start_date, end_date)
+
+    def get_index_daily(
+        self, index_code: str, start_date: str, end_date: str
+    ) -> pd.DataFrame:
+        return self._ranged(
+            "index_daily",
+            index_code,
+            start_date,
+            end_date,
+            lambda start, end: self.upstream.get_index_daily(index_code, start, end),
+        )
+
+    def get_etf_flow(
+        self, etf_code: str, start_date: str, end_date: str
+    ) -> pd.DataFrame:
+        return self._ranged(
+            "etf_flow",
+            etf_code,
+            start_date,
+            end_date,
+            lambda start, end: self.upstream.get_etf_flow(etf_code, start, end),
+        )
+
+    def get_margin_data(self, start_date: str, end_date: str) -> pd.DataFrame:
+        return self._ranged(
+            "margin_data", "", start_date, end_date, self.upstream.get_margin_data
+        )
+
+    def get_northbound_flow(self, start_date: str, end_date: str) -> pd.DataFrame:
+        return self._ranged(
+            "northbound_flow",
+            "",
+            start_date,
+            end_date,
+            self.upstream.get_northbound_flow,
+        )
+
+    def get_stock_valuation(
+        self, stock_code: str, start_date: str, end_date: str
+    ) -> pd.DataFrame:
+        return self._ranged(
+            "stock_valuation",
+            stock_code,
+            start_date,
+            end_date,
+            lambda start, end: self.upstream.get_stock_valuation(
+                stock_code, start, end
+            ),
+        )
+
+    def get_sector_data(self, start_date: str, end_date: str) -> pd.DataFrame:
+        return self._ranged(
+            "sector_data", "", start_date, end_date, self.upstream.get_sector_data
+        )
+
+    def get_sector_stocks(
+        self, sector: str, as_of_date: str | None = None
+    ) -> pd.DataFrame:
+        return self._snapshot(
+            "sector_stocks",
+            f"{sector}|{as_of_date or ''}",
+            lambda: self.upstream.get_sector_stocks(sector, as_of_date),
+            final=self._is_past(as_of_date),
+        )
+
+    def get_stock_sector(
+        self, stock_code: str, as_of_date: str | None = None
+    ) -> pd.DataFrame:
+        return self._snapshot(
+            "stock_sector",
+            f"{stock_code}|{as_of_date or ''}",
+            lambda: self.upstream.get_stock_sector(stock_code, as_of_date),
+            final=self._is_past(as_of_date),
+        )
+
+    def _ranged(
+        self,
+        dataset_name: str,
+        cache_key: str,
+        start_date: str,
+        end_date: str,
+        fetch: Callable[[str, str], pd.DataFrame],
+    ) -> pd.DataFrame:
+        """Return one series window, fetching only days not yet cached."""
+
+        start, end = _parse_date(start_date), _parse_date(end_date)
+        if start > end:
+            return fetch(start_date, end_date)
+        rule = self.rules[dataset_name]
+        coverage_name = _COVERAGE_PREFIX + dataset_name
+        with self._series_lock(dataset_name, cache_key):
+            settled = rule.last_settled_date(self._clock())
+            if self._refresh:
+                gaps = [(start, end)]
+            else:
+                with self._metadata:
+                    gaps = missing_trade_ranges(
+                        self._connection(), coverage_name, cache_key, start, end
+                    )
+            for gap_start, gap_end in gaps:
+                logger.debug(
+                    "provider cache: fetch {} {} {}..{}",
+                    dataset_name,
+                    cache_key,
+                    gap_start,
+                    gap_end,
+                )
+                frame = fetch(gap_start.isoformat(), gap_end.isoformat())
+                # Empty answers may mean a closed market or a disabled source,
+                # so they neither replace cached files nor count as coverage.
+                if not frame.empty:
+                    self._store(
+                        dataset_name, cache_key, frame, rule, gap_start, gap_end
+                    )
+                    with self._metadata:
+                        record_materialized_range(
+                            self._connection(),
+                            coverage_name,
+                            cache_key,
+                            gap_start,
+                            min(gap_end, settled),
+                        )
+            return self._read_window(dataset_name, cache_key, rule, start, end)
+
+    def _snapshot(
+        self,
+        dataset_name: str,
+        cache_key: str,
+        fetch: Callable[[], pd.DataFrame],
+        *,
+        final: bool = False,
+    ) -> pd.DataFrame:
+        """Return a cached whole-frame snapshot, refetching it once stale."""
+
+        with self._series_lock(dataset_name, cache_key):
+            files = self._files(dataset_name, cache_key)
+            if files and not self._refresh:
+                path, fetched_at = files[-1]
+                if final or self._clock() - fetched_at < _SNAPSHOT_TTL:
+                    return pd.read_parquet(self.cache_root / path)
+            frame = fetch()
+            if not frame.empty:
+                self._write_file(dataset_name, cache_key, frame, None, None)
+                self._drop_files(files)
+            return frame
+
+    def _read_window(
+        self,
+        dataset_name: str,
+        cache_key: str,
+        rule: CacheRule,
+        start: date,
+        end: date,
+    ) -> pd.DataFrame:
+        files = self._files(dataset_name, cache_key, start, end)
+        # Later fetches come last, so deduplication keeps their rows.
+        frames = [pd.read_parquet(self.cache_root / path) for path, _ in files]
+        if not frames:
+            return pd.DataFrame()
+        frame = pd.concat(frames, ignore_index=True)
+        if rule.date_column not in frame.columns:
+            return frame
+        days = pd.to_datetime(frame[rule.date_column], errors="coerce").dt.date
+        frame = frame.loc[(days >= start) & (days <= end)]
+        keys = [rule.date_column] + [
+            column for column in rule.key_columns if column in frame.columns
+        ]
+        frame = (
+            frame.drop_duplicates(keys, keep="last")
+            .sort_values(keys, kind="mergesort")
+            .reset_index(drop=True)
+        )
+        return sanitize_for_json(frame)
+
+    def _store(
+        self,
+        dataset_name: str,
+        cache_key: str,
+        frame: pd.DataFrame,
+        rule: CacheRule,
+        start: date,
+        end: date,
+    ) -> None:
+        """Write one fetched range, then fold the series once it has many files."""
+
+        superseded = self._files_within(dataset_name, cache_key, start, end)
+        self._write_file(dataset_name, cache_key, frame, start, end)
+        self._drop_files(superseded)
+        files = self._files(dataset_name, cache_key)
+        if len(files) <= _COMPACT_AFTER_FILES:
+            return
+        merged = pd.concat(
+            [pd.read_parquet(self.cache_root / path) for path, _ in files],
+            ignore_index=True,
+        )
+        if rule.date_column in merged.columns:
+            keys = [rule.date_column] + [
+                column for column in rule.key_columns if column in merged.columns
+            ]
+            merged = merged.drop_duplicates(keys, keep="last")
+        bounds = self._file_bounds(dataset_name, cache_key)
+        self._write_file(dataset_name, cache_key, merged, *bounds)
+        self._drop_files(files)
+
+    def _write_file(
+        self,
+        dataset_name: str,
+        cache_key: str,
+        frame: pd.DataFrame,
+        start: date | None,
+        end: date | None,
+    ) -> None:
+        relative = Path(dataset_name) / f"{uuid4().hex}.parquet"
+        path = self.cache_root / relative
+        path.parent.mkdir(parents=True, exist_ok=True)
+        frame.to_parquet(path, index=False)
+        with self._metadata:
+            self._connection().execute(
+                """
+                INSERT INTO provider_cache_files (
+                    file_path, dataset_name, cache_key, start_date, end_date,
+                    row_count, fetched_at
+                ) VALUES (?, ?, ?, ?, ?, ?, ?)
+                """,
+                [
+                    relative.as_posix(),
+                    dataset_name,
+                    cache_key,
+                    start,
+                    end,
+                    len(frame),
+                    self._clock(),
+                ],
+            )
+
+    def _drop_files(self, files: list[tuple[str, datetime]]) -> None:
+        if not files:
+            return
+        with self._metadata:
+            self._connection().executemany(
+                "DELETE FROM provider_cache_files WHERE file_path = ?",
+                [[path] for path, _ in files],
+            )
+        for path, _ in files:
+            (self.cache_root / path).unlink(missing_ok=True)
+
+    def _files(
+        self,
+        dataset_name: str,
+        cache_key: str,
+        start: date | None = None,
+        end: date | None = None,
+    ) -> list[tuple[str, datetime]]:
+        """Return a series' files overlapping a window, oldest fetch first."""
+
+        with self._metadata:
+            conn = self._connection()
+            rows = conn.execute(
+                """
+                SELECT file_path, fetched_at
+                FROM provider_cache_files
+                WHERE dataset_name = ?
+                  AND cache_key = ?
+                  AND (CAST(? AS DATE) IS NULL OR end_date IS NULL OR end_date >= ?)
+                  AND (CAST(? AS DATE) IS NULL OR start_date IS NULL
+                       OR start_date <= ?)
+                ORDER BY fetched_at, file_path
+                """,
+                [dataset_name, cache_key, start, start, end, end],
+            ).fetchall()
+        return [(str(path), fetched_at) for path, fetched_at in rows]
+
+    def _files_within(
+        self, dataset_name: str, cache_key: str, start: date, end: date
+    ) -> list[tuple[str, datetime]]:
+        """Return files whose whole fetched range lies inside ``start``..``end``."""
+
+        with self._metadata:
+            conn = self._connection()
+            rows = conn.execute(
+                """
+                SELECT file_path, fetched_at
+                FROM provider_cache_files
+                WHERE dataset_name = ?
+                  AND cache_key = ?
+                  AND start_date >= ?
+                  AND end_date <= ?
+                """,
+                [dataset_name, cache_key, start, end],
+            ).fetchall()
+        return [(str(path), fetched_at) for path, fetched_at in rows]
+
+    def _file_bounds(
+        self, dataset_name: str, cache_key: str
+    ) -> tuple[date | None, date | None]:
+        with self._metadata:
+            conn = self._connection()
+            row = conn.execute(
+                """
+                SELECT MIN(start_date), MAX(end_date)
+                FROM provider_cache_files
+                WHERE dataset_name = ? AND cache_key = ?
+                """,
+                [dataset_name, cache_key],
+            ).fetchone()
+        return row[0], row[1]
+
+    def _series_lock(self, dataset_name: str, cache_key: str) -> threading.Lock:
+        with self._guard:
+            lock = self._series_locks.get((dataset_name, cache_key))
+            if lock is None:
+                lock = threading.Lock()
+                self._series_locks[(dataset_name, cache_key)] = lock
+            return lock
+
+    def _connection(self) -> duckdb.DuckDBPyConnection:
+        return self._conn if self._conn is not None else db.get_conn()
+
+    def _is_past(self, as_of_date: str | None) -> bool:
+        return as_of_date is not None and _parse_date(as_of_date) < self._clock().date()
+
+
+def _parse_date(value: str) -> date:
+    """Parse ``YYYY-MM-DD`` or ``YYYYMMDD`` provider date arguments."""
+
+    return pd.Timestamp(value).date()
@@ -0,0 +1,208 @@
+"""Token-bucket quotas and a bounded executor for remote data source calls."""
+
+from __future__ import annotations
+
+from collections.abc import Callable, Iterable, Mapping
+from concurrent.futures import ThreadPoolExecutor
+import threading
+import time
+from typing import Any, TypeVar
+
+from tradepilot.config import SOURCE_MAX_WORKERS, SOURCE_RATE_LIMITS
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+# Requests per minute by endpoint family. A family without its own entry
+# uses its dotted parent's quota but still draws from its own bucket.
+DEFAULT_QUOTAS: dict[str, float] = {
+    "tushare": 200,
+    "tushare.quotes": 500,
+    "tushare.market": 300,
+    "akshare": 200,
+}
+_FALLBACK_PER_MINUTE = 60.0
+
+
+class TokenBucket:
+    """Thread-safe bucket refilled continuously at ``per_minute`` tokens.
+
+    Callers reserve a token up front and sleep outside the lock until it
+    matures, so waiting threads are served in arrival order.
+    """
+
+    def __init__(
+        self,
+        per_minute: float,
+        capacity: float | None = None,
+        *,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        if per_minute <= 0:
+            raise ValueError(f"per_minute must be positive: {per_minute}")
+        self.rate = per_minute / 60.0
+        self.capacity = capacity if capacity is not None else max(1.0, self.rate)
+        self._tokens = self.capacity
+        self._clock = clock
+        self._sleep = sleep
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> float:
+        """Take one token, blocking until it is available; return the wait."""
+
+        with self._lock:
+            now = self._clock()
+            self._tokens = min(
+                self.capacity, self._tokens + (now - self._updated) * self.rate
+            )
+            self._updated = now
+            self._tokens -= 1
+            wait = max(0.0, -self._tokens / self.rate)
+        if wait:
+            self._sleep(wait)
+        return wait
+
+
+class RateLimiter:
+    """Token buckets per endpoint family, created on first use."""
+
+    def __init__(
+        self,
+        quotas: Mapping[str, float] | None = None,
+        *,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        self.quotas = {**DEFAULT_QUOTAS, **(quotas or {})}
+        self._clock = clock
+        self._sleep = sleep
+        self._buckets: dict[str, TokenBucket] = {}
+        self._guard = threading.Lock()
+
+    def quota(self, family: str) -> float:
+        """Return a family's requests per minute, inherited from its parents."""
+
+        name = family
+        while name:
+            if name in self.quotas:
+                return self.quotas[name]
+            name = name.rpartition(".")[0]
+        return _FALLBACK_PER_MINUTE
+
+    def acquire(self, family: str) -> float:
+        return self._bucket(family).acquire()
+
+    def call(self, family: str, fn: Callable[..., R], *args: Any, **kwargs: Any) -> R:
+        """Wait for a family token, then invoke ``fn``."""
+
+        self.acquire(family)
+        return fn(*args, **kwargs)
+
+    def _bucket(self, family: str) -> TokenBucket:
+        with self._guard:
+            bucket = self._buckets.get(family)
+            if bucket is None:
+                bucket = TokenBucket(
+                    self.quota(family), clock=self._clock, sleep=self._sleep
+                )
+                self._buckets[family] = bucket
+            return bucket
+
+
+class RequestExecutor:
+    """Thread pool keeping up to ``max_workers`` source requests in flight.
+
+    Tasks call their source through a ``RateLimitedClient``, so the pool
+    only ever runs as fast as the endpoint's quota releases tokens.
+    """
+
+    def __init__(self, max_workers: int = 1) -> None:
+        self.max_workers = max(1, max_workers)
+
+    def map(self, fn: Callable[[T], R], items: Iterable[T]) -> list[R]:
+        """Apply ``fn`` to every item concurrently, keeping input order.
+
+        The first exception raised by ``fn`` propagates once submitted work
+        has finished; callers wanting per-item tolerance catch inside ``fn``.
+        """
+
+        tasks = list(items)
+        workers = min(self.max_workers, len(tasks))
+        if workers <= 1:
+            return [fn(item) for item in tasks]
+        with ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="source-request"
+        ) as pool:
+            return list(pool.map(fn, tasks))
+
+
+class RateLimitedClient:
+    """Proxy that routes every method call of an API client through a limiter.
+
+    ``families`` maps method names to endpoint families; other methods use
+    ``default_family``. Non-callable attributes pass through untouched.
+    """
+
+    def __init__(
+        self,
+        client: Any,
+        limiter: RateLimiter,
+        families: Mapping[str, str],
+        default_family: str,
+    ) -> None:
+        self._client = client
+        self._limiter = limiter
+        self._families = dict(families)
+        self._default_family = default_family
+
+    def __getattr__(self, name: str) -> Any:
+        attribute = getattr(self._client, name)
+        if not callable(attribute):
+            return attribute
+        family = self._families.get(name, self._default_family)
+
+        def limited(*args: Any, **kwargs: Any) -> Any:
+            return self._limiter.call(family, attribute, *args, **kwargs)
+
+        return limited
+
+
+def parse_quotas(text: str) -> dict[str, float]:
+    """Parse ``family=per_minute`` pairs separated by commas."""
+
+    quotas: dict[str, float] = {}
+    for entry in text.split(","):
+        entry = entry.strip()
+        if not entry:
+            continue
+        family, separator, value = entry.partition("=")
+        try:
+            per_minute = float(value)
+        except ValueError:
+            per_minute = 0.0
+        if not separator or not family.strip() or per_minute <= 0:
+            raise ValueError(f"invalid rate limit entry: {entry!r}")
+        quotas[family.strip()] = per_minute
+    return quotas
+
+
+_shared_limiter: RateLimiter | None = None
+_shared_lock = threading.Lock()
+
+
+def shared_rate_limiter() -> RateLimiter:
+    """Return the process-wide limiter configured by ``SOURCE_RATE_LIMITS``."""
+
+    global _shared_limiter
+    with _shared_lock:
+        if _shared_limiter is None:
+            _shared_limiter = RateLimiter(parse_quotas(SOURCE_RATE_LIMITS))
+        return _shared_limiter
+
+
+def shared_request_executor() -> RequestExecutor:
+    """Return an executor sized by ``SOURCE_MAX_WORKERS``."""
+
+    return RequestExecutor(SOURCE_MAX_WORKERS)
@@ -0,0 +1,183 @@
+"""Trade-date interval sets recording which days a series already holds."""
+
+from __future__ import annotations
+
+from collections.abc import Iterable
+from datetime import date, datetime, timedelta
+from zoneinfo import ZoneInfo
+
+import duckdb
+
+MARKET_TZ = ZoneInfo("Asia/Shanghai")
+
+
+def market_now() -> datetime:
+    """Return the naive wall-clock time on the exchange."""
+
+    return datetime.now(MARKET_TZ).replace(tzinfo=None)
+
+
+def merge_ranges(ranges: Iterable[tuple[date, date]]) -> list[tuple[date, date]]:
+    """Merge overlapping or day-adjacent inclusive date ranges."""
+
+    merged: list[tuple[date, date]] = []
+    for start, end in sorted(ranges):
+        if merged and start <= merged[-1][1] + timedelta(days=1):
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def subtract_ranges(
+    covered: Iterable[tuple[date, date]], start: date, end: date
+) -> list[tuple[date, date]]:
+    """Return the inclusive sub-ranges of ``start``..``end`` not covered."""
+
+    missing: list[tuple[date, date]] = []
+    cursor = start
+    for covered_start, covered_end in merge_ranges(covered):
+        if covered_end < cursor:
+            continue
+        if covered_start > end:
+            break
+        if covered_start > cursor:
+            missing.append((cursor, covered_start - timedelta(days=1)))
+        cursor = max(cursor, covered_end + timedelta(days=1))
+        if cursor > end:
+            return missing
+    missing.append((cursor, end))
+    return missing
+
+
+def open_trade_days(
+    conn: duckdb.DuckDBPyConnection, start: date, end: date
+) -> list[date]:
+    """Return the open sessions between two dates, inclusive.
+
+    Both the synced and the canonical calendar are consulted; a day open on
+    any exchange counts. Days neither calendar covers fall back to weekdays.
+    """
+
+    rows = conn.execute(
+        """
+        SELECT trade_date, bool_or(is_open)
+        FROM (
+            SELECT trade_date, is_open FROM trading_calendar
+            WHERE trade_date BETWEEN ? AND ?
+            UNION ALL
+            SELECT trade_date, is_open FROM canonical_trading_calendar
+            WHERE trade_date BETWEEN ? AND ?
+        )
+        GROUP BY trade_date
+        """,
+        [start, end, start, end],
+    ).fetchall()
+    known = {trade_date: bool(is_open) for trade_date, is_open in rows}
+    days: list[date] = []
+    day = start
+    while day <= end:
+        if known.get(day, day.weekday() < 5):
+            days.append(day)
+        day += timedelta(days=1)
+    return days
+
+
+def materialized_ranges(
+    conn: duckdb.DuckDBPyConnection, dataset_name: str, code: str
+) -> list[tuple[date, date]]:
+    """Return a series' recorded intervals in start order."""
+
+    rows = conn.execute(
+        """
+        SELECT start_date, end_date
+        FROM materialized_ranges
+        WHERE dataset_name = ? AND code = ?
+        ORDER BY start_date
+        """,
+        [dataset_name, code],
+    ).fetchall()
+    return [(start, end) for start, end in rows]
+
+
+def record_materialized_range(
+    conn: duckdb.DuckDBPyConnection,
+    dataset_name: str,
+    code: str,
+    start: date,
+    end: date,
+) -> None:
+    """Add one interval to a series, folding it into the intervals it touches."""
+
+    if start > end:
+        return
+    covered = merge_ranges(
+        [*materialized_ranges(conn, dataset_name, code), (start, end)]
+    )
+    conn.execute(
+        "DELETE FROM materialized_ranges WHERE dataset_name = ? AND code = ?",
+        [dataset_name, code],
+    )
+    conn.executemany(
+        """
+        INSERT INTO materialized_ranges (dataset_name, code, start_date, end_date)
+        VALUES (?, ?, ?, ?)
+        """,
+        [[dataset_name, code, start, end] for start, end in covered],
+    )
+
+
+def record_trade_dates(
+    conn: duckdb.DuckDBPyConnection,
+    dataset_name: str,
+    code: str,
+    trade_dates: Iterable[date],
+) -> None:
+    """Record the runs of consecutive open sessions present in ``trade_dates``.
+
+    Used to seed a tracker from rows stored before it existed; a run ends at
+    the first open session the dates skip.
+    """
+
+    present = sorted(set(trade_dates))
+    if not present:
+        return
+    sessions = sorted({*open_trade_days(conn, present[0], present[-1]), *present})
+    runs: list[tuple[date, date]] = []
+    run_start: date | None = None
+    previous: date | None = None
+    held = set(present)
+    for day in sessions:
+        if day in held:
+            run_start = run_start or day
+            previous = day
+        elif run_start is not None:
+            runs.append((run_start, previous))
+            run_start = None
+    if run_start is not None:
+        runs.append((run_start, previous))
+    for run_start, run_end in runs:
+        record_materialized_range(conn, dataset_name, code, run_start, run_end)
+
+
+def missing_trade_ranges(
+    conn: duckdb.DuckDBPyConnection,
+    dataset_name: str,
+    code: str,
+    start: date,
+    end: date,
+) -> list[tuple[date, date]]:
+    """Return the fewest intervals to fetch so a series covers a window.
+
+    Uncovered stretches are trimmed to their first and last open session and
+    dropped when they hold none, so weekends and holidays between recorded
+    intervals never cause a fetch.
+    """
+
+    missing: list[tuple[date, date]] = []
+    gaps = subtract_ranges(materialized_ranges(conn, dataset_name, code), start, end)
+    for gap_start, gap_end in gaps:
+        sessions = open_trade_days(conn, gap_start, gap_end)
+        if sessions:
+            missing.append((sessions[0], sessions[-1]))
+    return missing
@@ -1,7 +1,7 @@
 from __future__ import annotations
 
-import time
-from datetime import date, datetime, timedelta
+from collections.abc import Iterable
+from datetime import date, datetime
 from typing import cast
 
 import pandas as pd
@@ -9,6 +9,13 @@ import tushare as ts
 from loguru import logger
 
 from tradepilot.config import TUSHARE_TOKEN
+from tradepilot.data.rate_limit import (
+    RateLimitedClient,
+    shared_rate_limiter,
+    shared_request_executor,
+)
+from tradepilot.data.trade_ranges import open_trade_days
+from tradepilot.db import get_conn
 
 _TRADE_CALENDAR_COLUMNS = ("exchange", "trade_date", "is_open", "pretrade_date")
 _MARKET_DAILY_STATS_COLUMNS = (
@@ -27,6 +34,33 @@ _MARKET_DAILY_STATS_COLUMNS = (
     "turnover_rate",
 )
 _ETF_ADJ_FACTOR_COLUMNS = ("date", "etf_code", "adj_factor")
+_STOCK_DAILY_COLUMNS = (
+    "date",
+    "stock_code",
+    "open",
+    "high",
+    "low",
+    "close",
+    "volume",
+    "amount",
+    "turnover",
+)
+_QUOTE_FIELDS = "ts_code,trade_date,open,high,low,close,vol,amount"
+# Rate-limit families of pro API endpoints; unlisted endpoints use "tushare".
+_ENDPOINT_FAMILIES = {
+    "daily": "tushare.quotes",
+    "daily_basic": "tushare.quotes",
+    "fund_adj": "tushare.quotes",
+    "fund_daily": "tushare.quotes",
+    "index_daily": "tushare.quotes",
+    "daily_info": "tushare.market",
+    "margin": "tushare.market",
+    "moneyflow_hsgt": "tushare.market",
+}
+# Open sessions per range query, keeping replies under the row cap: daily_info
+# returns about twenty market rows a session, margin one row per exchange.
+_DAILY_INFO_WINDOW_SESSIONS = 150
+_MARGIN_WINDOW_SESSIONS = 1000
 
 
 def _empty_frame(columns: tuple[str, ...]) -> pd.DataFrame:
@@ -76,6 +110,26 @@ def _normalize_quotes(
     return normalized.sort_values("date").reset_index(drop=True)
 
 
+def _session_windows(
+    start_date: str, end_date: str, max_sessions: int
+) -> list[tuple[str, str]]:
+    """Split a window's open sessions into ``YYYYMMDD`` range-query bounds.
+
+    Sessions come from the local trading calendars, so closed days never
+    cost a request; windows holding no session are dropped.
+    """
+    sessions = open_trade_days(
+        get_conn(), date.fromisoformat(start_date), date.fromisoformat(end_date)
+    )
+    return [
+        (chunk[0].strftime("%Y%m%d"), chunk[-1].strftime("%Y%m%d"))
+        for chunk in (
+            sessions[index : index + max_sessions]
+            for index in range(0, len(sessions), max_sessions)
+        )
+    ]
+
+
 def _to_date_str(value: object) -> str | None:
     if value in (None, ""):
         return None
@@ -90,7 +144,17 @@ def _to_date_str(value: object) -> str | None:
 
 class TushareClient:
     def __init__(self) -> None:
-        self._pro = ts.pro_api(TUSHARE_TOKEN) if TUSHARE_TOKEN else None
+        self._pro = (
+            RateLimitedClient(
+                ts.pro_api(TUSHARE_TOKEN),
+                shared_rate_limiter(),
+                _ENDPOINT_FAMILIES,
+                "tushare",
+            )
+            if TUSHARE_TOKEN
+            else None
+        )
+        self._executor = shared_request_executor()
 
     @property
     def enabled(self) -> bool:
@@ -197,15 +261,13 @@ class TushareClient:
         pro = self._pro
         if pro is None:
             return _empty_frame(_MARKET_DAILY_STATS_COLUMNS)
-        rows: list[pd.DataFrame] = []
-        current = date.fromisoformat(start_date)
-        end = date.fromisoformat(end_date)
-        while current <= end:
-            tushare_date = current.strftime("%Y%m%d")
+        windows = _session_windows(start_date, end_date, _DAILY_INFO_WINDOW_SESSIONS)
+
+        def fetch(window: tuple[str, str]) -> pd.DataFrame | None:
             try:
-                time.sleep(0.2)
-                daily = pro.daily_info(
-                    trade_date=tushare_date,
+                return pro.daily_info(
+                    start_date=window[0],
+                    end_date=window[1],
                     fields=(
                         "trade_date,ts_code,ts_name,com_count,total_share,float_share,"
                         "total_mv,float_mv,amount,vol,trans_count,pe,tr"
@@ -213,29 +275,34 @@ class TushareClient:
                 )
             except Exception as exc:
                 logger.warning(
-                    "tushare: daily_info failed for {}: {}", tushare_date, exc
+                    "tushare: daily_info failed for {}..{}: {}",
+                    window[0],
+                    window[1],
+                    exc,
                 )
-                current += timedelta(days=1)
+                return None
+
+        rows: list[pd.DataFrame] = []
+        for daily in self._executor.map(fetch, windows):
+            if daily is None or daily.empty:
                 continue
-            if not daily.empty:
-                normalized = daily.rename(
-                    columns={
-                        "ts_code": "market_code",
-                        "ts_name": "market_name",
-                        "com_count": "listed_count",
-                        "tr": "turnover_rate",
-                    }
-                ).copy()
-                normalized["trade_date"] = pd.to_datetime(
-                    normalized["trade_date"], format="%Y%m%d", errors="coerce"
-                )
-                rows.append(
-                    cast(
-                        pd.DataFrame,
-                        normalized.loc[:, list(_MARKET_DAILY_STATS_COLUMNS)].copy(),
-                    )
+            normalized = daily.rename(
+                columns={
+                    "ts_code": "market_code",
+                    "ts_name": "market_name",
+                    "com_count": "listed_count",
+                    "tr": "turnover_rate",
+                }
+            ).copy()
+            normalized["trade_date"] = pd.to_datetime(
+                normalized["trade_date"], format="%Y%m%d", errors="coerce"
+            )
+            rows.append(
+                cast(
+                    pd.DataFrame,
+                    normalized.loc[:, list(_MARKET_DAILY_STATS_COLUMNS)].copy(),
                 )
-            current += timedelta(days=1)
+            )
         if not rows:
             return _empty_frame(_MARKET_DAILY_STATS_COLUMNS)
         return pd.concat(rows, ignore_index=True)
@@ -327,6 +394,67 @@ class TushareClient:
             ],
         ]
 
+    def get_stock_daily_cross_section(
+        self, trade_date: str, stock_codes: Iterable[str] | None = None
+    ) -> tuple[pd.DataFrame, bool]:
+        """Return one trade date's bars and whether the market reported it.
+
+        One ``daily`` and one ``daily_basic`` call cover the whole market,
+        and rows are keyed by bare ``stock_code`` like ``get_stock_daily``.
+        ``stock_codes`` keeps only those codes; requested fund codes missing
+        from ``daily`` cost one extra ``fund_daily`` call. The flag is true
+        whenever the session returned rows, even if none were requested, so
+        a session where every requested code was suspended still counts.
+        """
+
+        pro = self._pro
+        if pro is None:
+            return _empty_frame(_STOCK_DAILY_COLUMNS), False
+        wanted = set(stock_codes) if stock_codes is not None else None
+        tushare_date = _to_tushare_date(trade_date)
+        logger.debug("tushare: fetch daily cross-section {}", tushare_date)
+        daily = pro.daily(trade_date=tushare_date, fields=_QUOTE_FIELDS)
+        found = (
+            set(daily["ts_code"].str.split(".").str[0]) if not daily.empty else set()
+        )
+        if wanted is not None and any(
+            code.startswith(("1", "5")) and code not in found for code in wanted
+        ):
+            funds = pro.fund_daily(trade_date=tushare_date, fields=_QUOTE_FIELDS)
+            daily = pd.concat([daily, funds], ignore_index=True)
+        if daily.empty:
+            return _empty_frame(_STOCK_DAILY_COLUMNS), False
+        normalized = daily.rename(
+            columns={"trade_date": "date", "vol": "volume"}
+        ).copy()
+        normalized["stock_code"] = normalized["ts_code"].str.split(".").str[0]
+        if wanted is not None:
+            normalized = normalized.loc[normalized["stock_code"].isin(wanted)]
+            if normalized.empty:
+                return _empty_frame(_STOCK_DAILY_COLUMNS), True
+        normalized = normalized.drop_duplicates("stock_code")
+        normalized["date"] = pd.to_datetime(
+            normalized["date"], format="%Y%m%d", errors="coerce"
+        )
+        basic = pro.daily_basic(trade_date=tushare_date, fields="ts_code,turnover_rate")
+        if basic.empty:
+            normalized["turnover"] = None
+        else:
+            turnover = pd.DataFrame(
+                {
+                    "stock_code": basic["ts_code"].str.split(".").str[0],
+                    "turnover": basic["turnover_rate"],
+                }
+            ).drop_duplicates("stock_code")
+            normalized = normalized.merge(turnover, on="stock_code", how="left")
+        frame = cast(
+            pd.DataFrame,
+            normalized.loc[:, list(_STOCK_DAILY_COLUMNS)]
+            .sort_values("stock_code")
+            .reset_index(drop=True),
+        )
+        return frame, True
+
     def get_stock_weekly(
         self, stock_code: str, start_date: str, end_date: str
     ) -> pd.DataFrame:
@@ -491,33 +619,41 @@ class TushareClient:
             return _empty_with_columns(
                 "date", "stock_code", "margin_balance", "margin_buy"
             )
+        windows = _session_windows(start_date, end_date, _MARGIN_WINDOW_SESSIONS)
+        requests = [
+            (window, exchange_id)
+            for window in windows
+            for exchange_id in ("SSE", "SZSE")
+        ]
+
+        def fetch(request: tuple[tuple[str, str], str]) -> pd.DataFrame:
+            (window_start, window_end), exchange_id = request
+            return pro.margin(
+                start_date=window_start, end_date=window_end, exchange_id=exchange_id
+            )
+
         rows: list[pd.DataFrame] = []
-        current = date.fromisoformat(start_date)
-        end = date.fromisoformat(end_date)
-        while current <= end:
-            trade_date = current.strftime("%Y%m%d")
-            for exchange_id in ("SSE", "SZSE"):
-                time.sleep(0.2)
-                daily = pro.margin(trade_date=trade_date, exchange_id=exchange_id)
-                if daily.empty:
-                    continue
-                normalized = daily.rename(
-                    columns={
-                        "trade_date": "date",
-                        "rzye": "margin_balance",
-                        "rzmre": "margin_buy",
-                    }
-                ).copy()
-                normalized["stock_code"] = exchange_id
-                normalized["date"] = pd.to_datetime(
-                    normalized["date"], format="%Y%m%d", errors="coerce"
-                )
-                rows.append(
-                    normalized.loc[
-                        :, ["date", "stock_code", "margin_balance", "margin_buy"]
-                    ]
-                )
-            current += timedelta(days=1)
+        for (_, exchange_id), daily in zip(
+            requests, self._executor.map(fetch, requests)
+        ):
+            if daily.empty:
+                continue
+            normalized = daily.rename(
+                columns={
+                    "trade_date": "date",
+                    "rzye": "margin_balance",
+                    "rzmre": "margin_buy",
+                }
+            ).copy()
+            normalized["stock_code"] = exchange_id
+            normalized["date"] = pd.to_datetime(
+                normalized["date"], format="%Y%m%d", errors="coerce"
+            )
+            rows.append(
+                normalized.loc[
+                    :, ["date", "stock_code", "margin_balance", "margin_buy"]
+                ]
+            )
         if not rows:
             return _empty_with_columns(
                 "date", "stock_code", "margin_balance", "margin_buy"
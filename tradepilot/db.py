@@ -1,6 +1,7 @@
 """DuckDB connection management and schema initialization."""
 
 import threading
+from uuid import uuid4
 
 import duckdb
 
@@ -11,6 +12,7 @@ DB_PATH.parent.mkdir(parents=True, exist_ok=True)
 _thread_local = threading.local()
 _init_lock = threading.Lock()
 _initialized = False
+_ID_BLOCK_SIZE = 1000
 
 _STAGE_B_SEQUENCES = {
     "etl_ingestion_runs_run_id_seq": ("etl_ingestion_runs", "run_id"),
@@ -19,6 +21,8 @@ _STAGE_B_SEQUENCES = {
         "etl_validation_results",
         "validation_id",
     ),
+    "etl_derived_builds_build_id_seq": ("etl_derived_builds", "build_id"),
+    "etl_run_stages_stage_id_seq": ("etl_run_stages", "stage_id"),
 }
 
 
@@ -323,6 +327,80 @@ def _init_tables(conn: duckdb.DuckDBPyConnection) -> None:
             base_note TEXT,
             updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
         );
+        CREATE TABLE IF NOT EXISTS etl_derived_builds (
+            build_id BIGINT PRIMARY KEY,
+            profile_name VARCHAR NOT NULL,
+            dataset_name VARCHAR,
+            window_start DATE,
+            window_end DATE,
+            upstream_marks_json TEXT,
+            built_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        );
+        CREATE TABLE IF NOT EXISTS lakehouse_partitions (
+            file_path VARCHAR PRIMARY KEY,
+            dataset_name VARCHAR NOT NULL,
+            storage_zone VARCHAR NOT NULL,
+            partition_path VARCHAR,
+            file_kind VARCHAR,
+            partition_year INTEGER,
+            partition_month INTEGER,
+            row_count BIGINT DEFAULT 0,
+            min_date DATE,
+            max_date DATE,
+            byte_size BIGINT DEFAULT 0,
+            schema_version VARCHAR,
+            content_hash VARCHAR,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        );
+        CREATE TABLE IF NOT EXISTS lakehouse_generations (
+            dataset_name VARCHAR NOT NULL,
+            storage_zone VARCHAR NOT NULL,
+            generation BIGINT NOT NULL,
+            updated_at TIMESTAMP,
+            PRIMARY KEY (dataset_name, storage_zone)
+        );
+        CREATE TABLE IF NOT EXISTS etl_derived_latest (
+            dataset_name VARCHAR NOT NULL,
+            rebalance_date DATE NOT NULL,
+            calendar_name VARCHAR NOT NULL,
+            scorer_version VARCHAR NOT NULL,
+            partition_year INTEGER NOT NULL,
+            partition_month INTEGER NOT NULL,
+            partition_path VARCHAR NOT NULL,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            PRIMARY KEY (dataset_name, rebalance_date, calendar_name, scorer_version)
+        );
+        CREATE TABLE IF NOT EXISTS provider_cache_files (
+            file_path VARCHAR PRIMARY KEY,
+            dataset_name VARCHAR NOT NULL,
+            cache_key VARCHAR NOT NULL,
+            start_date DATE,
+            end_date DATE,
+            row_count BIGINT DEFAULT 0,
+            fetched_at TIMESTAMP
+        );
+        CREATE TABLE IF NOT EXISTS materialized_ranges (
+            dataset_name VARCHAR NOT NULL,
+            code VARCHAR NOT NULL,
+            start_date DATE NOT NULL,
+            end_date DATE NOT NULL,
+            PRIMARY KEY (dataset_name, code, start_date)
+        );
+        CREATE TABLE IF NOT EXISTS etl_run_stages (
+            stage_id BIGINT PRIMARY KEY,
+            run_id BIGINT,
+            profile_name VARCHAR,
+            dataset_name VARCHAR NOT NULL,
+            stage_name VARCHAR NOT NULL,
+            status VARCHAR,
+            duration_seconds DOUBLE,
+            rows_processed BIGINT DEFAULT 0,
+            bytes_read BIGINT DEFAULT 0,
+            bytes_written BIGINT DEFAULT 0,
+            rows_per_second DOUBLE,
+            peak_rss_mb DOUBLE,
+            recorded_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        );
     """)
     instrument_columns = {
         row[1]
@@ -414,6 +492,7 @@ def _init_tables(conn: duckdb.DuckDBPyConnection) -> None:
 def ensure_stage_b_sequences(conn: duckdb.DuckDBPyConnection) -> None:
     """Create DuckDB sequences used to allocate Stage B metadata IDs."""
 
+    _ensure_database_id(conn)
     for sequence_name, (table_name, column_name) in _STAGE_B_SEQUENCES.items():
         exists = int(
             conn.execute(
@@ -434,3 +513,105 @@ def ensure_stage_b_sequences(conn: duckdb.DuckDBPyConnection) -> None:
         conn.execute(
             f"CREATE SEQUENCE IF NOT EXISTS {sequence_name} START WITH {start_value}"
         )
+
+
+def _ensure_database_id(conn: duckdb.DuckDBPyConnection) -> None:
+    """Stamp the database with a random id that a recreated file will not share."""
+
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS etl_database_identity (
+            singleton BOOLEAN PRIMARY KEY DEFAULT TRUE CHECK (singleton),
+            database_id VARCHAR NOT NULL
+        )
+        """)
+    conn.execute(
+        """
+        INSERT INTO etl_database_identity (database_id) VALUES (?)
+        ON CONFLICT DO NOTHING
+        """,
+        [uuid4().hex],
+    )
+
+
+class _IdBlockAllocator:
+    """Hand out Stage B ids from sequence ranges reserved once per block.
+
+    The first allocation for a database and sequence probes the table's
+    MAX() once so ids written outside the sequence are never reused; later
+    allocations are served from the in-process block and only touch DuckDB
+    when a block runs out. Blocks are keyed by the file path and the id
+    stamped into the database, so a file deleted and recreated at the same
+    path starts afresh.
+    """
+
+    def __init__(self, block_size: int = _ID_BLOCK_SIZE) -> None:
+        self._block_size = block_size
+        self._lock = threading.Lock()
+        self._blocks: dict[tuple[str, str, str], list[int]] = {}
+        self._floors: dict[tuple[str, str, str], int] = {}
+
+    def allocate(
+        self, conn: duckdb.DuckDBPyConnection, sequence_name: str, count: int
+    ) -> list[int]:
+        """Return ``count`` unused ids from one Stage B sequence."""
+
+        if sequence_name not in _STAGE_B_SEQUENCES:
+            raise KeyError(f"unknown Stage B sequence: {sequence_name}")
+        if count <= 0:
+            return []
+        database_path, database_id = conn.execute("""
+            SELECT (
+                SELECT path FROM duckdb_databases()
+                WHERE database_name = current_database()
+            ),
+            (SELECT database_id FROM etl_database_identity)
+            """).fetchone()
+        key = (str(database_path or ""), str(database_id), sequence_name)
+        with self._lock:
+            if key not in self._floors:
+                self._floors[key] = _sequence_floor(conn, sequence_name)
+            block = self._blocks.setdefault(key, [])
+            if len(block) < count:
+                block.extend(
+                    _reserve_ids(
+                        conn,
+                        sequence_name,
+                        max(count - len(block), self._block_size),
+                        self._floors[key],
+                    )
+                )
+            ids = block[:count]
+            del block[:count]
+            return ids
+
+
+_id_allocator = _IdBlockAllocator()
+
+
+def allocate_stage_b_ids(
+    conn: duckdb.DuckDBPyConnection, sequence_name: str, count: int = 1
+) -> list[int]:
+    """Allocate ids for one Stage B metadata table from the shared block pool."""
+
+    return _id_allocator.allocate(conn, sequence_name, count)
+
+
+def _sequence_floor(conn: duckdb.DuckDBPyConnection, sequence_name: str) -> int:
+    table_name, column_name = _STAGE_B_SEQUENCES[sequence_name]
+    return int(
+        conn.execute(
+            f"SELECT COALESCE(MAX({column_name}), 0) FROM {table_name}"
+        ).fetchone()[0]
+    )
+
+
+def _reserve_ids(
+    conn: duckdb.DuckDBPyConnection, sequence_name: str, count: int, floor: int
+) -> list[int]:
+    ids: list[int] = []
+    while len(ids) < count:
+        rows = conn.execute(
+            "SELECT nextval(?) FROM range(?)", [sequence_name, count - len(ids)]
+        ).fetchall()
+        ids.extend(int(row[0]) for row in rows if int(row[0]) > floor)
+    return sorted(ids)
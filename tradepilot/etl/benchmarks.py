@@ -0,0 +1,416 @@
+"""Benchmarks for ETL service hot paths and the end-to-end sync pipeline."""
+
+from __future__ import annotations
+
+import argparse
+from collections.abc import Iterable, Sequence
+from datetime import UTC, date, datetime, timedelta
+import json
+from pathlib import Path
+import sys
+from tempfile import TemporaryDirectory
+import time
+import zlib
+
+import duckdb
+import numpy as np
+import pandas as pd
+
+from tradepilot import db
+from tradepilot.config import DATA_ROOT
+from tradepilot.etl.models import (
+    IngestionRequest,
+    ValidationResultRecord,
+    ValidationStatus,
+)
+from tradepilot.etl.service import ETF_AW_SLEEVE_CODES, ETLService
+from tradepilot.etl.sources.tushare import TushareSourceAdapter
+
+_VALIDATION_PERSISTENCE_COUNTS = (10, 100, 1_000, 10_000)
+_DEFAULT_BASELINE_PATH = DATA_ROOT / "etl_benchmark_baseline.json"
+# Timings below this many seconds are too noisy to flag as regressions.
+_REGRESSION_NOISE_FLOOR_SECONDS = 0.05
+# Fixed so reruns generate identical lakehouses and stay comparable.
+_PIPELINE_HISTORY_END = date(2025, 12, 31)
+_PIPELINE_BOOTSTRAP_PROFILES = (
+    "reference.etf_aw_sleeves.frozen_v1",
+    "reference.rebalance_calendar.monthly_post_20",
+    "derived.etf_aw_sleeve_daily.build",
+    "derived.etf_aw_rebalance_snapshot.build",
+    "derived.etf_aw_regime_score.build",
+)
+
+
+class SyntheticTushareClient:
+    """Deterministic no-network Tushare client generating daily ETF bars.
+
+    The catalog holds the frozen all-weather sleeves followed by synthetic
+    codes up to ``instrument_count``. Each instrument's bars are one seeded
+    random walk over the history window, so every fetch window sees the same
+    values; bumping ``revision`` perturbs volumes to force partition rewrites
+    on a resync.
+    """
+
+    def __init__(
+        self,
+        instrument_count: int,
+        history_start: date,
+        history_end: date,
+        *,
+        seed: int = 0,
+    ) -> None:
+        if instrument_count < 1:
+            raise ValueError("instrument_count must be positive")
+        self.history_start = history_start
+        self.history_end = history_end
+        self.seed = seed
+        self.revision = 0
+        synthetic = (
+            f"{code}.SZ"
+            for code in range(160000, 170000)
+            if f"{code}.SZ" not in ETF_AW_SLEEVE_CODES
+        )
+        codes = list(ETF_AW_SLEEVE_CODES)
+        while len(codes) < instrument_count:
+            codes.append(next(synthetic))
+        self.codes = codes
+        self._histories: dict[str, pd.DataFrame] = {}
+
+    def get_trade_calendar(
+        self, start_date: str, end_date: str, exchange: str = "SSE"
+    ) -> pd.DataFrame:
+        days = pd.date_range(start_date, end_date, freq="D")
+        is_open = days.dayofweek < 5
+        previous_open = pd.Series(days.where(is_open)).shift(1).ffill()
+        return pd.DataFrame(
+            {
+                "exchange": "SH" if exchange == "SSE" else "SZ",
+                "trade_date": days,
+                "is_open": is_open,
+                "pretrade_date": previous_open.to_numpy(),
+            }
+        )
+
+    def get_etf_catalog(self) -> pd.DataFrame:
+        return pd.DataFrame(
+            {
+                "code": self.codes,
+                "name": [f"Synthetic ETF {code}" for code in self.codes],
+                "list_date": "20000104",
+                "delist_date": None,
+            }
+        )
+
+    def get_index_catalog(self) -> pd.DataFrame:
+        return pd.DataFrame(
+            {
+                "code": pd.Series(dtype="object"),
+                "name": pd.Series(dtype="object"),
+                "list_date": pd.Series(dtype="object"),
+                "delist_date": pd.Series(dtype="object"),
+            }
+        )
+
+    def get_etf_daily(
+        self, etf_code: str, start_date: str, end_date: str
+    ) -> pd.DataFrame:
+        bars = _date_slice(self._history(etf_code), start_date, end_date)
+        if self.revision:
+            bars["volume"] = bars["volume"] + self.revision
+        return bars
+
+    def get_etf_adj_factor(
+        self, etf_code: str, start_date: str, end_date: str
+    ) -> pd.DataFrame:
+        bars = _date_slice(self._history(etf_code), start_date, end_date)
+        return pd.DataFrame(
+            {"date": bars["date"], "etf_code": etf_code, "adj_factor": 1.0}
+        )
+
+    def _history(self, etf_code: str) -> pd.DataFrame:
+        bars = self._histories.get(etf_code)
+        if bars is not None:
+            return bars
+        days = pd.bdate_range(self.history_start, self.history_end)
+        rng = np.random.default_rng(zlib.crc32(f"{self.seed}:{etf_code}".encode()))
+        returns = rng.normal(0.0002, 0.01, len(days)).clip(-0.09, 0.09)
+        close = 10.0 * np.cumprod(1 + returns)
+        pre_close = close / (1 + returns)
+        open_ = pre_close * (1 + rng.normal(0, 0.002, len(days)))
+        spread = np.abs(rng.normal(0, 0.004, len(days)))
+        volume = rng.integers(10_000, 1_000_000, len(days)).astype(float)
+        bars = pd.DataFrame(
+            {
+                "date": days,
+                "etf_code": etf_code,
+                "open": open_,
+                "high": np.maximum(open_, close) * (1 + spread),
+                "low": np.minimum(open_, close) * (1 - spread),
+                "close": close,
+                "pre_close": pre_close,
+                "change": close - pre_close,
+                "pct_chg": returns * 100,
+                "volume": volume,
+                "amount": volume * close,
+            }
+        )
+        self._histories[etf_code] = bars
+        return bars
+
+
+def benchmark_validation_persistence(
+    result_counts: Iterable[int] = _VALIDATION_PERSISTENCE_COUNTS,
+    *,
+    repeats: int = 3,
+) -> list[dict]:
+    """Time validation-result persistence against a scratch DuckDB database.
+
+    Each count is persisted ``repeats`` times into the same ledger, so later
+    repeats also show whether cost grows with the rows already stored.
+    """
+
+    rows: list[dict] = []
+    with TemporaryDirectory() as temp_dir:
+        conn = duckdb.connect(str(Path(temp_dir) / "benchmark.duckdb"))
+        try:
+            db._init_tables(conn)
+            service = ETLService(conn=conn, lakehouse_root=Path(temp_dir))
+            run_id = 0
+            for count in result_counts:
+                timings: list[float] = []
+                for _ in range(repeats):
+                    run_id += 1
+                    results = _synthetic_validation_results(run_id, count)
+                    started = time.perf_counter()
+                    service._persist_validation_results(results)
+                    timings.append(time.perf_counter() - started)
+                best = min(timings)
+                rows.append(
+                    {
+                        "result_count": count,
+                        "repeats": repeats,
+                        "best_seconds": round(best, 6),
+                        "mean_seconds": round(sum(timings) / len(timings), 6),
+                        "microseconds_per_result": round(
+                            best * 1_000_000 / max(count, 1), 3
+                        ),
+                    }
+                )
+        finally:
+            conn.close()
+    return rows
+
+
+def benchmark_pipeline(
+    instrument_count: int = 50,
+    years: int = 2,
+    *,
+    seed: int = 0,
+    max_workers: int | None = None,
+) -> dict:
+    """Time a full sync and derived build against a synthetic lakehouse.
+
+    Reference data and ``instrument_count`` ETFs with ``years`` of daily bars
+    are synced through the real service, then ETF daily bars are resynced
+    with revised volumes to exercise partition upserts, and the ETF
+    all-weather profiles are built on top. Each scenario reports its wall
+    seconds and, for dataset syncs, the per-stage split.
+    """
+
+    if years < 1:
+        raise ValueError("years must be positive")
+    history_end = _PIPELINE_HISTORY_END
+    history_start = date(history_end.year - years + 1, 1, 1)
+    client = SyntheticTushareClient(
+        instrument_count, history_start, history_end, seed=seed
+    )
+    scenarios: list[dict] = []
+    with TemporaryDirectory() as temp_dir:
+        conn = duckdb.connect(str(Path(temp_dir) / "benchmark.duckdb"))
+        try:
+            db._init_tables(conn)
+            service = ETLService(
+                conn=conn,
+                source_adapters=[TushareSourceAdapter(client=client)],
+                lakehouse_root=Path(temp_dir) / "lakehouse",
+            )
+            reference_request = IngestionRequest(
+                request_start=history_start - timedelta(days=31),
+                request_end=history_end,
+            )
+            bars_request = IngestionRequest(
+                request_start=history_start,
+                request_end=history_end,
+                context={"instrument_ids": list(client.codes)},
+            )
+            syncs = [
+                ("reference.trading_calendar", reference_request, 0),
+                ("reference.instruments", reference_request, 0),
+                ("market.etf_daily", bars_request, 0),
+                ("market.etf_adj_factor", bars_request, 0),
+                ("market.etf_daily", bars_request, 1),
+            ]
+            for dataset_name, request, revision in syncs:
+                client.revision = revision
+                scenario = dataset_name if not revision else f"{dataset_name}.resync"
+                started = time.perf_counter()
+                result = service.run_dataset_sync(dataset_name, request)
+                scenarios.append(
+                    {
+                        "scenario": scenario,
+                        "status": result.status.value,
+                        "total_seconds": round(time.perf_counter() - started, 6),
+                        "records_written": result.records_written,
+                        "stage_seconds": {
+                            stage: round(seconds, 6)
+                            for stage, seconds in result.stage_seconds.items()
+                        },
+                    }
+                )
+            for profile_name in _PIPELINE_BOOTSTRAP_PROFILES:
+                started = time.perf_counter()
+                summary = service.run_bootstrap(
+                    profile_name,
+                    start=history_start - timedelta(days=31),
+                    end=history_end,
+                    max_workers=max_workers,
+                )
+                scenarios.append(
+                    {
+                        "scenario": profile_name,
+                        "status": summary.get("status"),
+                        "total_seconds": round(time.perf_counter() - started, 6),
+                        "records_written": summary.get("records_written"),
+                        "stage_seconds": {},
+                    }
+                )
+        finally:
+            conn.close()
+    return {
+        "suite": "pipeline",
+        "instrument_count": len(client.codes),
+        "years": years,
+        "created_at": datetime.now(UTC).replace(tzinfo=None).isoformat(),
+        "peak_rss_mb": _peak_rss_mb(),
+        "scenarios": scenarios,
+    }
+
+
+def compare_with_baseline(
+    report: dict,
+    baseline: dict,
+    *,
+    tolerance: float = 0.25,
+    noise_floor_seconds: float = _REGRESSION_NOISE_FLOOR_SECONDS,
+) -> list[dict]:
+    """Return timings in a pipeline report that regressed past a baseline.
+
+    A timing regresses when it exceeds the baseline by more than
+    ``tolerance`` as a fraction and by more than ``noise_floor_seconds``.
+    Scenarios or stages missing from either side are skipped.
+    """
+
+    regressions: list[dict] = []
+    previous = {row["scenario"]: row for row in baseline.get("scenarios", [])}
+    for row in report.get("scenarios", []):
+        reference = previous.get(row["scenario"])
+        if reference is None:
+            continue
+        timings = [("total", row["total_seconds"], reference["total_seconds"])]
+        timings.extend(
+            (stage, seconds, reference.get("stage_seconds", {}).get(stage))
+            for stage, seconds in row.get("stage_seconds", {}).items()
+        )
+        for stage, seconds, reference_seconds in timings:
+            if reference_seconds is None:
+                continue
+            limit = reference_seconds * (1 + tolerance)
+            if seconds > limit and seconds - reference_seconds > noise_floor_seconds:
+                regressions.append(
+                    {
+                        "scenario": row["scenario"],
+                        "stage": stage,
+                        "baseline_seconds": reference_seconds,
+                        "seconds": seconds,
+                        "ratio": round(seconds / max(reference_seconds, 1e-9), 3),
+                    }
+                )
+    return regressions
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    """Run one benchmark suite, returning a non-zero code on regressions."""
+
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "suite", nargs="?", choices=("validation", "pipeline"), default="validation"
+    )
+    parser.add_argument("--instruments", type=int, default=50)
+    parser.add_argument("--years", type=int, default=2)
+    parser.add_argument("--max-workers", type=int, default=None)
+    parser.add_argument("--baseline", type=Path, default=_DEFAULT_BASELINE_PATH)
+    parser.add_argument("--write-baseline", action="store_true")
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    args = parser.parse_args(argv)
+
+    if args.suite == "validation":
+        print(json.dumps(benchmark_validation_persistence(), indent=2))
+        return 0
+    report = benchmark_pipeline(
+        args.instruments, args.years, max_workers=args.max_workers
+    )
+    if args.write_baseline:
+        args.baseline.parent.mkdir(parents=True, exist_ok=True)
+        args.baseline.write_text(json.dumps(report, indent=2), encoding="utf-8")
+    elif args.baseline.exists():
+        baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+        report["regressions"] = compare_with_baseline(
+            report, baseline, tolerance=args.tolerance
+        )
+    print(json.dumps(report, indent=2))
+    return 1 if report.get("regressions") else 0
+
+
+def _synthetic_validation_results(
+    run_id: int, count: int
+) -> list[ValidationResultRecord]:
+    created_at = datetime.now(UTC).replace(tzinfo=None)
+    return [
+        ValidationResultRecord(
+            validation_id=0,
+            run_id=run_id,
+            raw_batch_id=run_id,
+            dataset_name="market.etf_daily",
+            check_name="market_daily.ohlc_order",
+            check_level="row",
+            status=ValidationStatus.WARNING if index % 2 else ValidationStatus.PASS,
+            subject_key=f"5103{index:02d}.SH|2026-04-24",
+            metric_value=float(index),
+            threshold_value=None,
+            details_json=json.dumps({"row": index}),
+            created_at=created_at,
+        )
+        for index in range(count)
+    ]
+
+
+def _peak_rss_mb() -> float | None:
+    """Return this process's peak resident set size, when the OS reports it."""
+
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes.
+    scale = 1024 * 1024 if sys.platform == "darwin" else 1024
+    return round(peak / scale, 1)
+
+
+def _date_slice(bars: pd.DataFrame, start_date: str, end_date: str) -> pd.DataFrame:
+    mask = bars["date"].between(pd.Timestamp(start_date), pd.Timestamp(end_date))
+    return bars.loc[mask].reset_index(drop=True)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -4,7 +4,13 @@ from __future__ import annotations
 
 from pydantic import BaseModel, Field, field_validator
 
-from tradepilot.etl.models import DatasetCategory, DependencyType, StorageZone
+from tradepilot.etl.models import (
+    DatasetCategory,
+    DependencyType,
+    ParquetWriteProfile,
+    PartitionWriteMode,
+    StorageZone,
+)
 from tradepilot.etl.path_safety import validate_safe_path_component
 
 
@@ -38,6 +44,18 @@ class DatasetDefinition(BaseModel):
         default=None,
         description="Storage partitioning rule applied when writing dataset files.",
     )
+    partition_write_mode: PartitionWriteMode = Field(
+        default=PartitionWriteMode.REWRITE,
+        description="Whether partition upserts rewrite the base file or append deltas.",
+    )
+    business_key_columns: list[str] = Field(
+        default_factory=list,
+        description="Columns identifying one record when merging partition files.",
+    )
+    write_profile: ParquetWriteProfile | None = Field(
+        default=None,
+        description="Sort order, row groups and encodings for canonical parquet files.",
+    )
     canonical_schema_name: str | None = Field(
         default=None,
         description="Canonical schema identifier expected after normalization.",
@@ -85,6 +103,23 @@ class DatasetDefinition(BaseModel):
         return validate_safe_path_component(value, "dataset_name")
 
 
+def _instrument_daily_write_profile() -> ParquetWriteProfile:
+    """Return the write profile for per-instrument daily partitions.
+
+    Sorting by instrument keeps each instrument in few row groups, so their
+    min/max statistics let single-instrument reads skip the rest.
+    """
+
+    return ParquetWriteProfile(
+        sort_columns=["instrument_id", "trade_date"],
+        row_group_size=4_096,
+        compression="zstd",
+        compression_level=3,
+        dictionary_columns=["instrument_id", "source_name", "quality_status"],
+        bloom_filter_columns=["instrument_id"],
+    )
+
+
 def build_reference_trading_calendar_dataset() -> DatasetDefinition:
     """Return the Stage B trading calendar dataset definition."""
 
@@ -183,6 +218,8 @@ def build_market_etf_daily_dataset() -> DatasetDefinition:
         primary_source="tushare",
         storage_zone=StorageZone.NORMALIZED,
         partition_strategy="year_month",
+        business_key_columns=["instrument_id", "trade_date"],
+        write_profile=_instrument_daily_write_profile(),
         canonical_schema_name="market_daily_v1",
         validation_rule_names=[
             "market_daily.duplicate_business_key",
@@ -219,6 +256,8 @@ def build_market_etf_adj_factor_dataset() -> DatasetDefinition:
         primary_source="tushare",
         storage_zone=StorageZone.NORMALIZED,
         partition_strategy="year_month",
+        business_key_columns=["instrument_id", "trade_date"],
+        write_profile=_instrument_daily_write_profile(),
         canonical_schema_name="etf_adj_factor_v1",
         validation_rule_names=[
             "etf_adj_factor.duplicate_business_key",
@@ -248,6 +287,7 @@ def build_derived_etf_aw_sleeve_daily_dataset() -> DatasetDefinition:
         primary_source="derived",
         storage_zone=StorageZone.DERIVED,
         partition_strategy="year_month",
+        business_key_columns=["sleeve_code", "trade_date"],
         canonical_schema_name="etf_aw_sleeve_daily_v1",
         timing_semantics=(
             "adj_pct_chg is the return between adjacent available observations "
@@ -277,6 +317,7 @@ def build_derived_etf_aw_rebalance_snapshot_dataset() -> DatasetDefinition:
         primary_source="derived",
         storage_zone=StorageZone.DERIVED,
         partition_strategy="year_month",
+        business_key_columns=["calendar_name", "rebalance_date", "sleeve_code"],
         canonical_schema_name="etf_aw_rebalance_snapshot_v1",
         timing_semantics=(
             "Monthly post-20 rebalance read model built from adjustment-aware "
@@ -308,6 +349,12 @@ def build_derived_etf_aw_regime_score_dataset() -> DatasetDefinition:
         primary_source="derived",
         storage_zone=StorageZone.DERIVED,
         partition_strategy="year_month",
+        business_key_columns=[
+            "calendar_name",
+            "rebalance_date",
+            "scorer_name",
+            "scorer_version",
+        ],
         canonical_schema_name="etf_aw_regime_score_v1",
         timing_semantics=(
             "Market-only regime score built from the ETF all-weather rebalance "
@@ -333,6 +380,8 @@ def build_market_index_daily_dataset() -> DatasetDefinition:
         primary_source="tushare",
         storage_zone=StorageZone.NORMALIZED,
         partition_strategy="year_month",
+        business_key_columns=["instrument_id", "trade_date"],
+        write_profile=_instrument_daily_write_profile(),
         canonical_schema_name="market_daily_v1",
         validation_rule_names=[
             "market_daily.duplicate_business_key",
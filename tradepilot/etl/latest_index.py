@@ -0,0 +1,171 @@
+"""DuckDB index from rebalance dates to the derived partitions holding them."""
+
+from __future__ import annotations
+
+from collections.abc import Mapping
+from dataclasses import dataclass
+from datetime import UTC, date, datetime
+
+import duckdb
+import pandas as pd
+
+from tradepilot.etl.manifest import bump_manifest_generation
+from tradepilot.etl.models import StorageZone
+
+
+@dataclass(frozen=True)
+class RebalancePointer:
+    """Latest-index row locating one rebalance date's partition."""
+
+    dataset_name: str
+    rebalance_date: date
+    calendar_name: str
+    scorer_version: str
+    partition_year: int
+    partition_month: int
+    partition_path: str
+
+
+def dataset_is_indexed(conn: duckdb.DuckDBPyConnection, dataset_name: str) -> bool:
+    """Return whether the latest index already tracks a derived dataset."""
+
+    row = conn.execute(
+        "SELECT 1 FROM etl_derived_latest WHERE dataset_name = ? LIMIT 1",
+        [dataset_name],
+    ).fetchone()
+    return row is not None
+
+
+def record_partition_pointers(
+    conn: duckdb.DuckDBPyConnection,
+    dataset_name: str,
+    partition_year: int,
+    partition_month: int,
+    partition_path: str,
+    frame: pd.DataFrame,
+    *,
+    replace: bool = True,
+) -> None:
+    """Index the rebalance dates written to one year/month partition.
+
+    With ``replace`` the frame is the partition's full content, so pointers
+    for dates no longer present are dropped; otherwise they are only added.
+    The dataset's generation is bumped afterwards, so reads cached while the
+    partition was written but not yet indexed are retired.
+    """
+
+    _write_partition_pointers(
+        conn,
+        dataset_name,
+        partition_year,
+        partition_month,
+        partition_path,
+        frame,
+        replace=replace,
+    )
+    bump_manifest_generation(conn, dataset_name, StorageZone.DERIVED)
+
+
+def _write_partition_pointers(
+    conn: duckdb.DuckDBPyConnection,
+    dataset_name: str,
+    partition_year: int,
+    partition_month: int,
+    partition_path: str,
+    frame: pd.DataFrame,
+    *,
+    replace: bool,
+) -> None:
+    if replace:
+        conn.execute(
+            """
+            DELETE FROM etl_derived_latest
+            WHERE dataset_name = ?
+              AND partition_year = ?
+              AND partition_month = ?
+            """,
+            [dataset_name, partition_year, partition_month],
+        )
+    if not {"rebalance_date", "calendar_name"}.issubset(frame.columns):
+        return
+    pointers = frame.loc[:, ["rebalance_date", "calendar_name"]].copy()
+    pointers["rebalance_date"] = pd.to_datetime(
+        pointers["rebalance_date"], errors="coerce"
+    ).dt.date
+    pointers["scorer_version"] = (
+        frame["scorer_version"].fillna("").astype(str)
+        if "scorer_version" in frame.columns
+        else ""
+    )
+    pointers = pointers.dropna(subset=["rebalance_date", "calendar_name"])
+    pointers = pointers.drop_duplicates()
+    if pointers.empty:
+        return
+    updated_at = datetime.now(UTC).replace(tzinfo=None)
+    conn.executemany(
+        """
+        INSERT OR REPLACE INTO etl_derived_latest (
+            dataset_name, rebalance_date, calendar_name, scorer_version,
+            partition_year, partition_month, partition_path, updated_at
+        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        """,
+        [
+            [
+                dataset_name,
+                row.rebalance_date,
+                str(row.calendar_name),
+                row.scorer_version,
+                partition_year,
+                partition_month,
+                partition_path,
+                updated_at,
+            ]
+            for row in pointers.itertuples(index=False)
+        ],
+    )
+
+
+def latest_rebalance_pointer(
+    conn: duckdb.DuckDBPyConnection,
+    dataset_name: str,
+    as_of_date: date | None = None,
+) -> RebalancePointer | None:
+    """Return the pointer for the latest rebalance date on or before a date.
+
+    Ties on the date resolve by calendar name and scorer version, so the
+    result is stable; every pointer for one date names the same partition.
+    """
+
+    row = conn.execute(
+        """
+        SELECT dataset_name, rebalance_date, calendar_name, scorer_version,
+               partition_year, partition_month, partition_path
+        FROM etl_derived_latest
+        WHERE dataset_name = ?
+          AND (CAST(? AS DATE) IS NULL OR rebalance_date <= ?)
+        ORDER BY rebalance_date DESC, calendar_name, scorer_version
+        LIMIT 1
+        """,
+        [dataset_name, as_of_date, as_of_date],
+    ).fetchone()
+    return RebalancePointer(*row) if row is not None else None
+
+
+def move_partition_pointers(
+    conn: duckdb.DuckDBPyConnection,
+    dataset_name: str,
+    partition_paths: Mapping[str, str],
+) -> None:
+    """Point index rows at partition directories renamed by a layout change."""
+
+    if not partition_paths:
+        return
+    conn.executemany(
+        """
+        UPDATE etl_derived_latest
+        SET partition_path = ?
+        WHERE dataset_name = ? AND partition_path = ?
+        """,
+        [[new, dataset_name, old] for old, new in partition_paths.items()],
+    )
+    bump_manifest_generation(conn, dataset_name, StorageZone.DERIVED)
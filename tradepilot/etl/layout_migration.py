@@ -0,0 +1,25 @@
+"""One-shot migration of lakehouse partition directories to another layout.
+
+Run ``python -m tradepilot.etl.layout_migration [hive|plain]``; the default
+target is the hive-style ``year=YYYY/month=MM`` layout.
+"""
+
+from __future__ import annotations
+
+import json
+import sys
+
+from tradepilot.etl.models import PartitionLayout
+from tradepilot.etl.service import ETLService
+
+
+def main(argv: list[str] | None = None) -> dict:
+    """Migrate every registered dataset and return the migration summary."""
+
+    args = sys.argv[1:] if argv is None else argv
+    layout = PartitionLayout(args[0]) if args else PartitionLayout.HIVE
+    return ETLService().migrate_partition_layout(layout)
+
+
+if __name__ == "__main__":
+    print(json.dumps(main(), indent=2))
@@ -0,0 +1,251 @@
+"""DuckDB catalog of the parquet files that make up lakehouse partitions."""
+
+from __future__ import annotations
+
+from collections.abc import Iterable, Sequence
+from dataclasses import astuple, dataclass, fields
+from datetime import UTC, date, datetime
+
+import duckdb
+
+from tradepilot.etl.models import StorageZone
+
+# Columns whose range is recorded per file, in lookup order.
+DATE_RANGE_COLUMNS = ("trade_date", "rebalance_date")
+
+
+@dataclass(frozen=True)
+class PartitionFileEntry:
+    """Manifest row describing one base or delta parquet file."""
+
+    file_path: str
+    dataset_name: str
+    storage_zone: str
+    partition_path: str
+    file_kind: str
+    partition_year: int | None
+    partition_month: int | None
+    row_count: int
+    min_date: date | None
+    max_date: date | None
+    byte_size: int
+    schema_version: str | None
+    content_hash: str | None
+
+
+_ENTRY_COLUMNS = [field.name for field in fields(PartitionFileEntry)]
+# Dataset, zone, then window start and end, each bound twice.
+_WINDOW_FILTER = """
+    dataset_name = ?
+    AND storage_zone = ?
+    AND (CAST(? AS DATE) IS NULL OR max_date IS NULL OR max_date >= ?)
+    AND (CAST(? AS DATE) IS NULL OR min_date IS NULL OR min_date <= ?)
+"""
+
+
+def upsert_partition_files(
+    conn: duckdb.DuckDBPyConnection, entries: Sequence[PartitionFileEntry]
+) -> None:
+    """Insert or replace manifest rows keyed by lakehouse-relative file path.
+
+    Entries whose content hash matches the recorded row are skipped, so an
+    unchanged rewrite keeps its ``updated_at`` and the dataset generation.
+    """
+
+    if not entries:
+        return
+    recorded = set(
+        conn.execute(
+            """
+            SELECT file_path, content_hash
+            FROM lakehouse_partitions
+            WHERE list_contains(?, file_path) AND content_hash IS NOT NULL
+            """,
+            [[entry.file_path for entry in entries]],
+        ).fetchall()
+    )
+    entries = [
+        entry
+        for entry in entries
+        if (entry.file_path, entry.content_hash) not in recorded
+    ]
+    if not entries:
+        return
+    columns = ", ".join([*_ENTRY_COLUMNS, "updated_at"])
+    placeholders = ", ".join(["?"] * (len(_ENTRY_COLUMNS) + 1))
+    updated_at = datetime.now(UTC).replace(tzinfo=None)
+    conn.executemany(
+        f"INSERT OR REPLACE INTO lakehouse_partitions ({columns}) "
+        f"VALUES ({placeholders})",
+        [[*astuple(entry), updated_at] for entry in entries],
+    )
+    _bump_generations(
+        conn, ((entry.dataset_name, entry.storage_zone) for entry in entries)
+    )
+
+
+def delete_partition_files(
+    conn: duckdb.DuckDBPyConnection, file_paths: Sequence[str]
+) -> None:
+    """Drop manifest rows for files removed from the lakehouse."""
+
+    if not file_paths:
+        return
+    datasets = conn.execute(
+        """
+        SELECT DISTINCT dataset_name, storage_zone
+        FROM lakehouse_partitions
+        WHERE list_contains(?, file_path)
+        """,
+        [list(file_paths)],
+    ).fetchall()
+    conn.executemany(
+        "DELETE FROM lakehouse_partitions WHERE file_path = ?",
+        [[path] for path in file_paths],
+    )
+    _bump_generations(conn, datasets)
+
+
+def manifest_generation(
+    conn: duckdb.DuckDBPyConnection, dataset_name: str, zone: StorageZone
+) -> tuple[int, datetime | None]:
+    """Return a dataset's stored write generation and when it last moved.
+
+    The counter lives in DuckDB, so writes from any process advance it.
+    Callers caching lakehouse reads include it in their keys, so any cataloged
+    write, compaction, removal or index update makes older entries
+    unreachable.
+    """
+
+    row = conn.execute(
+        """
+        SELECT generation, updated_at
+        FROM lakehouse_generations
+        WHERE dataset_name = ? AND storage_zone = ?
+        """,
+        [dataset_name, zone.value],
+    ).fetchone()
+    return (int(row[0]), row[1]) if row is not None else (0, None)
+
+
+def bump_manifest_generation(
+    conn: duckdb.DuckDBPyConnection, dataset_name: str, zone: StorageZone
+) -> None:
+    """Advance a dataset's generation after metadata derived from its files moved."""
+
+    _bump_generations(conn, [(dataset_name, zone.value)])
+
+
+def _bump_generations(
+    conn: duckdb.DuckDBPyConnection, datasets: Iterable[tuple[str, str]]
+) -> None:
+    updated_at = datetime.now(UTC).replace(tzinfo=None)
+    conn.executemany(
+        """
+        INSERT INTO lakehouse_generations (
+            dataset_name, storage_zone, generation, updated_at
+        ) VALUES (?, ?, 1, ?)
+        ON CONFLICT (dataset_name, storage_zone) DO UPDATE
+        SET generation = lakehouse_generations.generation + 1,
+            updated_at = excluded.updated_at
+        """,
+        [[dataset, zone, updated_at] for dataset, zone in sorted(set(datasets))],
+    )
+
+
+def dataset_is_cataloged(
+    conn: duckdb.DuckDBPyConnection, dataset_name: str, zone: StorageZone
+) -> bool:
+    """Return whether the manifest already tracks a dataset in one zone."""
+
+    row = conn.execute(
+        """
+        SELECT 1
+        FROM lakehouse_partitions
+        WHERE dataset_name = ? AND storage_zone = ?
+        LIMIT 1
+        """,
+        [dataset_name, zone.value],
+    ).fetchone()
+    return row is not None
+
+
+def list_partition_months(
+    conn: duckdb.DuckDBPyConnection,
+    dataset_name: str,
+    zone: StorageZone,
+    start: date | None = None,
+    end: date | None = None,
+) -> list[tuple[int, int]] | None:
+    """Return year/month partitions holding rows inside an inclusive window.
+
+    Files without a recorded date range are always kept. Returns ``None``
+    when the dataset is not cataloged, so callers can fall back to the
+    filesystem.
+    """
+
+    if not dataset_is_cataloged(conn, dataset_name, zone):
+        return None
+    rows = conn.execute(
+        f"""
+        SELECT DISTINCT partition_year, partition_month
+        FROM lakehouse_partitions
+        WHERE {_WINDOW_FILTER}
+          AND partition_year IS NOT NULL
+          AND partition_month IS NOT NULL
+        ORDER BY partition_year, partition_month
+        """,
+        [dataset_name, zone.value, start, start, end, end],
+    ).fetchall()
+    return [(int(year), int(month)) for year, month in rows]
+
+
+def list_window_file_paths(
+    conn: duckdb.DuckDBPyConnection,
+    dataset_name: str,
+    zone: StorageZone,
+    start: date | None = None,
+    end: date | None = None,
+) -> list[str] | None:
+    """Return lakehouse-relative files holding rows inside an inclusive window.
+
+    Files are ordered by partition with each base file ahead of its deltas.
+    Returns ``None`` when the dataset is not cataloged.
+    """
+
+    if not dataset_is_cataloged(conn, dataset_name, zone):
+        return None
+    rows = conn.execute(
+        f"""
+        SELECT file_path
+        FROM lakehouse_partitions
+        WHERE {_WINDOW_FILTER}
+        ORDER BY partition_path, file_kind = 'delta', file_path
+        """,
+        [dataset_name, zone.value, start, start, end, end],
+    ).fetchall()
+    return [row[0] for row in rows]
+
+
+def list_partition_files(
+    conn: duckdb.DuckDBPyConnection,
+    dataset_name: str | None = None,
+    zone: StorageZone | None = None,
+) -> list[dict]:
+    """Return manifest rows, optionally filtered by dataset and zone."""
+
+    clauses: list[str] = []
+    params: list[str] = []
+    if dataset_name is not None:
+        clauses.append("dataset_name = ?")
+        params.append(dataset_name)
+    if zone is not None:
+        clauses.append("storage_zone = ?")
+        params.append(zone.value)
+    where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+    cursor = conn.execute(
+        f"SELECT * FROM lakehouse_partitions {where} ORDER BY file_path",
+        params,
+    )
+    columns = [column[0] for column in cursor.description]
+    return [dict(zip(columns, row)) for row in cursor.fetchall()]
@@ -38,6 +38,24 @@ class StorageZone(StrEnum):
     DERIVED = "derived"
 
 
+class PartitionWriteMode(StrEnum):
+    """How year/month partition upserts land new rows."""
+
+    # Merge new rows into the base part file and rewrite it on every sync.
+    REWRITE = "rewrite"
+    # Append one delta file per run; readers merge deltas until compaction.
+    DELTA = "delta"
+
+
+class PartitionLayout(StrEnum):
+    """How partition directories are named under a dataset root."""
+
+    # Partition values only, such as ``2024/03``.
+    PLAIN = "plain"
+    # Hive-style ``key=value`` names, such as ``year=2024/month=03``.
+    HIVE = "hive"
+
+
 class TriggerMode(StrEnum):
     """How an ETL run is triggered."""
 
@@ -118,6 +136,36 @@ class IngestionRequest(BaseModel):
     )
 
 
+class ParquetWriteProfile(BaseModel):
+    """Physical layout applied when writing a dataset's canonical parquet files."""
+
+    sort_columns: list[str] = Field(
+        default_factory=list,
+        description="Columns rows are sorted by before writing, outermost first.",
+    )
+    row_group_size: int | None = Field(
+        default=None,
+        gt=0,
+        description="Maximum rows per row group; the writer default when unset.",
+    )
+    compression: str = Field(
+        default="snappy",
+        description="Parquet compression codec, such as snappy or zstd.",
+    )
+    compression_level: int | None = Field(
+        default=None,
+        description="Codec-specific compression level; the codec default when unset.",
+    )
+    dictionary_columns: list[str] | None = Field(
+        default=None,
+        description="Columns to dictionary-encode; every column when unset.",
+    )
+    bloom_filter_columns: list[str] = Field(
+        default_factory=list,
+        description="Columns that get a parquet bloom filter for point lookups.",
+    )
+
+
 class SourceFetchResult(BaseModel):
     """Typed payload returned by one source adapter fetch."""
 
@@ -154,7 +202,12 @@ class CanonicalWriteResult(BaseModel):
     records_inserted: int = Field(default=0)
     records_updated: int = Field(default=0)
     partitions_written: int = Field(default=0)
+    partitions_unchanged: int = Field(default=0)
     storage_paths: list[str] = Field(default_factory=list)
+    # On-disk size of the existing partition files read back for the upsert,
+    # and of the parquet files actually rewritten.
+    bytes_read: int = Field(default=0)
+    bytes_written: int = Field(default=0)
 
 
 class DatasetSyncResult(BaseModel):
@@ -167,10 +220,14 @@ class DatasetSyncResult(BaseModel):
     validation_counts: dict[str, int] = Field(default_factory=dict)
     records_discovered: int = 0
     records_written: int = 0
+    partitions_unchanged: int = 0
     watermark_updated: bool = False
     started_at: datetime
     finished_at: datetime | None = None
     error_message: str | None = None
+    # Wall seconds per sync stage: fetch, raw_landing, normalize, validate,
+    # validation_persistence, write and watermark.
+    stage_seconds: dict[str, float] = Field(default_factory=dict)
 
 
 class IngestionRunRecord(BaseModel):
@@ -0,0 +1,135 @@
+"""DuckDB query layer over lakehouse parquet partitions."""
+
+from __future__ import annotations
+
+from collections.abc import Sequence
+from datetime import date
+from pathlib import Path
+
+import duckdb
+import pyarrow as pa
+
+from tradepilot.config import LAKEHOUSE_ROOT
+from tradepilot.etl.manifest import DATE_RANGE_COLUMNS, list_window_file_paths
+from tradepilot.etl.models import StorageZone
+from tradepilot.etl.storage import list_dataset_files
+
+# Orders rows from delta files by run id, after rows from base files.
+_FILE_PRECEDENCE = (
+    "CASE WHEN filename LIKE '%part-delta-%' "
+    "THEN CAST(regexp_extract(filename, 'part-delta-([0-9]+)\\.parquet$', 1) "
+    "AS BIGINT) "
+    "ELSE -1 END"
+)
+
+
+def read_dataset_arrow(
+    dataset_name: str,
+    zone: StorageZone,
+    key_columns: Sequence[str],
+    *,
+    start: date | None = None,
+    end: date | None = None,
+    columns: Sequence[str] | None = None,
+    lakehouse_root: Path | None = None,
+    conn: duckdb.DuckDBPyConnection | None = None,
+) -> pa.Table:
+    """Read a dataset's partitions into one Arrow table through DuckDB.
+
+    Candidate files come from the partition manifest when ``conn`` tracks the
+    dataset, otherwise from partition discovery in either directory layout;
+    hive directory keys are not added as columns. Only ``columns`` are read,
+    and the window applies to the first date business key inside the parquet
+    scan, so row groups outside it are skipped on their statistics. Delta
+    files are merged over base files, with the newest run winning per key.
+    """
+
+    if start is not None and end is not None and start > end:
+        start, end = end, start
+    files = _candidate_files(dataset_name, zone, start, end, lakehouse_root, conn)
+    if not files:
+        return pa.table({})
+    date_column = next(
+        (column for column in key_columns if column in DATE_RANGE_COLUMNS), None
+    )
+    has_deltas = any("part-delta-" in Path(path).name for path in files)
+    projection = (
+        ", ".join(_quote(column) for column in dict.fromkeys(columns))
+        if columns is not None
+        else "* EXCLUDE (filename)"
+    )
+    sql = [
+        f"SELECT {projection}",
+        "FROM read_parquet(?, filename = true, union_by_name = true, "
+        "hive_partitioning = false)",
+    ]
+    params: list[object] = [files]
+    # The cast is a no-op on DATE columns, which keeps statistics pushdown,
+    # and drops unparseable dates from files written with text columns.
+    filters: list[str] = []
+    if date_column is not None and start is not None:
+        filters.append(f"TRY_CAST({_quote(date_column)} AS DATE) >= ?")
+        params.append(start)
+    if date_column is not None and end is not None:
+        filters.append(f"TRY_CAST({_quote(date_column)} AS DATE) <= ?")
+        params.append(end)
+    if filters:
+        sql.append(f"WHERE {' AND '.join(filters)}")
+    keys = ", ".join(_quote(column) for column in key_columns)
+    if has_deltas and keys:
+        sql.append(
+            f"QUALIFY row_number() OVER (PARTITION BY {keys} "
+            f"ORDER BY {_FILE_PRECEDENCE} DESC) = 1"
+        )
+    if keys:
+        sql.append(f"ORDER BY {keys}")
+    cursor = conn.cursor() if conn is not None else duckdb.connect()
+    try:
+        result = cursor.execute("\n".join(sql), params).arrow()
+        if isinstance(result, pa.RecordBatchReader):
+            return result.read_all()
+        return result
+    finally:
+        cursor.close()
+
+
+def window_file_bytes(
+    dataset_name: str,
+    zone: StorageZone,
+    *,
+    start: date | None = None,
+    end: date | None = None,
+    lakehouse_root: Path | None = None,
+    conn: duckdb.DuckDBPyConnection | None = None,
+) -> int:
+    """Return the on-disk size of the files ``read_dataset_arrow`` would scan."""
+
+    if start is not None and end is not None and start > end:
+        start, end = end, start
+    files = _candidate_files(dataset_name, zone, start, end, lakehouse_root, conn)
+    return sum(Path(path).stat().st_size for path in files if Path(path).is_file())
+
+
+def _candidate_files(
+    dataset_name: str,
+    zone: StorageZone,
+    start: date | None,
+    end: date | None,
+    lakehouse_root: Path | None,
+    conn: duckdb.DuckDBPyConnection | None,
+) -> list[str]:
+    if conn is not None:
+        cataloged = list_window_file_paths(conn, dataset_name, zone, start, end)
+        if cataloged is not None:
+            root = lakehouse_root or LAKEHOUSE_ROOT
+            return [str(root / path) for path in cataloged]
+    return [
+        str(path)
+        for path in list_dataset_files(
+            dataset_name, zone, lakehouse_root=lakehouse_root, start=start, end=end
+        )
+    ]
+
+
+def _quote(identifier: str) -> str:
+    return '"' + identifier.replace('"', '""') + '"'
@@ -2,15 +2,29 @@
 
 from __future__ import annotations
 
+from collections import OrderedDict
+from collections.abc import Callable
+import copy
 from datetime import date
+from functools import wraps
+import inspect
 import json
 from pathlib import Path
+import threading
 from typing import Any
 
+import duckdb
 import pandas as pd
 
+from tradepilot.etl.datasets import (
+    build_derived_etf_aw_rebalance_snapshot_dataset,
+    build_derived_etf_aw_regime_score_dataset,
+)
+from tradepilot.etl.latest_index import dataset_is_indexed, latest_rebalance_pointer
+from tradepilot.etl.manifest import list_partition_months, manifest_generation
 from tradepilot.etl.models import StorageZone
-from tradepilot.etl.storage import build_dataset_file_path
+from tradepilot.etl.query import read_dataset_arrow
+from tradepilot.etl.storage import list_month_partitions, read_dataset_partition
 
 _ETF_AW_SNAPSHOT_DATASET = "derived.etf_aw_rebalance_snapshot"
 _ETF_AW_SNAPSHOT_SCHEMA_VERSION = "etf_aw_snapshot_v1"
@@ -28,18 +42,107 @@ _ETF_AW_SNAPSHOT_STATUS_ORDER = ["stale", "missing", "partial", "complete"]
 _ETF_AW_SNAPSHOT_STATUSES = set(_ETF_AW_SNAPSHOT_STATUS_ORDER)
 _ETF_AW_REGIME_SCORE_DATASET = "derived.etf_aw_regime_score"
 _ETF_AW_REGIME_SCORE_SCHEMA_VERSION = "etf_aw_regime_score_v1"
+_ETF_AW_SNAPSHOT_KEY_COLUMNS = tuple(
+    build_derived_etf_aw_rebalance_snapshot_dataset().business_key_columns
+)
+_ETF_AW_REGIME_SCORE_KEY_COLUMNS = tuple(
+    build_derived_etf_aw_regime_score_dataset().business_key_columns
+)
+_READ_CACHE_MAX_ENTRIES = 256
 
 
+class _ReadModelCache:
+    """Thread-safe LRU of read-model results."""
+
+    def __init__(self, max_entries: int) -> None:
+        self._entries: OrderedDict[tuple, Any] = OrderedDict()
+        self._lock = threading.Lock()
+        self._max_entries = max_entries
+
+    def get_or_load(self, key: tuple, load: Callable[[], Any]) -> Any:
+        """Return a copy of the cached value, loading and storing it on a miss."""
+
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                return copy.deepcopy(self._entries[key])
+        value = load()
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+        return copy.deepcopy(value)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+_read_cache = _ReadModelCache(_READ_CACHE_MAX_ENTRIES)
+
+
+def clear_read_model_cache() -> None:
+    """Drop cached read-model results, e.g. after writing files by hand."""
+
+    _read_cache.clear()
+
+
+def _cached_read_model(
+    dataset_name: str,
+) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+    """Cache a read model by its arguments and the dataset's manifest generation.
+
+    The connection only chooses how partitions are located, so it is left out
+    of the key. The generation is stored in DuckDB and bumped by every
+    cataloged write or index update, from any process, which retires every
+    earlier result for that dataset. Reads without a connection cannot see
+    that counter and are never cached.
+    """
+
+    def decorate(function: Callable[..., Any]) -> Callable[..., Any]:
+        signature = inspect.signature(function)
+
+        @wraps(function)
+        def cached(*args: Any, **kwargs: Any) -> Any:
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            conn = bound.arguments.get("conn")
+            if conn is None:
+                return function(*args, **kwargs)
+            key = (
+                function.__name__,
+                tuple(
+                    (name, value)
+                    for name, value in bound.arguments.items()
+                    if name != "conn"
+                ),
+                manifest_generation(conn, dataset_name, StorageZone.DERIVED),
+            )
+            return _read_cache.get_or_load(key, lambda: function(*args, **kwargs))
+
+        return cached
+
+    return decorate
+
+
+@_cached_read_model(_ETF_AW_SNAPSHOT_DATASET)
 def get_latest_etf_aw_snapshot(
     as_of_date: date | None = None,
     *,
     lakehouse_root: Path | None = None,
+    conn: duckdb.DuckDBPyConnection | None = None,
 ) -> dict[str, Any] | None:
-    """Return the latest ETF all-weather snapshot at or before a date."""
+    """Return the latest ETF all-weather snapshot at or before a date.
+
+    With a connection, the latest index names the one partition to read;
+    datasets not yet indexed are located through the lakehouse manifest.
+    """
 
     frame = _read_latest_etf_aw_snapshot_partition(
         as_of_date=as_of_date,
         lakehouse_root=lakehouse_root,
+        conn=conn,
     )
     if frame.empty:
         return None
@@ -54,11 +157,13 @@ def get_latest_etf_aw_snapshot(
     return None
 
 
+@_cached_read_model(_ETF_AW_SNAPSHOT_DATASET)
 def list_etf_aw_snapshots(
     start: date,
     end: date,
     *,
     lakehouse_root: Path | None = None,
+    conn: duckdb.DuckDBPyConnection | None = None,
 ) -> list[dict[str, Any]]:
     """Return ETF all-weather snapshots in an inclusive rebalance-date window."""
 
@@ -68,6 +173,7 @@ def list_etf_aw_snapshots(
         start=start,
         end=end,
         lakehouse_root=lakehouse_root,
+        conn=conn,
     )
     if frame.empty:
         return []
@@ -81,14 +187,29 @@ def list_etf_aw_snapshots(
     ]
 
 
+@_cached_read_model(_ETF_AW_REGIME_SCORE_DATASET)
 def get_latest_etf_aw_regime_context(
     as_of_date: date | None = None,
     *,
     lakehouse_root: Path | None = None,
+    conn: duckdb.DuckDBPyConnection | None = None,
 ) -> dict[str, Any] | None:
-    """Return the latest ETF all-weather regime context at or before a date."""
+    """Return the latest ETF all-weather regime context at or before a date.
 
-    frame = _read_etf_aw_regime_score_partitions(lakehouse_root=lakehouse_root)
+    With an indexed connection only the latest rebalance date's rows are read.
+    """
+
+    start = None
+    if conn is not None and dataset_is_indexed(conn, _ETF_AW_REGIME_SCORE_DATASET):
+        pointer = latest_rebalance_pointer(
+            conn, _ETF_AW_REGIME_SCORE_DATASET, as_of_date
+        )
+        if pointer is None:
+            return None
+        start = pointer.rebalance_date
+    frame = _read_etf_aw_regime_score_partitions(
+        start=start, end=as_of_date, lakehouse_root=lakehouse_root, conn=conn
+    )
     if frame.empty:
         return None
     frame["rebalance_date"] = _normalize_date_series(frame["rebalance_date"])
@@ -103,11 +224,13 @@ def get_latest_etf_aw_regime_context(
     return _regime_contract(latest.iloc[-1])
 
 
+@_cached_read_model(_ETF_AW_REGIME_SCORE_DATASET)
 def list_etf_aw_regime_contexts(
     start: date,
     end: date,
     *,
     lakehouse_root: Path | None = None,
+    conn: duckdb.DuckDBPyConnection | None = None,
 ) -> list[dict[str, Any]]:
     """Return ETF all-weather regime contexts in a rebalance-date window."""
 
@@ -117,6 +240,7 @@ def list_etf_aw_regime_contexts(
         start=start,
         end=end,
         lakehouse_root=lakehouse_root,
+        conn=conn,
     )
     if frame.empty:
         return []
@@ -132,38 +256,50 @@ def _read_etf_aw_snapshot_partitions(
     end: date | None = None,
     *,
     lakehouse_root: Path | None = None,
+    conn: duckdb.DuckDBPyConnection | None = None,
 ) -> pd.DataFrame:
-    frames: list[pd.DataFrame] = []
-    for year, month in _snapshot_months(start, end, lakehouse_root=lakehouse_root):
-        path = build_dataset_file_path(
-            _ETF_AW_SNAPSHOT_DATASET,
-            StorageZone.DERIVED,
-            [("year", year), ("month", f"{month:02d}")],
-            lakehouse_root=lakehouse_root,
-        )
-        if path.exists():
-            frames.append(pd.read_parquet(path))
-    if not frames:
+    table = read_dataset_arrow(
+        _ETF_AW_SNAPSHOT_DATASET,
+        StorageZone.DERIVED,
+        _ETF_AW_SNAPSHOT_KEY_COLUMNS,
+        start=start,
+        end=end,
+        lakehouse_root=lakehouse_root,
+        conn=conn,
+    )
+    if table.num_rows == 0:
         return pd.DataFrame()
-    return pd.concat(frames, ignore_index=True)
+    return table.to_pandas()
 
 
 def _read_latest_etf_aw_snapshot_partition(
     *,
     as_of_date: date | None,
     lakehouse_root: Path | None,
+    conn: duckdb.DuckDBPyConnection | None = None,
 ) -> pd.DataFrame:
-    months = _snapshot_months(None, as_of_date, lakehouse_root=lakehouse_root)
-    for year, month in reversed(months):
-        path = build_dataset_file_path(
+    if conn is not None and dataset_is_indexed(conn, _ETF_AW_SNAPSHOT_DATASET):
+        pointer = latest_rebalance_pointer(conn, _ETF_AW_SNAPSHOT_DATASET, as_of_date)
+        months = (
+            [(pointer.partition_year, pointer.partition_month)]
+            if pointer is not None
+            else []
+        )
+    else:
+        months = _snapshot_months(
+            None, as_of_date, lakehouse_root=lakehouse_root, conn=conn
+        )[::-1]
+    for year, month in months:
+        partition = read_dataset_partition(
             _ETF_AW_SNAPSHOT_DATASET,
             StorageZone.DERIVED,
             [("year", year), ("month", f"{month:02d}")],
+            _ETF_AW_SNAPSHOT_KEY_COLUMNS,
             lakehouse_root=lakehouse_root,
         )
-        if not path.exists():
+        if partition.empty:
             continue
-        frame = _normalize_snapshot_frame(pd.read_parquet(path))
+        frame = _normalize_snapshot_frame(partition)
         if as_of_date is not None and not frame.empty:
             frame = frame[frame["rebalance_date"] <= as_of_date].copy()
         if not frame.empty:
@@ -176,25 +312,20 @@ def _read_etf_aw_regime_score_partitions(
     end: date | None = None,
     *,
     lakehouse_root: Path | None = None,
+    conn: duckdb.DuckDBPyConnection | None = None,
 ) -> pd.DataFrame:
-    frames: list[pd.DataFrame] = []
-    for year, month in _dataset_months(
+    table = read_dataset_arrow(
         _ETF_AW_REGIME_SCORE_DATASET,
-        start,
-        end,
+        StorageZone.DERIVED,
+        _ETF_AW_REGIME_SCORE_KEY_COLUMNS,
+        start=start,
+        end=end,
         lakehouse_root=lakehouse_root,
-    ):
-        path = build_dataset_file_path(
-            _ETF_AW_REGIME_SCORE_DATASET,
-            StorageZone.DERIVED,
-            [("year", year), ("month", f"{month:02d}")],
-            lakehouse_root=lakehouse_root,
-        )
-        if path.exists():
-            frames.append(pd.read_parquet(path))
-    if not frames:
+        conn=conn,
+    )
+    if table.num_rows == 0:
         return pd.DataFrame()
-    return pd.concat(frames, ignore_index=True)
+    return table.to_pandas()
 
 
 def _normalize_snapshot_frame(frame: pd.DataFrame) -> pd.DataFrame:
@@ -215,42 +346,26 @@ def _dataset_months(
     end: date | None,
     *,
     lakehouse_root: Path | None,
+    conn: duckdb.DuckDBPyConnection | None = None,
 ) -> list[tuple[int, int]]:
-    if start is not None and end is not None:
-        if start > end:
-            start, end = end, start
-        months: list[tuple[int, int]] = []
-        cursor = date(start.year, start.month, 1)
-        while cursor <= end:
-            months.append((cursor.year, cursor.month))
-            if cursor.month == 12:
-                cursor = date(cursor.year + 1, 1, 1)
-            else:
-                cursor = date(cursor.year, cursor.month + 1, 1)
-        return months
-
-    upper_month = (end.year, end.month) if end is not None else None
-    dataset_root = (
-        (lakehouse_root / StorageZone.DERIVED.value)
-        if lakehouse_root is not None
-        else None
-    )
-    if dataset_root is None:
-        from tradepilot.config import LAKEHOUSE_DERIVED_ROOT
-
-        dataset_root = LAKEHOUSE_DERIVED_ROOT
-    root = dataset_root / dataset_name
-    if not root.exists():
-        return []
-    months = []
-    for path in root.glob("*/*/part-00000.parquet"):
-        try:
-            month = (int(path.parent.parent.name), int(path.parent.name))
-        except ValueError:
-            continue
-        if upper_month is None or month <= upper_month:
-            months.append(month)
-    return sorted(set(months))
+    if start is not None and end is not None and start > end:
+        start, end = end, start
+    if conn is not None:
+        cataloged = list_partition_months(
+            conn, dataset_name, StorageZone.DERIVED, start, end
+        )
+        if cataloged is not None:
+            return cataloged
+    return [
+        month
+        for month, _ in list_month_partitions(
+            dataset_name,
+            StorageZone.DERIVED,
+            lakehouse_root=lakehouse_root,
+            start=start,
+            end=end,
+        )
+    ]
 
 
 def _snapshot_months(
@@ -258,25 +373,14 @@ def _snapshot_months(
     end: date | None,
     *,
     lakehouse_root: Path | None,
+    conn: duckdb.DuckDBPyConnection | None = None,
 ) -> list[tuple[int, int]]:
-    if start is not None and end is not None:
-        if start > end:
-            start, end = end, start
-        months: list[tuple[int, int]] = []
-        cursor = date(start.year, start.month, 1)
-        while cursor <= end:
-            months.append((cursor.year, cursor.month))
-            if cursor.month == 12:
-                cursor = date(cursor.year + 1, 1, 1)
-            else:
-                cursor = date(cursor.year, cursor.month + 1, 1)
-        return months
-
     return _dataset_months(
         _ETF_AW_SNAPSHOT_DATASET,
         start,
         end,
         lakehouse_root=lakehouse_root,
+        conn=conn,
     )
 
 
@@ -3,23 +3,48 @@
 from __future__ import annotations
 
 from calendar import monthrange
-from collections.abc import Iterable
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    wait,
+)
+from contextlib import contextmanager
 from datetime import UTC, date, datetime, timedelta
+from functools import partial
 import json
 import math
-from pathlib import Path
+import mmap
+import multiprocessing
+from pathlib import Path, PurePosixPath
+import queue
+import threading
+import time
 from typing import Any
 
 import duckdb
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
 import pandas as pd
 
 from tradepilot import db
 from tradepilot.etl.datasets import DatasetDefinition
+from tradepilot.etl.latest_index import (
+    dataset_is_indexed,
+    move_partition_pointers,
+    record_partition_pointers,
+)
+from tradepilot.etl.manifest import list_partition_files
 from tradepilot.etl.models import (
     CanonicalWriteResult,
     DatasetSyncResult,
     DependencyType,
     IngestionRequest,
+    ParquetWriteProfile,
+    PartitionLayout,
+    PartitionWriteMode,
     RunStatus,
     SourceFetchResult,
     StorageZone,
@@ -29,18 +54,31 @@ from tradepilot.etl.models import (
     normalize_request_window,
 )
 from tradepilot.etl.normalizers import get_normalizer
+from tradepilot.etl.query import read_dataset_arrow, window_file_bytes
 from tradepilot.etl.registry import DatasetRegistry, register_stage_b_datasets
 from tradepilot.etl.sources import BaseSourceAdapter, TushareSourceAdapter
 from tradepilot.etl.storage import (
-    build_dataset_file_path,
+    ParquetStreamWriter,
+    build_partition_path,
     cleanup_temp_files,
+    compact_dataset_partition,
+    list_delta_files,
+    list_month_partitions,
+    migrate_dataset_layout,
+    open_raw_parquet_stream,
+    partition_file_paths,
+    read_dataset_partition,
+    remove_dataset_files,
+    write_dataset_delta_parquet,
     write_dataset_parquet,
-    write_raw_parquet,
 )
 from tradepilot.etl.validators import (
+    ChunkedValidation,
+    ReferenceDataCache,
     get_validator,
     has_blocking_failures,
     validation_counts,
+    validation_results_frame,
 )
 
 _ID_SEQUENCES: dict[tuple[str, str], str] = {
@@ -50,6 +88,22 @@ _ID_SEQUENCES: dict[tuple[str, str], str] = {
         "etl_validation_results",
         "validation_id",
     ): "etl_validation_results_validation_id_seq",
+    ("etl_derived_builds", "build_id"): "etl_derived_builds_build_id_seq",
+    ("etl_run_stages", "stage_id"): "etl_run_stages_stage_id_seq",
+}
+
+_MULTI_DATASET_MAX_WORKERS = 4
+_STAGE_PERCENTILE_BUCKETS = {"day", "week", "month", None}
+# Derived build workers start fresh interpreters instead of forking a process
+# that holds DuckDB threads and locks.
+_DERIVED_WORKER_START_METHOD = "spawn"
+# Windows buffered between pipelined backfill stages before the upstream
+# stage blocks.
+_PIPELINE_QUEUE_DEPTH = 1
+# Partition keys, outermost first, written for each dataset partition strategy.
+_PARTITION_KEYS: dict[str, tuple[str, ...]] = {
+    "year_month": ("year", "month"),
+    "snapshot_date": ("snapshot_date",),
 }
 
 _TRADING_CALENDAR_FULL_HISTORY_PROFILE = "reference.trading_calendar.full_history"
@@ -68,6 +122,22 @@ _ETF_AW_REGIME_SCHEMA_VERSION = "etf_aw_regime_score_v1"
 _ETF_AW_REGIME_SCORER_NAME = "etf_aw_market_only_regime"
 _ETF_AW_REGIME_SCORER_VERSION = "v1"
 _ETF_AW_SNAPSHOT_LOOKBACK_DAYS = 420
+# Input history read before a sleeve daily window, so the first rebuilt day
+# still finds its previous observation across long holidays.
+_ETF_AW_SLEEVE_DAILY_LOOKBACK_DAYS = 31
+# Upstream datasets or derived profiles whose changes make each derived
+# profile's rows stale. Source datasets are tracked by the write times of
+# their stored rows and derived profiles by their recorded builds.
+_DERIVED_PROFILE_UPSTREAMS: dict[str, tuple[str, ...]] = {
+    _ETF_AW_SLEEVE_DAILY_PROFILE: ("market.etf_daily", "market.etf_adj_factor"),
+    _ETF_AW_REBALANCE_SNAPSHOT_PROFILE: (
+        _ETF_AW_SLEEVE_DAILY_PROFILE,
+        "market.etf_daily",
+        "market.etf_adj_factor",
+        "reference.trading_calendar",
+    ),
+    _ETF_AW_REGIME_SCORE_PROFILE: (_ETF_AW_REBALANCE_SNAPSHOT_PROFILE,),
+}
 _ETF_AW_SNAPSHOT_WINDOWS = {
     "return_1m": (21, 15),
     "return_3m": (63, 45),
@@ -75,6 +145,8 @@ _ETF_AW_SNAPSHOT_WINDOWS = {
     "volatility_3m": (63, 45),
     "max_drawdown_6m": (126, 90),
 }
+# Feature values plus per-feature observation counts and partial flags.
+_SnapshotFeatures = tuple[dict[str, float | None], dict[str, dict[str, int | bool]]]
 _ETF_AW_SNAPSHOT_STATUSES = {"complete", "partial", "missing", "stale"}
 _ETF_AW_REGIME_STATUSES = {"complete", "degraded", "unavailable"}
 _ETF_AW_REGIME_LABELS = {
@@ -143,10 +215,209 @@ _ETF_AW_SLEEVES: list[dict[str, Any]] = [
         ),
     },
 ]
-_ETF_AW_SLEEVE_CODES = [str(row["sleeve_code"]) for row in _ETF_AW_SLEEVES]
+ETF_AW_SLEEVE_CODES = [str(row["sleeve_code"]) for row in _ETF_AW_SLEEVES]
 _ETF_AW_SLEEVE_ROLES = {str(row["sleeve_role"]) for row in _ETF_AW_SLEEVES}
 
 
+class _SyncLocks:
+    """Process-local locks shared by every service instance and DAG worker."""
+
+    def __init__(self) -> None:
+        self._guard = threading.Lock()
+        self._datasets: dict[str, threading.RLock] = {}
+        self.metadata = threading.Lock()
+
+    def dataset(self, dataset_name: str) -> threading.RLock:
+        """Return the re-entrant lock serializing syncs of one dataset."""
+
+        with self._guard:
+            lock = self._datasets.get(dataset_name)
+            if lock is None:
+                lock = threading.RLock()
+                self._datasets[dataset_name] = lock
+            return lock
+
+
+# Schedulers and API handlers each build their own service, so a dataset's
+# lock must not belong to any one instance.
+_SYNC_LOCKS = _SyncLocks()
+
+
+class _PipelineFailure:
+    """Index of the earliest failed window in a pipelined backfill."""
+
+    def __init__(self, window_count: int) -> None:
+        self._lock = threading.Lock()
+        self._index = window_count
+
+    def record(self, index: int) -> None:
+        with self._lock:
+            self._index = min(self._index, index)
+
+    def before(self, index: int) -> bool:
+        """Return whether a window earlier than ``index`` has failed."""
+
+        with self._lock:
+            return self._index < index
+
+
+class _BatchStream:
+    """Bounded hand-off of one window's source batches between threads.
+
+    The fetch thread feeds batches as the source yields them and the
+    normalize thread iterates them, so at most ``depth`` batches of a window
+    wait in memory. Source errors are re-raised on the consuming side.
+    """
+
+    _END = object()
+
+    def __init__(self, depth: int) -> None:
+        self._items: queue.Queue[Any] = queue.Queue(depth)
+        self._ended = False
+        # Time spent inside the source, written by the feeding thread only.
+        self.seconds = 0.0
+
+    def feed(
+        self, batches: Iterable[SourceFetchResult], cancelled: Callable[[], bool]
+    ) -> bool:
+        """Pass every batch on, stopping early once ``cancelled`` is true.
+
+        Returns whether the source was read to the end without raising.
+        """
+
+        iterator = iter(batches)
+        try:
+            while not cancelled():
+                started = time.perf_counter()
+                try:
+                    batch = next(iterator, None)
+                finally:
+                    self.seconds += time.perf_counter() - started
+                if batch is None:
+                    return True
+                self._items.put(batch)
+            self._items.put(RuntimeError("cancelled after an earlier window failed"))
+        except Exception as exc:
+            self._items.put(exc)
+        finally:
+            self._items.put(self._END)
+        return False
+
+    def close(self) -> None:
+        """End a stream that will never be fed."""
+
+        self._items.put(self._END)
+
+    def drain(self) -> None:
+        """Discard what is left so the feeding thread never blocks."""
+
+        while not self._ended:
+            self._ended = self._items.get() is self._END
+
+    def __iter__(self) -> Iterator[SourceFetchResult]:
+        while (item := self._items.get()) is not self._END:
+            if isinstance(item, Exception):
+                raise item
+            yield item
+        self._ended = True
+
+
+class _DerivedRebuildPlan:
+    """Stale range of one derived profile and the upstream state it reflects."""
+
+    def __init__(
+        self,
+        dirty_start: date | None,
+        upstream_marks: dict[str, str],
+        consumed_marks: dict[str, str],
+    ) -> None:
+        # First stale date, or None when no upstream changed since the last build.
+        self.dirty_start = dirty_start
+        self.upstream_marks = upstream_marks
+        self.consumed_marks = consumed_marks
+
+
+class _StageMetrics:
+    """Running totals of one sync or bootstrap stage."""
+
+    def __init__(self) -> None:
+        self.seconds = 0.0
+        self.rows = 0
+        # On-disk size of the parquet files read, except for ``fetch``, whose
+        # sources hand over data frames: it counts their in-memory size.
+        self.bytes_read = 0
+        self.bytes_written = 0
+        # Highest resident set size sampled while the stage's blocks ran.
+        self.peak_rss_mb: float | None = None
+
+    @property
+    def rows_per_second(self) -> float | None:
+        return self.rows / self.seconds if self.rows and self.seconds > 0 else None
+
+    def add_write(self, result: CanonicalWriteResult) -> None:
+        self.rows += result.records_written
+        self.bytes_read += result.bytes_read
+        self.bytes_written += result.bytes_written
+
+
+class _StageTimer:
+    """Per-stage wall time, volume and memory of one run."""
+
+    def __init__(self) -> None:
+        self.stages: dict[str, _StageMetrics] = {}
+        self.started = time.perf_counter()
+
+    @contextmanager
+    def timed(self, stage: str) -> Iterator[_StageMetrics]:
+        """Add one block's wall time to a stage; callers add rows and bytes."""
+
+        metrics = self.stages.setdefault(stage, _StageMetrics())
+        started = time.perf_counter()
+        sample = _rss_sampler.enter()
+        try:
+            yield metrics
+        finally:
+            metrics.seconds += time.perf_counter() - started
+            peak = _rss_sampler.exit(sample)
+            if peak is not None:
+                metrics.peak_rss_mb = max(metrics.peak_rss_mb or 0.0, peak)
+
+    def set_seconds(self, stage: str, seconds: float) -> None:
+        """Replace a stage's wall time with one measured on another thread."""
+
+        self.stages.setdefault(stage, _StageMetrics()).seconds = seconds
+
+    def seconds(self) -> dict[str, float]:
+        return {stage: metrics.seconds for stage, metrics in self.stages.items()}
+
+
+class _WindowSync:
+    """Mutable state of one ingestion run as it moves through sync stages."""
+
+    def __init__(
+        self,
+        definition: DatasetDefinition,
+        source: BaseSourceAdapter,
+        request: IngestionRequest,
+        run_id: int,
+        started_at: datetime,
+    ) -> None:
+        self.definition = definition
+        self.source = source
+        self.request = request
+        self.run_id = run_id
+        self.started_at = started_at
+        self.raw_batch_ids: list[int] = []
+        self.batches: _BatchStream | None = None
+        self.fetch_result: SourceFetchResult | None = None
+        self.canonical = pd.DataFrame()
+        self.validation = pd.DataFrame()
+        self.watermark_updated = False
+        self.error: Exception | None = None
+        self.index = 0
+        self.stages = _StageTimer()
+
+
 class ETLService:
     """Application service for Stage B single-dataset syncs."""
 
@@ -156,6 +427,7 @@ class ETLService:
         registry: DatasetRegistry | None = None,
         source_adapters: Iterable[BaseSourceAdapter] | None = None,
         lakehouse_root: Path | None = None,
+        partition_write_mode: PartitionWriteMode | None = None,
     ) -> None:
         self.conn = conn or db.get_conn()
         db.ensure_stage_b_sequences(self.conn)
@@ -164,163 +436,359 @@ class ETLService:
         adapters = list(source_adapters or [TushareSourceAdapter()])
         self.source_adapters = {adapter.source_name: adapter for adapter in adapters}
         self.lakehouse_root = lakehouse_root
+        # Overrides each dataset's own partition_write_mode when set.
+        self.partition_write_mode = partition_write_mode
+        self._locks = _SYNC_LOCKS
+        self._reference_cache = ReferenceDataCache()
+        # Holds the stage timer of the bootstrap running on each thread.
+        self._bootstrap_local = threading.local()
 
     def run_dataset_sync(
         self, dataset_name: str, request: IngestionRequest
     ) -> DatasetSyncResult:
         """Run one dataset through fetch, raw landing, normalize, validate, and load."""
 
+        with self._locks.dataset(dataset_name):
+            return self._run_dataset_sync(dataset_name, request)
+
+    def _run_dataset_sync(
+        self, dataset_name: str, request: IngestionRequest
+    ) -> DatasetSyncResult:
         definition = self.registry.get_dataset(dataset_name)
         source = self._source_adapter(definition)
-        cleanup_temp_files(dataset_name, lakehouse_root=self.lakehouse_root)
-        self._mark_stale_running_runs(dataset_name)
+        self._recover_dataset(definition, source)
+        sync = self._open_sync(definition, source, request)
+        try:
+            self._prepare_sync(sync)
+            self._land_raw_batches(
+                sync, source.fetch_batches(dataset_name, sync.request)
+            )
+            return self._load_sync(sync)
+        except Exception as exc:
+            return self._fail_sync(sync, exc)
+
+    def _run_pipelined_syncs(
+        self, dataset_name: str, requests: list[IngestionRequest]
+    ) -> list[DatasetSyncResult]:
+        """Sync consecutive windows of one dataset as a three-stage pipeline.
+
+        A fetch thread pulls window N+1 while a normalize thread lands and
+        validates window N and this thread loads window N-1. Batches stream
+        from fetch to normalize through a bounded queue per window, and
+        bounded queues between stages give backpressure. Every window still
+        gets its own ingestion run, and loads happen in request order. Once a
+        window fails no later run is opened, and later windows already in
+        flight are recorded as failed.
+        """
+
+        definition = self.registry.get_dataset(dataset_name)
+        source = self._source_adapter(definition)
+        fetched: queue.Queue[_WindowSync | None] = queue.Queue(_PIPELINE_QUEUE_DEPTH)
+        landed: queue.Queue[_WindowSync | None] = queue.Queue(_PIPELINE_QUEUE_DEPTH)
+        failure = _PipelineFailure(len(requests))
+
+        def fetch_stage(worker: ETLService) -> None:
+            try:
+                for index, request in enumerate(requests):
+                    if failure.before(index):
+                        break
+                    sync = worker._open_sync(definition, source, request)
+                    sync.index = index
+                    sync.batches = _BatchStream(_PIPELINE_QUEUE_DEPTH)
+                    try:
+                        worker._prepare_sync(sync)
+                    except Exception as exc:
+                        sync.error = exc
+                        failure.record(index)
+                        sync.batches.close()
+                        fetched.put(sync)
+                        continue
+                    fetched.put(sync)
+                    # Record a source failure here so no later run is opened.
+                    if not sync.batches.feed(
+                        source.fetch_batches(dataset_name, sync.request),
+                        partial(failure.before, index + 1),
+                    ):
+                        failure.record(index)
+            finally:
+                fetched.put(None)
+
+        def normalize_stage(worker: ETLService) -> None:
+            try:
+                while (sync := fetched.get()) is not None:
+                    stream = sync.batches
+                    if sync.error is None and not failure.before(sync.index):
+                        try:
+                            worker._land_raw_batches(sync, stream)
+                        except Exception as exc:
+                            sync.error = exc
+                            failure.record(sync.index)
+                    stream.drain()
+                    # Landing only waited on the fetch thread for each batch.
+                    sync.stages.set_seconds("fetch", stream.seconds)
+                    sync.batches = None
+                    landed.put(sync)
+            finally:
+                landed.put(None)
+
+        results: list[DatasetSyncResult] = []
+        with self._locks.dataset(dataset_name):
+            self._recover_dataset(definition, source)
+            with ThreadPoolExecutor(
+                max_workers=2, thread_name_prefix="etl-pipeline"
+            ) as pool:
+                stages = [
+                    pool.submit(self._run_pipeline_stage, stage)
+                    for stage in (fetch_stage, normalize_stage)
+                ]
+                drained = False
+                try:
+                    while (sync := landed.get()) is not None:
+                        results.append(self._load_pipelined_sync(sync, failure))
+                    drained = True
+                finally:
+                    # On an interrupted load, stop opening windows and keep the
+                    # upstream stages from blocking on a full queue.
+                    failure.record(-1)
+                    while not drained and landed.get() is not None:
+                        pass
+                    for stage in stages:
+                        stage.result()
+        return results
+
+    def _load_pipelined_sync(
+        self, sync: _WindowSync, failure: _PipelineFailure
+    ) -> DatasetSyncResult:
+        try:
+            if failure.before(sync.index):
+                raise RuntimeError("cancelled after an earlier window failed")
+            if sync.error is not None:
+                raise sync.error
+            result = self._load_sync(sync)
+        except Exception as exc:
+            result = self._fail_sync(sync, exc)
+        if result.status != RunStatus.SUCCESS:
+            failure.record(sync.index)
+        return result
+
+    def _run_pipeline_stage(self, stage: Callable[[ETLService], None]) -> None:
+        worker = self._worker_service()
+        try:
+            stage(worker)
+        finally:
+            worker.conn.close()
+
+    def _recover_dataset(
+        self, definition: DatasetDefinition, source: BaseSourceAdapter
+    ) -> None:
+        """Clear leftovers of interrupted syncs before new runs start."""
+
+        cleanup_temp_files(definition.dataset_name, lakehouse_root=self.lakehouse_root)
+        self._mark_stale_running_runs(definition.dataset_name)
         self._ensure_source_registry(source.source_name)
 
+    def _open_sync(
+        self,
+        definition: DatasetDefinition,
+        source: BaseSourceAdapter,
+        request: IngestionRequest,
+    ) -> _WindowSync:
         run_id = self._next_id("etl_ingestion_runs", "run_id")
         started_at = _utc_now()
         self._insert_run(run_id, definition, source.source_name, request, started_at)
-        raw_batch_ids: list[int] = []
-        watermark_updated = False
-        try:
-            dependency_results = self._ensure_dependencies(definition, request, run_id)
-            if dependency_results:
-                self._persist_validation_results(dependency_results)
-                if has_blocking_failures(dependency_results):
-                    raise RuntimeError("dependency preflight failed")
-
-            effective_request = self._augment_market_request(definition, request)
-            fetch_result = source.fetch(dataset_name, effective_request)
-            self._assert_source_contract(fetch_result)
-
-            raw_batch_id = self._next_id("etl_raw_batches", "raw_batch_id")
-            raw_batch_ids.append(raw_batch_id)
-            raw_partition = fetch_result.partition_hints or _raw_partition_hints(
-                definition.dataset_name, effective_request
-            )
-            raw_write = write_raw_parquet(
-                fetch_result.payload,
-                dataset_name=dataset_name,
-                partition_parts=raw_partition.items(),
-                raw_batch_id=raw_batch_id,
-                lakehouse_root=self.lakehouse_root,
-            )
-            self._insert_raw_batch(raw_batch_id, run_id, fetch_result, raw_write)
+        return _WindowSync(definition, source, request, run_id, started_at)
 
-            context = dict(effective_request.context)
-            context.update(
-                {
-                    "dataset_name": dataset_name,
-                    "source_name": source.source_name,
-                    "raw_batch_id": raw_batch_id,
-                    "run_id": run_id,
-                    "conn": self.conn,
-                    "instrument_type": _instrument_type_for_dataset(dataset_name),
-                }
-            )
-            normalizer = get_normalizer(dataset_name)
-            normalized = normalizer.normalize(fetch_result.payload, context)
-            canonical = normalized.canonical_payload
+    def _prepare_sync(self, sync: _WindowSync) -> None:
+        """Autofill dependencies and resolve the effective source request."""
 
-            validator = get_validator(dataset_name)
-            validation_results = self._source_payload_validation(
-                definition, fetch_result, run_id, raw_batch_id
-            )
-            validation_results.extend(validator.validate(canonical, context))
-            counts = validation_counts(validation_results)
+        dependency_results = self._ensure_dependencies(
+            sync.definition, sync.request, sync.run_id
+        )
+        if dependency_results:
+            self._persist_validation_results(dependency_results)
+            if has_blocking_failures(dependency_results):
+                raise RuntimeError("dependency preflight failed")
+        sync.request = self._augment_market_request(sync.definition, sync.request)
+
+    def _load_sync(self, sync: _WindowSync) -> DatasetSyncResult:
+        """Persist validation, write canonical rows, and close the run."""
+
+        definition = sync.definition
+        dataset_name = definition.dataset_name
+        run_id = sync.run_id
+        fetch_result = sync.fetch_result
+        canonical = sync.canonical
+        validation_results = pd.concat(
+            [
+                validation_results_frame(
+                    self._source_payload_validation(
+                        definition, fetch_result, run_id, sync.raw_batch_ids[0]
+                    )
+                ),
+                sync.validation,
+            ],
+            ignore_index=True,
+        )
+        counts = validation_counts(validation_results)
+        with sync.stages.timed("validation_persistence") as persistence:
             self._persist_validation_results(validation_results)
+            persistence.rows += len(validation_results)
 
-            if has_blocking_failures(validation_results):
-                records_failed = sum(
-                    1
-                    for result in validation_results
-                    if result.status == ValidationStatus.FAIL
-                )
-                self._finish_run(
-                    run_id,
-                    RunStatus.FAILED,
-                    records_discovered=fetch_result.row_count,
-                    records_failed=records_failed,
-                    error_message="validation failed",
-                )
-                return DatasetSyncResult(
-                    run_id=run_id,
-                    dataset_name=dataset_name,
-                    status=RunStatus.FAILED,
-                    raw_batch_ids=raw_batch_ids,
-                    validation_counts=counts,
-                    records_discovered=fetch_result.row_count,
-                    records_written=0,
-                    watermark_updated=False,
-                    started_at=started_at,
-                    finished_at=_utc_now(),
-                    error_message="validation failed",
-                )
-
-            quality_status = _quality_status(validation_results)
-            if "quality_status" in canonical.columns:
-                canonical = canonical.copy()
-                canonical["quality_status"] = quality_status
-
-            write_result = self._write_canonical(definition, canonical)
-            if not canonical.empty:
-                self._advance_watermark(
-                    definition, source.source_name, run_id, canonical
-                )
-                watermark_updated = True
+        if has_blocking_failures(validation_results):
+            records_failed = int(
+                validation_results["status"].eq(ValidationStatus.FAIL.value).sum()
+            )
             self._finish_run(
                 run_id,
-                RunStatus.SUCCESS,
-                records_discovered=fetch_result.row_count,
-                records_inserted=write_result.records_inserted,
-                records_updated=write_result.records_updated,
-                partitions_written=write_result.partitions_written,
-            )
-            finished_at = _utc_now()
-            return DatasetSyncResult(
-                run_id=run_id,
-                dataset_name=dataset_name,
-                status=RunStatus.SUCCESS,
-                raw_batch_ids=raw_batch_ids,
-                validation_counts=counts,
+                RunStatus.FAILED,
                 records_discovered=fetch_result.row_count,
-                records_written=write_result.records_written,
-                watermark_updated=watermark_updated,
-                started_at=started_at,
-                finished_at=finished_at,
+                records_failed=records_failed,
+                error_message="validation failed",
             )
-        except Exception as exc:
-            self._finish_run(
-                run_id,
+            self._record_run_stages(
+                dataset_name,
+                sync.stages,
                 RunStatus.FAILED,
-                records_discovered=0,
-                records_failed=1,
-                error_message=str(exc),
+                run_id=run_id,
+                rows=fetch_result.row_count,
             )
             return DatasetSyncResult(
                 run_id=run_id,
                 dataset_name=dataset_name,
                 status=RunStatus.FAILED,
-                raw_batch_ids=raw_batch_ids,
-                validation_counts={},
-                records_discovered=0,
+                raw_batch_ids=sync.raw_batch_ids,
+                validation_counts=counts,
+                records_discovered=fetch_result.row_count,
                 records_written=0,
-                watermark_updated=watermark_updated,
-                started_at=started_at,
+                watermark_updated=False,
+                started_at=sync.started_at,
                 finished_at=_utc_now(),
-                error_message=str(exc),
+                error_message="validation failed",
+                stage_seconds=sync.stages.seconds(),
             )
 
+        quality_status = _quality_status(validation_results)
+        if "quality_status" in canonical.columns:
+            canonical = canonical.copy()
+            canonical["quality_status"] = quality_status
+
+        with sync.stages.timed("write") as write:
+            write_result = self._write_canonical(definition, canonical, run_id)
+            write.add_write(write_result)
+        if not canonical.empty:
+            with sync.stages.timed("watermark") as watermark:
+                self._advance_watermark(
+                    definition, sync.source.source_name, run_id, canonical
+                )
+                watermark.rows += len(canonical)
+            sync.watermark_updated = True
+        self._finish_run(
+            run_id,
+            RunStatus.SUCCESS,
+            records_discovered=fetch_result.row_count,
+            records_inserted=write_result.records_inserted,
+            records_updated=write_result.records_updated,
+            partitions_written=write_result.partitions_written,
+        )
+        self._record_run_stages(
+            dataset_name,
+            sync.stages,
+            RunStatus.SUCCESS,
+            run_id=run_id,
+            rows=write_result.records_written,
+        )
+        finished_at = _utc_now()
+        return DatasetSyncResult(
+            run_id=run_id,
+            dataset_name=dataset_name,
+            status=RunStatus.SUCCESS,
+            raw_batch_ids=sync.raw_batch_ids,
+            validation_counts=counts,
+            records_discovered=fetch_result.row_count,
+            records_written=write_result.records_written,
+            partitions_unchanged=write_result.partitions_unchanged,
+            watermark_updated=sync.watermark_updated,
+            started_at=sync.started_at,
+            finished_at=finished_at,
+            stage_seconds=sync.stages.seconds(),
+        )
+
+    def _fail_sync(self, sync: _WindowSync, exc: Exception) -> DatasetSyncResult:
+        self._finish_run(
+            sync.run_id,
+            RunStatus.FAILED,
+            records_discovered=0,
+            records_failed=1,
+            error_message=str(exc),
+        )
+        self._record_run_stages(
+            sync.definition.dataset_name,
+            sync.stages,
+            RunStatus.FAILED,
+            run_id=sync.run_id,
+        )
+        return DatasetSyncResult(
+            run_id=sync.run_id,
+            dataset_name=sync.definition.dataset_name,
+            status=RunStatus.FAILED,
+            raw_batch_ids=sync.raw_batch_ids,
+            validation_counts={},
+            records_discovered=0,
+            records_written=0,
+            watermark_updated=sync.watermark_updated,
+            started_at=sync.started_at,
+            finished_at=_utc_now(),
+            error_message=str(exc),
+            stage_seconds=sync.stages.seconds(),
+        )
+
     def run_multi_dataset_sync(
         self,
         dataset_names: list[str],
         request: IngestionRequest,
+        *,
+        max_workers: int | None = None,
     ) -> dict[str, DatasetSyncResult]:
-        """Run datasets sequentially without Stage C profile scheduling."""
+        """Run datasets as a dependency DAG on a bounded worker pool.
 
-        return {
-            dataset_name: self.run_dataset_sync(dataset_name, request)
-            for dataset_name in dataset_names
-        }
+        A dataset is submitted once every requested dataset it depends on has
+        finished. Each worker syncs through its own DuckDB cursor, and no source
+        adapter runs more datasets at once than its ``max_parallelism``.
+        Dependencies outside the requested set are still auto-filled by the
+        per-dataset preflight. Results keep the requested dataset order.
+        """
+
+        names = _unique_strings(dataset_names)
+        graph = self._dataset_dag(names)
+        workers = max(1, max_workers or _MULTI_DATASET_MAX_WORKERS)
+        results: dict[str, DatasetSyncResult] = {}
+        pending = list(names)
+        running: dict[Future[DatasetSyncResult], tuple[str, str]] = {}
+        in_flight: dict[str, int] = {}
+        with ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="etl-sync"
+        ) as pool:
+            while pending or running:
+                for dataset_name in list(pending):
+                    if len(running) >= workers:
+                        break
+                    if not graph[dataset_name].issubset(results):
+                        continue
+                    source_name = self.registry.get_dataset(dataset_name).primary_source
+                    if in_flight.get(source_name, 0) >= self._source_parallelism(
+                        source_name
+                    ):
+                        continue
+                    pending.remove(dataset_name)
+                    in_flight[source_name] = in_flight.get(source_name, 0) + 1
+                    future = pool.submit(self._run_dag_node, dataset_name, request)
+                    running[future] = (dataset_name, source_name)
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    dataset_name, source_name = running.pop(future)
+                    in_flight[source_name] -= 1
+                    results[dataset_name] = future.result()
+        return {dataset_name: results[dataset_name] for dataset_name in names}
 
     def run_bootstrap(
         self,
@@ -328,13 +796,40 @@ class ETLService:
         *,
         start: date | None = None,
         end: date | None = None,
+        max_workers: int | None = None,
     ) -> dict:
         """Run a narrow Stage C materialization profile.
 
         Source-backed datasets keep using run_dataset_sync. These profiles cover
         static or derived datasets until they have first-class source adapters.
+        ``max_workers`` above one builds ETF all-weather snapshot sleeves and
+        regime score months in that many worker processes. Read, write and
+        total stage metrics are recorded in ``etl_run_stages``.
         """
 
+        stages = _StageTimer()
+        previous = getattr(self._bootstrap_local, "stages", None)
+        self._bootstrap_local.stages = stages
+        try:
+            summary = self._run_bootstrap_profile(profile_name, start, end, max_workers)
+        finally:
+            self._bootstrap_local.stages = previous
+        self._record_run_stages(
+            str(summary.get("dataset_name") or profile_name),
+            stages,
+            str(summary.get("status") or RunStatus.SUCCESS.value),
+            profile_name=profile_name,
+            rows=int(summary.get("records_written") or 0),
+        )
+        return summary
+
+    def _run_bootstrap_profile(
+        self,
+        profile_name: str,
+        start: date | None,
+        end: date | None,
+        max_workers: int | None,
+    ) -> dict:
         if profile_name == _TRADING_CALENDAR_FULL_HISTORY_PROFILE:
             return self._bootstrap_trading_calendar_full_history(
                 start or _TRADING_CALENDAR_HISTORY_START,
@@ -347,22 +842,176 @@ class ETLService:
             )
         if profile_name == _ETF_AW_SLEEVES_PROFILE:
             return self._bootstrap_etf_aw_sleeves()
-        if profile_name == _ETF_AW_SLEEVE_DAILY_PROFILE:
-            return self._build_etf_aw_sleeve_daily(
-                start or _TRADING_CALENDAR_HISTORY_START,
-                end or date.today(),
-            )
-        if profile_name == _ETF_AW_REBALANCE_SNAPSHOT_PROFILE:
-            return self._build_etf_aw_rebalance_snapshot(
-                start or _TRADING_CALENDAR_HISTORY_START,
-                end or date.today(),
+        if profile_name in _DERIVED_PROFILE_UPSTREAMS:
+            return self._run_derived_build(profile_name, start, end, max_workers)
+        raise KeyError(f"unsupported bootstrap profile: {profile_name}")
+
+    def _run_derived_build(
+        self,
+        profile_name: str,
+        start: date | None,
+        end: date | None,
+        max_workers: int | None = None,
+    ) -> dict:
+        """Build a derived profile, by default only from its first stale month.
+
+        Without ``start`` the window opens at the month holding the earliest
+        upstream change since the profile's last recorded build, or the
+        history start when it has never been built. A build that covered
+        every stale date records the upstream marks it consumed.
+        """
+
+        builders: dict[str, tuple[str, Callable[[date, date], dict]]] = {
+            _ETF_AW_SLEEVE_DAILY_PROFILE: (
+                "derived.etf_aw_sleeve_daily",
+                self._build_etf_aw_sleeve_daily,
+            ),
+            _ETF_AW_REBALANCE_SNAPSHOT_PROFILE: (
+                _ETF_AW_REBALANCE_SNAPSHOT_DATASET,
+                partial(self._build_etf_aw_rebalance_snapshot, max_workers=max_workers),
+            ),
+            _ETF_AW_REGIME_SCORE_PROFILE: (
+                _ETF_AW_REGIME_SCORE_DATASET,
+                partial(self._build_etf_aw_regime_score, max_workers=max_workers),
+            ),
+        }
+        dataset_name, build = builders[profile_name]
+        plan = self._derived_rebuild_plan(profile_name)
+        end = end or date.today()
+        rebuild_mode = "requested"
+        if start is None:
+            rebuild_mode = "incremental"
+            if plan.dirty_start is None:
+                return {
+                    "profile_name": profile_name,
+                    "dataset_name": dataset_name,
+                    "status": RunStatus.SUCCESS.value,
+                    "rebuild_mode": rebuild_mode,
+                    "dirty_start": None,
+                    "requested_start": None,
+                    "requested_end": end.isoformat(),
+                    "records_written": 0,
+                }
+            start = plan.dirty_start.replace(day=1)
+        result = build(start, end)
+        result["rebuild_mode"] = rebuild_mode
+        result["dirty_start"] = (
+            plan.dirty_start.isoformat() if plan.dirty_start is not None else None
+        )
+        if result["status"] == RunStatus.SUCCESS.value:
+            start, end = _ordered_dates(start, end)
+            covered = plan.dirty_start is None or start <= plan.dirty_start
+            self._record_derived_build(
+                profile_name,
+                dataset_name,
+                start,
+                end,
+                plan.upstream_marks if covered else plan.consumed_marks,
             )
-        if profile_name == _ETF_AW_REGIME_SCORE_PROFILE:
-            return self._build_etf_aw_regime_score(
-                start or _TRADING_CALENDAR_HISTORY_START,
-                end or date.today(),
+        return result
+
+    def _derived_rebuild_plan(self, profile_name: str) -> _DerivedRebuildPlan:
+        last = self.conn.execute(
+            """
+            SELECT upstream_marks_json
+            FROM etl_derived_builds
+            WHERE profile_name = ?
+            ORDER BY build_id DESC
+            LIMIT 1
+            """,
+            [profile_name],
+        ).fetchone()
+        consumed: dict[str, str] = json.loads(last[0]) if last else {}
+        marks: dict[str, str] = {}
+        change_starts: list[date] = []
+        for upstream in _DERIVED_PROFILE_UPSTREAMS[profile_name]:
+            seen = consumed.get(upstream)
+            if upstream in _DERIVED_PROFILE_UPSTREAMS:
+                latest_build, change_start = self.conn.execute(
+                    """
+                    SELECT MAX(build_id),
+                           MIN(window_start) FILTER (WHERE build_id > ?)
+                    FROM etl_derived_builds
+                    WHERE profile_name = ?
+                    """,
+                    [int(seen or 0), upstream],
+                ).fetchone()
+                if latest_build is None:
+                    continue
+                marks[upstream] = str(latest_build)
+            else:
+                since = datetime.fromisoformat(seen) if seen else None
+                latest_write, change_start = self._upstream_writes_since(
+                    upstream, since
+                )
+                if latest_write is None:
+                    continue
+                marks[upstream] = latest_write.isoformat()
+                if since is None:
+                    change_start = _TRADING_CALENDAR_HISTORY_START
+            if change_start is not None:
+                change_starts.append(change_start)
+        if last is None:
+            dirty_start: date | None = _TRADING_CALENDAR_HISTORY_START
+        else:
+            dirty_start = min(change_starts) if change_starts else None
+        return _DerivedRebuildPlan(dirty_start, marks, consumed)
+
+    def _upstream_writes_since(
+        self, dataset_name: str, since: datetime | None
+    ) -> tuple[datetime | None, date | None]:
+        """Return a source's last write time and first date written since then.
+
+        Lakehouse datasets are read from the partition manifest, so a backfill
+        or restatement of an old month reports that month's first date. The
+        trading calendar lives in DuckDB and is read from its row timestamps.
+        """
+
+        if dataset_name == "reference.trading_calendar":
+            return self.conn.execute(
+                """
+                SELECT MAX(updated_at),
+                       MIN(trade_date) FILTER (WHERE updated_at > ?)
+                FROM canonical_trading_calendar
+                """,
+                [since or datetime.min],
+            ).fetchone()
+        return self.conn.execute(
+            """
+            SELECT MAX(updated_at),
+                   MIN(min_date) FILTER (WHERE updated_at > ?)
+            FROM lakehouse_partitions
+            WHERE dataset_name = ? AND storage_zone = ?
+            """,
+            [since or datetime.min, dataset_name, StorageZone.NORMALIZED.value],
+        ).fetchone()
+
+    def _record_derived_build(
+        self,
+        profile_name: str,
+        dataset_name: str,
+        start: date,
+        end: date,
+        upstream_marks: dict[str, str],
+    ) -> None:
+        with self._locks.metadata:
+            self.conn.execute(
+                """
+                INSERT INTO etl_derived_builds (
+                    build_id, profile_name, dataset_name, window_start,
+                    window_end, upstream_marks_json, built_at
+                ) VALUES (?, ?, ?, ?, ?, ?, ?)
+                """,
+                [
+                    self._next_id("etl_derived_builds", "build_id"),
+                    profile_name,
+                    dataset_name,
+                    start,
+                    end,
+                    json.dumps(upstream_marks, sort_keys=True),
+                    _utc_now(),
+                ],
             )
-        raise KeyError(f"unsupported bootstrap profile: {profile_name}")
 
     def list_runs(self, dataset_name: str | None = None) -> list[dict]:
         """List ETL run history."""
@@ -400,6 +1049,123 @@ class ETLService:
         ).fetchdf()
         return rows.where(pd.notna(rows), None).to_dict("records")
 
+    def list_run_stages(
+        self,
+        dataset_name: str | None = None,
+        run_id: int | None = None,
+    ) -> list[dict]:
+        """List persisted per-stage metrics of syncs and bootstrap profiles."""
+
+        clauses: list[str] = []
+        params: list[Any] = []
+        if dataset_name is not None:
+            clauses.append("dataset_name = ?")
+            params.append(dataset_name)
+        if run_id is not None:
+            clauses.append("run_id = ?")
+            params.append(run_id)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        rows = self.conn.execute(
+            f"SELECT * FROM etl_run_stages {where} ORDER BY recorded_at DESC, stage_id",
+            params,
+        ).fetchdf()
+        return rows.where(pd.notna(rows), None).to_dict("records")
+
+    def stage_duration_percentiles(
+        self,
+        dataset_name: str | None = None,
+        *,
+        start: date | None = None,
+        end: date | None = None,
+        bucket: str | None = "day",
+    ) -> list[dict]:
+        """Return p50/p95 stage durations per dataset and period.
+
+        ``bucket`` is ``day``, ``week`` or ``month`` to trend percentiles over
+        recorded time, or ``None`` for one row per dataset and stage across
+        the whole inclusive ``start``/``end`` window.
+        """
+
+        if bucket not in _STAGE_PERCENTILE_BUCKETS:
+            raise ValueError(f"unsupported stage percentile bucket: {bucket}")
+        period = (
+            f"CAST(date_trunc('{bucket}', recorded_at) AS DATE)"
+            if bucket is not None
+            else "CAST(NULL AS DATE)"
+        )
+        rows = self.conn.execute(
+            f"""
+            SELECT dataset_name,
+                   stage_name,
+                   {period} AS period_start,
+                   COUNT(*) AS run_count,
+                   quantile_cont(duration_seconds, 0.5) AS p50_seconds,
+                   quantile_cont(duration_seconds, 0.95) AS p95_seconds,
+                   quantile_cont(rows_per_second, 0.5) AS p50_rows_per_second,
+                   SUM(bytes_read) AS bytes_read,
+                   SUM(bytes_written) AS bytes_written,
+                   MAX(peak_rss_mb) AS max_peak_rss_mb
+            FROM etl_run_stages
+            WHERE (CAST(? AS VARCHAR) IS NULL OR dataset_name = ?)
+              AND (CAST(? AS DATE) IS NULL OR CAST(recorded_at AS DATE) >= ?)
+              AND (CAST(? AS DATE) IS NULL OR CAST(recorded_at AS DATE) <= ?)
+            GROUP BY ALL
+            ORDER BY dataset_name, period_start, stage_name
+            """,
+            [dataset_name, dataset_name, start, start, end, end],
+        ).fetchdf()
+        return rows.where(pd.notna(rows), None).to_dict("records")
+
+    def _dataset_dag(self, dataset_names: list[str]) -> dict[str, set[str]]:
+        """Return in-batch upstream datasets for each requested dataset."""
+
+        requested = set(dataset_names)
+        graph: dict[str, set[str]] = {}
+        for dataset_name in dataset_names:
+            definition = self.registry.get_dataset(dataset_name)
+            upstream = set(definition.dependencies) | set(definition.dependency_types)
+            graph[dataset_name] = (upstream & requested) - {dataset_name}
+        resolved: set[str] = set()
+        remaining = dict(graph)
+        while remaining:
+            ready = [name for name, deps in remaining.items() if deps <= resolved]
+            if not ready:
+                raise ValueError(
+                    f"dataset dependency cycle: {', '.join(sorted(remaining))}"
+                )
+            for name in ready:
+                resolved.add(name)
+                del remaining[name]
+        return graph
+
+    def _source_parallelism(self, source_name: str) -> int:
+        adapter = self.source_adapters.get(source_name)
+        if adapter is None:
+            return 1
+        return max(1, int(getattr(adapter, "max_parallelism", 1) or 1))
+
+    def _run_dag_node(
+        self, dataset_name: str, request: IngestionRequest
+    ) -> DatasetSyncResult:
+        worker = self._worker_service()
+        try:
+            return worker.run_dataset_sync(dataset_name, request)
+        finally:
+            worker.conn.close()
+
+    def _worker_service(self) -> ETLService:
+        """Return a service bound to a fresh cursor and this service's caches."""
+
+        worker = ETLService(
+            conn=self.conn.cursor(),
+            registry=self.registry,
+            source_adapters=self.source_adapters.values(),
+            lakehouse_root=self.lakehouse_root,
+            partition_write_mode=self.partition_write_mode,
+        )
+        worker._reference_cache = self._reference_cache
+        return worker
+
     def _source_adapter(self, definition: DatasetDefinition) -> BaseSourceAdapter:
         adapter = self.source_adapters.get(definition.primary_source)
         if adapter is None:
@@ -420,17 +1186,22 @@ class ETLService:
             dependency_type = definition.dependency_types.get(
                 dependency, DependencyType.WINDOW
             )
-            ok = self._dependency_available(
-                definition, dependency, request, dependency_type
-            )
             auto_run_attempted = False
-            if not ok:
-                dep_request = self._dependency_request(definition, dependency, request)
-                auto_run_attempted = True
-                self.run_dataset_sync(dependency, dep_request)
+            # Hold the dependency lock across check and auto-run so concurrent
+            # DAG workers do not backfill the same dependency twice.
+            with self._locks.dataset(dependency):
                 ok = self._dependency_available(
                     definition, dependency, request, dependency_type
                 )
+                if not ok:
+                    dep_request = self._dependency_request(
+                        definition, dependency, request
+                    )
+                    auto_run_attempted = True
+                    self.run_dataset_sync(dependency, dep_request)
+                    ok = self._dependency_available(
+                        definition, dependency, request, dependency_type
+                    )
             if ok and auto_run_attempted:
                 status = ValidationStatus.PASS_WITH_CAVEAT
             elif ok:
@@ -607,15 +1378,18 @@ class ETLService:
         )
 
     def _write_canonical(
-        self, definition: DatasetDefinition, canonical: pd.DataFrame
+        self,
+        definition: DatasetDefinition,
+        canonical: pd.DataFrame,
+        run_id: int | None = None,
     ) -> CanonicalWriteResult:
         if definition.dataset_name == "reference.trading_calendar":
             return self._write_trading_calendar(canonical)
         if definition.dataset_name == "reference.instruments":
             return self._write_instruments(canonical)
         if definition.dataset_name == "market.etf_adj_factor":
-            return self._write_etf_adj_factor(definition, canonical)
-        return self._write_market_daily(definition, canonical)
+            return self._write_etf_adj_factor(definition, canonical, run_id)
+        return self._write_market_daily(definition, canonical, run_id)
 
     def _write_trading_calendar(self, canonical: pd.DataFrame) -> CanonicalWriteResult:
         if canonical.empty:
@@ -641,6 +1415,7 @@ class ETLService:
             FROM stage_b_calendar
             """)
         self.conn.unregister("stage_b_calendar")
+        self._reference_cache.invalidate("canonical_trading_calendar")
         return CanonicalWriteResult(
             records_written=len(frame),
             records_inserted=max(len(frame) - existing, 0),
@@ -673,6 +1448,7 @@ class ETLService:
             FROM stage_b_instruments
             """)
         self.conn.unregister("stage_b_instruments")
+        self._reference_cache.invalidate("canonical_instruments")
         return CanonicalWriteResult(
             records_written=len(frame),
             records_inserted=max(len(frame) - existing, 0),
@@ -680,7 +1456,10 @@ class ETLService:
         )
 
     def _write_market_daily(
-        self, definition: DatasetDefinition, canonical: pd.DataFrame
+        self,
+        definition: DatasetDefinition,
+        canonical: pd.DataFrame,
+        run_id: int | None = None,
     ) -> CanonicalWriteResult:
         return self._write_year_month_partition_upsert(
             dataset_name=definition.dataset_name,
@@ -688,10 +1467,14 @@ class ETLService:
             canonical=canonical,
             key_columns=("instrument_id", "trade_date"),
             sort_columns=("instrument_id", "trade_date", "ingested_at"),
+            run_id=run_id,
         )
 
     def _write_etf_adj_factor(
-        self, definition: DatasetDefinition, canonical: pd.DataFrame
+        self,
+        definition: DatasetDefinition,
+        canonical: pd.DataFrame,
+        run_id: int | None = None,
     ) -> CanonicalWriteResult:
         return self._write_year_month_partition_upsert(
             dataset_name=definition.dataset_name,
@@ -699,6 +1482,7 @@ class ETLService:
             canonical=canonical,
             key_columns=("instrument_id", "trade_date"),
             sort_columns=("instrument_id", "trade_date", "ingested_at"),
+            run_id=run_id,
         )
 
     def _write_year_month_partition_upsert(
@@ -710,32 +1494,62 @@ class ETLService:
         key_columns: tuple[str, ...],
         sort_columns: tuple[str, ...],
         partition_date_column: str = "trade_date",
+        run_id: int | None = None,
     ) -> CanonicalWriteResult:
+        """Upsert rows into year/month partitions.
+
+        In delta mode a run with an id writes only its own rows to a
+        ``part-delta-<run_id>`` file and reads just the key columns of the
+        partition to classify inserts and updates; readers merge the deltas
+        until ``compact_dataset_partitions`` folds them into the base file.
+        """
+
         if canonical.empty:
             return CanonicalWriteResult()
+        delta_mode = (
+            run_id is not None
+            and self._partition_write_mode(dataset_name) == PartitionWriteMode.DELTA
+        )
         frame = canonical.copy()
         frame[partition_date_column] = pd.to_datetime(
             frame[partition_date_column], errors="coerce"
         )
         frame["year"] = frame[partition_date_column].dt.year
         frame["month"] = frame[partition_date_column].dt.month
+        schema_version = self._schema_version(dataset_name)
+        profile = self._write_profile(dataset_name)
         storage_paths: list[str] = []
         partitions_written = 0
+        partitions_unchanged = 0
         records_inserted = 0
         records_updated = 0
+        bytes_read = 0
+        bytes_written = 0
         for (year, month), partition in frame.groupby(["year", "month"], dropna=True):
             parts = [("year", int(year)), ("month", f"{int(month):02d}")]
-            final_path = build_dataset_file_path(
-                dataset_name, zone, parts, lakehouse_root=self.lakehouse_root
+            partition_frame = partition.drop(columns=["year", "month"]).copy()
+            existing = read_dataset_partition(
+                dataset_name,
+                zone,
+                parts,
+                key_columns,
+                lakehouse_root=self.lakehouse_root,
+                columns=key_columns if delta_mode else None,
+            )
+            partition_path = build_partition_path(
+                dataset_name=dataset_name,
+                zone=zone,
+                partition_parts=parts,
+                lakehouse_root=self.lakehouse_root,
+            )
+            bytes_read += sum(
+                path.stat().st_size for path in partition_file_paths(partition_path)
             )
-            partition_frame = partition.drop(columns=["year", "month"]).copy()
-            if final_path.exists():
-                existing = pd.read_parquet(final_path)
-                merged = pd.concat([existing, partition_frame], ignore_index=True)
-                existing_keys = _business_keys(existing, key_columns)
-            else:
+            existing_keys = _business_keys(existing, key_columns)
+            if delta_mode or existing.empty:
                 merged = partition_frame
-                existing_keys = set()
+            else:
+                merged = pd.concat([existing, partition_frame], ignore_index=True)
             partition_keys = _business_keys(partition_frame, key_columns)
             if "trade_date" in merged.columns:
                 merged["trade_date"] = pd.to_datetime(
@@ -761,15 +1575,50 @@ class ETLService:
                 merged["rebalance_date"] = pd.to_datetime(
                     merged["rebalance_date"], errors="coerce"
                 ).dt.date
-            write_result = write_dataset_parquet(
-                merged,
-                dataset_name,
-                zone,
-                parts,
-                lakehouse_root=self.lakehouse_root,
-            )
+            if delta_mode:
+                write_result = write_dataset_delta_parquet(
+                    merged,
+                    dataset_name,
+                    zone,
+                    parts,
+                    run_id,
+                    lakehouse_root=self.lakehouse_root,
+                    conn=self.conn,
+                    schema_version=schema_version,
+                    profile=profile,
+                )
+            else:
+                write_result = write_dataset_parquet(
+                    merged,
+                    dataset_name,
+                    zone,
+                    parts,
+                    lakehouse_root=self.lakehouse_root,
+                    conn=self.conn,
+                    schema_version=schema_version,
+                    profile=profile,
+                )
+                # The rewritten base already holds any earlier delta rows.
+                remove_dataset_files(
+                    list_delta_files(write_result.path.parent),
+                    self.lakehouse_root,
+                    conn=self.conn,
+                )
+            if partition_date_column == "rebalance_date":
+                self._index_rebalance_partition(
+                    dataset_name,
+                    zone,
+                    (int(year), int(month)),
+                    PurePosixPath(write_result.relative_path).parent.as_posix(),
+                    merged,
+                    replace=not delta_mode,
+                )
             storage_paths.append(write_result.relative_path)
-            partitions_written += 1
+            if write_result.unchanged:
+                partitions_unchanged += 1
+            else:
+                partitions_written += 1
+                bytes_written += write_result.path.stat().st_size
             records_inserted += len(partition_keys - existing_keys)
             records_updated += len(partition_keys & existing_keys)
         return CanonicalWriteResult(
@@ -777,8 +1626,279 @@ class ETLService:
             records_inserted=records_inserted,
             records_updated=records_updated,
             partitions_written=partitions_written,
+            partitions_unchanged=partitions_unchanged,
             storage_paths=storage_paths,
+            bytes_read=bytes_read,
+            bytes_written=bytes_written,
+        )
+
+    def _index_rebalance_partition(
+        self,
+        dataset_name: str,
+        zone: StorageZone,
+        year_month: tuple[int, int],
+        partition_path: str,
+        frame: pd.DataFrame,
+        *,
+        replace: bool,
+    ) -> None:
+        """Point the latest index at the rebalance dates of a written partition.
+
+        The first indexed write indexes every cataloged partition from disk,
+        so datasets written before the index existed stay fully covered.
+        """
+
+        with self._locks.metadata:
+            if dataset_is_indexed(self.conn, dataset_name):
+                record_partition_pointers(
+                    self.conn,
+                    dataset_name,
+                    *year_month,
+                    partition_path,
+                    frame,
+                    replace=replace,
+                )
+                return
+            partitions = {
+                (row["partition_year"], row["partition_month"]): row["partition_path"]
+                for row in list_partition_files(self.conn, dataset_name, zone)
+                if row["partition_year"] is not None
+                and row["partition_month"] is not None
+            }
+            for (year, month), path in sorted(partitions.items()):
+                record_partition_pointers(
+                    self.conn,
+                    dataset_name,
+                    year,
+                    month,
+                    path,
+                    read_dataset_partition(
+                        dataset_name,
+                        zone,
+                        [("year", year), ("month", f"{month:02d}")],
+                        (),
+                        lakehouse_root=self.lakehouse_root,
+                    ),
+                )
+
+    def compact_dataset_partitions(self, dataset_name: str) -> dict:
+        """Fold every delta file of one year/month dataset into its base files."""
+
+        definition = self.registry.get_dataset(dataset_name)
+        key_columns = tuple(definition.business_key_columns)
+        if not key_columns:
+            raise ValueError(f"dataset has no business key columns: {dataset_name}")
+        zone = definition.storage_zone
+        storage_paths: list[str] = []
+        deltas_removed = 0
+        with self._locks.dataset(dataset_name):
+            for (year, month), partition_dir in list_month_partitions(
+                dataset_name, zone, lakehouse_root=self.lakehouse_root
+            ):
+                if not list_delta_files(partition_dir):
+                    continue
+                parts = [("year", year), ("month", f"{month:02d}")]
+                compacted = compact_dataset_partition(
+                    dataset_name,
+                    zone,
+                    parts,
+                    key_columns,
+                    lakehouse_root=self.lakehouse_root,
+                    conn=self.conn,
+                    schema_version=definition.canonical_schema_name,
+                    profile=definition.write_profile,
+                )
+                if compacted is None:
+                    continue
+                write_result, removed = compacted
+                storage_paths.append(write_result.relative_path)
+                deltas_removed += removed
+        return {
+            "dataset_name": dataset_name,
+            "status": RunStatus.SUCCESS.value,
+            "partitions_compacted": len(storage_paths),
+            "delta_files_removed": deltas_removed,
+            "storage_paths": storage_paths,
+        }
+
+    def migrate_partition_layout(
+        self, layout: PartitionLayout = PartitionLayout.HIVE
+    ) -> dict:
+        """Rename every registered dataset's partition directories into a layout.
+
+        Raw batch storage paths, manifest rows and latest-index pointers follow
+        the moved files.
+        Datasets already in the layout are left untouched.
+        """
+
+        datasets: list[dict[str, Any]] = []
+        for definition in self.registry.list_datasets():
+            partition_keys = _PARTITION_KEYS.get(definition.partition_strategy or "")
+            if partition_keys is None:
+                continue
+            with self._locks.dataset(definition.dataset_name):
+                for zone in dict.fromkeys([StorageZone.RAW, definition.storage_zone]):
+                    renames = migrate_dataset_layout(
+                        definition.dataset_name,
+                        zone,
+                        layout,
+                        partition_keys,
+                        lakehouse_root=self.lakehouse_root,
+                        conn=self.conn,
+                    )
+                    if not renames:
+                        continue
+                    with self._locks.metadata:
+                        if zone == StorageZone.RAW:
+                            self.conn.executemany(
+                                "UPDATE etl_raw_batches SET storage_path = ? "
+                                "WHERE storage_path = ?",
+                                [[new, old] for old, new in renames.items()],
+                            )
+                        else:
+                            move_partition_pointers(
+                                self.conn,
+                                definition.dataset_name,
+                                {
+                                    PurePosixPath(old).parent.as_posix(): (
+                                        PurePosixPath(new).parent.as_posix()
+                                    )
+                                    for old, new in renames.items()
+                                },
+                            )
+                    datasets.append(
+                        {
+                            "dataset_name": definition.dataset_name,
+                            "storage_zone": zone.value,
+                            "files_moved": len(renames),
+                        }
+                    )
+        return {
+            "layout": layout.value,
+            "status": RunStatus.SUCCESS.value,
+            "datasets": datasets,
+        }
+
+    def list_lakehouse_partitions(self, dataset_name: str | None = None) -> list[dict]:
+        """List partition manifest rows, optionally for one dataset."""
+
+        return list_partition_files(self.conn, dataset_name)
+
+    def _schema_version(self, dataset_name: str) -> str | None:
+        if not self.registry.has_dataset(dataset_name):
+            return None
+        return self.registry.get_dataset(dataset_name).canonical_schema_name
+
+    def _write_profile(self, dataset_name: str) -> ParquetWriteProfile | None:
+        if not self.registry.has_dataset(dataset_name):
+            return None
+        return self.registry.get_dataset(dataset_name).write_profile
+
+    def _partition_write_mode(self, dataset_name: str) -> PartitionWriteMode:
+        if self.partition_write_mode is not None:
+            return self.partition_write_mode
+        if not self.registry.has_dataset(dataset_name):
+            return PartitionWriteMode.REWRITE
+        return self.registry.get_dataset(dataset_name).partition_write_mode
+
+    def _business_key_columns(self, dataset_name: str) -> tuple[str, ...]:
+        if not self.registry.has_dataset(dataset_name):
+            return ()
+        return tuple(self.registry.get_dataset(dataset_name).business_key_columns)
+
+    def _land_raw_batches(
+        self, sync: _WindowSync, batches: Iterable[SourceFetchResult]
+    ) -> None:
+        """Stream source batches into one raw batch file, normalizing per chunk.
+
+        Stores a payload-free fetch summary covering every batch, the
+        concatenated canonical frame, and the chunked validation results on
+        ``sync``.
+        """
+
+        dataset_name = sync.definition.dataset_name
+        raw_batch_id = self._next_id("etl_raw_batches", "raw_batch_id")
+        context = dict(sync.request.context)
+        context.update(
+            {
+                "dataset_name": dataset_name,
+                "source_name": sync.source.source_name,
+                "raw_batch_id": raw_batch_id,
+                "run_id": sync.run_id,
+                "conn": self.conn,
+                "reference_cache": self._reference_cache,
+                "instrument_type": _instrument_type_for_dataset(dataset_name),
+            }
         )
+        normalizer = get_normalizer(dataset_name)
+        validation = ChunkedValidation(get_validator(dataset_name), context)
+        writer: ParquetStreamWriter | None = None
+        first: SourceFetchResult | None = None
+        row_count = 0
+        canonical_chunks: list[pd.DataFrame] = []
+        batch_iterator = iter(batches)
+        try:
+            while True:
+                # Lazy sources do their fetching while the next batch is pulled.
+                with sync.stages.timed("fetch") as fetch:
+                    batch = next(batch_iterator, None)
+                    if batch is not None:
+                        fetch.rows += batch.row_count
+                        fetch.bytes_read += _frame_nbytes(batch.payload)
+                if batch is None:
+                    break
+                self._assert_source_contract(batch)
+                with sync.stages.timed("raw_landing") as landing:
+                    if writer is None:
+                        first = batch
+                        raw_partition = batch.partition_hints or _raw_partition_hints(
+                            dataset_name, sync.request
+                        )
+                        writer = open_raw_parquet_stream(
+                            dataset_name=dataset_name,
+                            partition_parts=raw_partition.items(),
+                            raw_batch_id=raw_batch_id,
+                            lakehouse_root=self.lakehouse_root,
+                        )
+                    writer.write(batch.payload)
+                    landing.rows += batch.row_count
+                row_count += batch.row_count
+                with sync.stages.timed("normalize") as normalize:
+                    canonical_chunk = normalizer.normalize(
+                        batch.payload, context
+                    ).canonical_payload
+                    normalize.rows += len(canonical_chunk)
+                with sync.stages.timed("validate") as validate:
+                    validation.add(canonical_chunk)
+                    validate.rows += len(canonical_chunk)
+                canonical_chunks.append(canonical_chunk)
+            if writer is None or first is None:
+                raise RuntimeError(f"source yielded no batches for {dataset_name}")
+            with sync.stages.timed("raw_landing") as landing:
+                raw_write = writer.close()
+                landing.bytes_written += raw_write.path.stat().st_size
+        except BaseException:
+            if writer is not None:
+                writer.abort()
+            raise
+
+        sync.fetch_result = first.model_copy(
+            update={"payload": first.payload.iloc[0:0], "row_count": row_count}
+        )
+        with sync.stages.timed("raw_landing"):
+            self._insert_raw_batch(
+                raw_batch_id, sync.run_id, sync.fetch_result, raw_write
+            )
+        sync.raw_batch_ids.append(raw_batch_id)
+        non_empty = [chunk for chunk in canonical_chunks if not chunk.empty]
+        with sync.stages.timed("normalize"):
+            sync.canonical = (
+                pd.concat(non_empty, ignore_index=True)
+                if len(non_empty) > 1
+                else (non_empty or canonical_chunks)[0]
+            )
+        with sync.stages.timed("validate"):
+            sync.validation = validation.finish()
 
     def _source_payload_validation(
         self,
@@ -813,21 +1933,86 @@ class ETLService:
             )
         ]
 
+    @contextmanager
+    def _bootstrap_stage(self, stage: str) -> Iterator[_StageMetrics]:
+        """Time a block into the stages of this thread's running bootstrap."""
+
+        stages: _StageTimer | None = getattr(self._bootstrap_local, "stages", None)
+        if stages is None:
+            yield _StageMetrics()
+            return
+        with stages.timed(stage) as metrics:
+            yield metrics
+
+    def _record_run_stages(
+        self,
+        dataset_name: str,
+        stages: _StageTimer,
+        status: RunStatus | str,
+        *,
+        run_id: int | None = None,
+        profile_name: str | None = None,
+        rows: int = 0,
+    ) -> None:
+        """Persist one run's stage metrics followed by a ``total`` stage."""
+
+        total = _StageMetrics()
+        total.seconds = time.perf_counter() - stages.started
+        total.rows = rows
+        total.bytes_read = sum(metrics.bytes_read for metrics in stages.stages.values())
+        total.bytes_written = sum(
+            metrics.bytes_written for metrics in stages.stages.values()
+        )
+        total.peak_rss_mb = max(
+            (
+                metrics.peak_rss_mb
+                for metrics in stages.stages.values()
+                if metrics.peak_rss_mb is not None
+            ),
+            default=None,
+        )
+        named = [*stages.stages.items(), ("total", total)]
+        stage_ids = self._next_ids("etl_run_stages", "stage_id", len(named))
+        status_value = status.value if isinstance(status, RunStatus) else status
+        recorded_at = _utc_now()
+        self.conn.executemany(
+            """
+            INSERT INTO etl_run_stages (
+                stage_id, run_id, profile_name, dataset_name, stage_name, status,
+                duration_seconds, rows_processed, bytes_read, bytes_written,
+                rows_per_second, peak_rss_mb, recorded_at
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            [
+                [
+                    stage_id,
+                    run_id,
+                    profile_name,
+                    dataset_name,
+                    stage_name,
+                    status_value,
+                    metrics.seconds,
+                    metrics.rows,
+                    metrics.bytes_read,
+                    metrics.bytes_written,
+                    metrics.rows_per_second,
+                    metrics.peak_rss_mb,
+                    recorded_at,
+                ]
+                for stage_id, (stage_name, metrics) in zip(stage_ids, named)
+            ],
+        )
+
     def _next_id(self, table: str, column: str) -> int:
+        return self._next_ids(table, column, 1)[0]
+
+    def _next_ids(self, table: str, column: str, count: int) -> list[int]:
+        """Allocate ``count`` ids from one sequence through the shared block pool."""
+
         sequence_name = _ID_SEQUENCES.get((table, column))
         if sequence_name is None:
             raise KeyError(f"no id sequence registered for {table}.{column}")
-        while True:
-            value = int(
-                self.conn.execute("SELECT nextval(?)", [sequence_name]).fetchone()[0]
-            )
-            max_existing = int(
-                self.conn.execute(
-                    f"SELECT COALESCE(MAX({column}), 0) FROM {table}"
-                ).fetchone()[0]
-            )
-            if value > max_existing:
-                return value
+        return db.allocate_stage_b_ids(self.conn, sequence_name, count)
 
     def _insert_run(
         self,
@@ -895,33 +2080,38 @@ class ETLService:
         )
 
     def _persist_validation_results(
-        self, results: list[ValidationResultRecord]
+        self, results: list[ValidationResultRecord] | pd.DataFrame
     ) -> None:
-        for result in results:
-            validation_id = self._next_id("etl_validation_results", "validation_id")
-            self.conn.execute(
-                """
+        """Insert one run's validation results as a single set-based write."""
+
+        frame = validation_results_frame(results).copy()
+        if frame.empty:
+            return
+        frame.insert(
+            0,
+            "validation_id",
+            self._next_ids("etl_validation_results", "validation_id", len(frame)),
+        )
+        for column in ("run_id", "raw_batch_id"):
+            frame[column] = pd.to_numeric(frame[column]).astype("Int64")
+        for column in ("metric_value", "threshold_value"):
+            frame[column] = pd.to_numeric(frame[column]).astype("Float64")
+        frame["created_at"] = pd.to_datetime(frame["created_at"])
+        self.conn.register("stage_b_validation_results", frame)
+        try:
+            self.conn.execute("""
                 INSERT INTO etl_validation_results (
                     validation_id, run_id, raw_batch_id, dataset_name, check_name,
                     check_level, status, subject_key, metric_value,
                     threshold_value, details_json, created_at
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """,
-                [
-                    validation_id,
-                    result.run_id,
-                    result.raw_batch_id,
-                    result.dataset_name,
-                    result.check_name,
-                    result.check_level,
-                    result.status.value,
-                    result.subject_key,
-                    result.metric_value,
-                    result.threshold_value,
-                    result.details_json,
-                    result.created_at,
-                ],
-            )
+                )
+                SELECT validation_id, run_id, raw_batch_id, dataset_name,
+                       check_name, check_level, status, subject_key, metric_value,
+                       threshold_value, details_json, created_at
+                FROM stage_b_validation_results
+                """)
+        finally:
+            self.conn.unregister("stage_b_validation_results")
 
     def _finish_run(
         self,
@@ -1009,6 +2199,8 @@ class ETLService:
         skipped: list[dict[str, Any]] = []
         runs: list[dict[str, Any]] = []
 
+        pending: list[dict[str, Any]] = []
+        requests: list[IngestionRequest] = []
         for window_start, window_end in windows:
             window = {
                 "start": window_start.isoformat(),
@@ -1019,15 +2211,20 @@ class ETLService:
             ):
                 skipped.append(window)
                 continue
-            result = self.run_dataset_sync(
-                "reference.trading_calendar",
+            pending.append(window)
+            requests.append(
                 IngestionRequest(
                     request_start=window_start,
                     request_end=window_end,
                     trigger_mode=TriggerMode.BACKFILL,
                     context={"exchanges": _TRADING_CALENDAR_BOOTSTRAP_EXCHANGES},
-                ),
+                )
             )
+
+        # Windows are disjoint months, so coverage can be planned up front and
+        # the syncs pipelined; loads still land in window order.
+        results = self._run_pipelined_syncs("reference.trading_calendar", requests)
+        for window, result in zip(pending, results):
             run = {
                 **window,
                 "run_id": result.run_id,
@@ -1036,6 +2233,7 @@ class ETLService:
             }
             runs.append(run)
             processed.append(window)
+        for result in results:
             if result.status != RunStatus.SUCCESS:
                 return {
                     "profile_name": _TRADING_CALENDAR_FULL_HISTORY_PROFILE,
@@ -1103,7 +2301,7 @@ class ETLService:
             "dataset_name": "reference.etf_aw_sleeves",
             "status": status,
             "records_written": len(rows),
-            "sleeve_codes": _ETF_AW_SLEEVE_CODES,
+            "sleeve_codes": ETF_AW_SLEEVE_CODES,
             "validation": validation,
         }
 
@@ -1171,6 +2369,7 @@ class ETLService:
                 """)
         finally:
             self.conn.unregister("stage_c_etf_aw_instruments")
+        self._reference_cache.invalidate("canonical_instruments")
 
     def _validate_etf_aw_sleeves(self) -> dict[str, bool]:
         self.conn.register("stage_c_etf_aw_codes", _etf_aw_sleeve_codes_frame())
@@ -1197,7 +2396,7 @@ class ETLService:
         exchanges = {row[0]: row[2] for row in rows}
         notes_present = all(bool(str(row[3] or "").strip()) for row in rows)
         return {
-            "exact_frozen_codes": active_codes == sorted(_ETF_AW_SLEEVE_CODES),
+            "exact_frozen_codes": active_codes == sorted(ETF_AW_SLEEVE_CODES),
             "roles_supported": roles == _ETF_AW_SLEEVE_ROLES,
             "listing_exchange_matches_suffix": all(
                 code.rsplit(".", 1)[-1] == exchange
@@ -1210,15 +2409,16 @@ class ETLService:
     def _build_etf_aw_sleeve_daily(self, start: date, end: date) -> dict:
         start, end = _ordered_dates(start, end)
         self._bootstrap_etf_aw_sleeves()
+        input_start = start - timedelta(days=_ETF_AW_SLEEVE_DAILY_LOOKBACK_DAYS)
         daily = self._read_partitioned_dataset(
             "market.etf_daily",
-            start,
+            input_start,
             end,
             StorageZone.NORMALIZED,
         )
         adj = self._read_partitioned_dataset(
             "market.etf_adj_factor",
-            start,
+            input_start,
             end,
             StorageZone.NORMALIZED,
         )
@@ -1253,7 +2453,9 @@ class ETLService:
                 "error_message": "derived sleeve daily validation failed",
             }
 
-        write_result = self._write_etf_aw_sleeve_daily(panel)
+        with self._bootstrap_stage("write") as write:
+            write_result = self._write_etf_aw_sleeve_daily(panel)
+            write.add_write(write_result)
         return {
             "profile_name": _ETF_AW_SLEEVE_DAILY_PROFILE,
             "dataset_name": "derived.etf_aw_sleeve_daily",
@@ -1264,6 +2466,7 @@ class ETLService:
             "records_inserted": write_result.records_inserted,
             "records_updated": write_result.records_updated,
             "partitions_written": write_result.partitions_written,
+            "partitions_unchanged": write_result.partitions_unchanged,
             "storage_paths": write_result.storage_paths,
             "return_semantics": "adj_pct_chg is adjacent available observation return",
             "validation": validation,
@@ -1276,37 +2479,28 @@ class ETLService:
         end: date,
         zone: StorageZone,
     ) -> pd.DataFrame:
-        frames: list[pd.DataFrame] = []
-        for window_start, _ in _month_windows(start, end):
-            path = build_dataset_file_path(
+        with self._bootstrap_stage("read") as read:
+            table = read_dataset_arrow(
                 dataset_name,
                 zone,
-                [
-                    ("year", window_start.year),
-                    ("month", f"{window_start.month:02d}"),
-                ],
+                self._business_key_columns(dataset_name),
+                start=start,
+                end=end,
+                lakehouse_root=self.lakehouse_root,
+                conn=self.conn,
+            )
+            read.rows += table.num_rows
+            read.bytes_read += window_file_bytes(
+                dataset_name,
+                zone,
+                start=start,
+                end=end,
                 lakehouse_root=self.lakehouse_root,
+                conn=self.conn,
             )
-            if path.exists():
-                frames.append(pd.read_parquet(path))
-        if not frames:
+        if table.num_rows == 0:
             return pd.DataFrame()
-        frame = pd.concat(frames, ignore_index=True)
-        if "trade_date" in frame.columns:
-            frame["trade_date"] = pd.to_datetime(
-                frame["trade_date"], errors="coerce"
-            ).dt.date
-            frame = frame[
-                frame["trade_date"].between(start, end, inclusive="both")
-            ].copy()
-        if "rebalance_date" in frame.columns:
-            frame["rebalance_date"] = pd.to_datetime(
-                frame["rebalance_date"], errors="coerce"
-            ).dt.date
-            frame = frame[
-                frame["rebalance_date"].between(start, end, inclusive="both")
-            ].copy()
-        return frame
+        return table.to_pandas()
 
     def _make_etf_aw_sleeve_daily_frame(
         self,
@@ -1342,17 +2536,17 @@ class ETLService:
             on="instrument_id",
             how="inner",
         )
-        merged = merged[
-            merged["trade_date"].between(start, end, inclusive="both")
-        ].copy()
+        merged = merged[merged["trade_date"] <= end].copy()
         merged = merged.sort_values(["instrument_id", "trade_date"]).reset_index(
             drop=True
         )
         merged["adj_close"] = merged["close"] * merged["adj_factor"]
-        # Return between adjacent available observations after the input merge.
+        # Return between adjacent available observations after the input merge,
+        # taken before trimming so look-back rows seed the first day's return.
         merged["adj_pct_chg"] = (
             merged.groupby("instrument_id")["adj_close"].pct_change() * 100
         )
+        merged = merged[merged["trade_date"] >= start].reset_index(drop=True)
         merged["sleeve_code"] = merged["instrument_id"]
         merged["source_name"] = "derived.market_etf_daily_plus_adj_factor"
         merged["ingested_at"] = _utc_now()
@@ -1389,7 +2583,9 @@ class ETLService:
             sort_columns=("sleeve_code", "trade_date", "ingested_at"),
         )
 
-    def _build_etf_aw_rebalance_snapshot(self, start: date, end: date) -> dict:
+    def _build_etf_aw_rebalance_snapshot(
+        self, start: date, end: date, *, max_workers: int | None = None
+    ) -> dict:
         start, end = _ordered_dates(start, end)
         rebalance = self._read_rebalance_calendar(start, end)
         if rebalance.empty:
@@ -1423,6 +2619,7 @@ class ETLService:
             rebalance=rebalance,
             panel=panel,
             watermarks=self._latest_market_watermarks(),
+            max_workers=max_workers,
         )
         validation = _validate_rebalance_snapshot_frame(
             snapshot, set(rebalance["rebalance_date"].tolist())
@@ -1438,7 +2635,9 @@ class ETLService:
                 "validation": validation,
                 "error_message": "rebalance snapshot validation failed",
             }
-        write_result = self._write_etf_aw_rebalance_snapshot(snapshot)
+        with self._bootstrap_stage("write") as write:
+            write_result = self._write_etf_aw_rebalance_snapshot(snapshot)
+            write.add_write(write_result)
         return {
             "profile_name": _ETF_AW_REBALANCE_SNAPSHOT_PROFILE,
             "dataset_name": _ETF_AW_REBALANCE_SNAPSHOT_DATASET,
@@ -1449,6 +2648,7 @@ class ETLService:
             "records_inserted": write_result.records_inserted,
             "records_updated": write_result.records_updated,
             "partitions_written": write_result.partitions_written,
+            "partitions_unchanged": write_result.partitions_unchanged,
             "storage_paths": write_result.storage_paths,
             "validation": validation,
             "data_status_counts": snapshot["data_status"].value_counts().to_dict(),
@@ -1477,13 +2677,14 @@ class ETLService:
 
     def _latest_market_watermarks(self) -> dict[str, date | None]:
         rows = self.conn.execute("""
-            SELECT dataset_name, latest_fetched_date
+            SELECT dataset_name, MAX(latest_fetched_date)
             FROM etl_source_watermarks
             WHERE dataset_name IN (
                 'market.etf_daily',
                 'market.etf_adj_factor',
                 'reference.trading_calendar'
             )
+            GROUP BY dataset_name
             """).fetchall()
         return {str(row[0]): row[1] for row in rows}
 
@@ -1493,6 +2694,7 @@ class ETLService:
         rebalance: pd.DataFrame,
         panel: pd.DataFrame,
         watermarks: dict[str, date | None],
+        max_workers: int | None = None,
     ) -> pd.DataFrame:
         sleeves = self._active_etf_aw_sleeves_frame()
         panel = panel.copy()
@@ -1503,27 +2705,22 @@ class ETLService:
         panel_max_trade_date = (
             max(panel["trade_date"].dropna().tolist()) if not panel.empty else None
         )
-        rows: list[dict[str, Any]] = []
         ingested_at = _utc_now()
-        for _, rebalance_row in rebalance.iterrows():
-            rebalance_date = rebalance_row["rebalance_date"]
-            for _, sleeve in sleeves.iterrows():
-                rows.append(
-                    self._make_snapshot_row(
-                        rebalance_row=rebalance_row,
-                        sleeve_code=str(sleeve["sleeve_code"]),
-                        sleeve_role=str(sleeve["sleeve_role"]),
-                        sleeve_panel=panel[
-                            panel["sleeve_code"].astype(str)
-                            == str(sleeve["sleeve_code"])
-                        ],
-                        rebalance_date=rebalance_date,
-                        panel_max_trade_date=panel_max_trade_date,
-                        watermarks=watermarks,
-                        ingested_at=ingested_at,
-                    )
-                )
-        return pd.DataFrame(rows)
+        tasks = [
+            (
+                rebalance,
+                str(sleeve["sleeve_code"]),
+                str(sleeve["sleeve_role"]),
+                panel[panel["sleeve_code"].astype(str) == str(sleeve["sleeve_code"])],
+                panel_max_trade_date,
+                watermarks,
+                ingested_at,
+            )
+            for _, sleeve in sleeves.iterrows()
+        ]
+        sleeve_rows = _map_derived_tasks(_sleeve_snapshot_rows, tasks, max_workers)
+        # Keep rows ordered by rebalance date, then sleeve.
+        return pd.DataFrame([row for rows in zip(*sleeve_rows) for row in rows])
 
     def _active_etf_aw_sleeves_frame(self) -> pd.DataFrame:
         self.conn.register("stage_d_etf_aw_codes", _etf_aw_sleeve_codes_frame())
@@ -1542,120 +2739,6 @@ class ETLService:
             return pd.DataFrame(_ETF_AW_SLEEVES).loc[:, ["sleeve_code", "sleeve_role"]]
         return frame
 
-    def _make_snapshot_row(
-        self,
-        *,
-        rebalance_row: pd.Series,
-        sleeve_code: str,
-        sleeve_role: str,
-        sleeve_panel: pd.DataFrame,
-        rebalance_date: date,
-        panel_max_trade_date: date | None,
-        watermarks: dict[str, date | None],
-        ingested_at: datetime,
-    ) -> dict[str, Any]:
-        available = sleeve_panel[sleeve_panel["trade_date"] <= rebalance_date].copy()
-        source_max_trade_date = (
-            max(sleeve_panel["trade_date"].tolist()) if not sleeve_panel.empty else None
-        )
-        target = available[available["trade_date"] == rebalance_date]
-        row = {
-            "calendar_name": str(rebalance_row["calendar_name"]),
-            "calendar_month": str(rebalance_row["calendar_month"]),
-            "rebalance_date": rebalance_date,
-            "effective_date": rebalance_row["effective_date"],
-            "sleeve_code": sleeve_code,
-            "sleeve_role": sleeve_role,
-            "close": None,
-            "adj_factor": None,
-            "adj_close": None,
-            "return_1m": None,
-            "return_3m": None,
-            "return_6m": None,
-            "volatility_3m": None,
-            "max_drawdown_6m": None,
-            "data_status": "missing",
-            "quality_notes": "",
-            "source_max_trade_date": source_max_trade_date,
-            "ingested_at": ingested_at,
-        }
-        notes: dict[str, Any] = {
-            "window_observations": {},
-            "minimum_observations": {
-                key: minimum for key, (_, minimum) in _ETF_AW_SNAPSHOT_WINDOWS.items()
-            },
-            "calculation": "trailing available observations ending at rebalance_date",
-        }
-        core_missing = target.empty
-        if not core_missing:
-            target_row = target.sort_values("trade_date").iloc[-1]
-            row["close"] = _nullable_float(target_row.get("close"))
-            row["adj_factor"] = _nullable_float(target_row.get("adj_factor"))
-            row["adj_close"] = _nullable_float(target_row.get("adj_close"))
-            core_missing = (
-                row["close"] is None
-                or row["adj_factor"] is None
-                or row["adj_factor"] <= 0
-                or row["adj_close"] is None
-                or row["adj_close"] <= 0
-            )
-        stale_sources = [
-            dataset
-            for dataset in (
-                "market.etf_daily",
-                "market.etf_adj_factor",
-                "reference.trading_calendar",
-            )
-            if watermarks.get(dataset) is None or watermarks[dataset] < rebalance_date
-        ]
-        source_lagged = (
-            panel_max_trade_date is None or panel_max_trade_date < rebalance_date
-        )
-        if source_lagged:
-            notes["source_lag"] = {
-                "panel_max_trade_date": (
-                    panel_max_trade_date.isoformat()
-                    if panel_max_trade_date is not None
-                    else None
-                ),
-                "rebalance_date": rebalance_date.isoformat(),
-            }
-        if stale_sources:
-            notes["stale_sources"] = stale_sources
-
-        if stale_sources or source_lagged:
-            row["data_status"] = "stale"
-            if not core_missing:
-                features, partial_reasons = _snapshot_features(available)
-                row.update(features)
-                notes["window_observations"] = {
-                    key: value["observations"] for key, value in partial_reasons.items()
-                }
-                if any(value["partial"] for value in partial_reasons.values()):
-                    notes["partial_features"] = [
-                        key
-                        for key, value in partial_reasons.items()
-                        if value["partial"]
-                    ]
-        elif core_missing:
-            notes["missing_reason"] = "rebalance_date row or core price fields missing"
-            row["data_status"] = "missing"
-        else:
-            features, partial_reasons = _snapshot_features(available)
-            row.update(features)
-            notes["window_observations"] = {
-                key: value["observations"] for key, value in partial_reasons.items()
-            }
-            if any(value["partial"] for value in partial_reasons.values()):
-                row["data_status"] = "partial"
-                notes["partial_features"] = [
-                    key for key, value in partial_reasons.items() if value["partial"]
-                ]
-            else:
-                row["data_status"] = "complete"
-        row["quality_notes"] = json.dumps(notes, sort_keys=True)
-        return row
-
     def _write_etf_aw_rebalance_snapshot(
         self, canonical: pd.DataFrame
     ) -> CanonicalWriteResult:
@@ -1673,7 +2756,9 @@ class ETLService:
             partition_date_column="rebalance_date",
         )
 
-    def _build_etf_aw_regime_score(self, start: date, end: date) -> dict:
+    def _build_etf_aw_regime_score(
+        self, start: date, end: date, *, max_workers: int | None = None
+    ) -> dict:
         start, end = _ordered_dates(start, end)
         snapshot = self._read_partitioned_dataset(
             _ETF_AW_REBALANCE_SNAPSHOT_DATASET,
@@ -1691,7 +2776,7 @@ class ETLService:
                 "records_written": 0,
                 "error_message": "ETF all-weather rebalance snapshot is missing",
             }
-        score = self._make_etf_aw_regime_score_frame(snapshot)
+        score = self._make_etf_aw_regime_score_frame(snapshot, max_workers=max_workers)
         if score.empty:
             return {
                 "profile_name": _ETF_AW_REGIME_SCORE_PROFILE,
@@ -1714,7 +2799,9 @@ class ETLService:
                 "validation": validation,
                 "error_message": "ETF all-weather regime score validation failed",
             }
-        write_result = self._write_etf_aw_regime_score(score)
+        with self._bootstrap_stage("write") as write:
+            write_result = self._write_etf_aw_regime_score(score)
+            write.add_write(write_result)
         return {
             "profile_name": _ETF_AW_REGIME_SCORE_PROFILE,
             "dataset_name": _ETF_AW_REGIME_SCORE_DATASET,
@@ -1725,24 +2812,31 @@ class ETLService:
             "records_inserted": write_result.records_inserted,
             "records_updated": write_result.records_updated,
             "partitions_written": write_result.partitions_written,
+            "partitions_unchanged": write_result.partitions_unchanged,
             "storage_paths": write_result.storage_paths,
             "validation": validation,
             "scoring_status_counts": _value_counts_dict(score["scoring_status"]),
             "label_counts": _value_counts_dict(score["market_regime_label"]),
         }
 
-    def _make_etf_aw_regime_score_frame(self, snapshot: pd.DataFrame) -> pd.DataFrame:
+    def _make_etf_aw_regime_score_frame(
+        self, snapshot: pd.DataFrame, *, max_workers: int | None = None
+    ) -> pd.DataFrame:
         frame = snapshot.copy()
         frame["rebalance_date"] = pd.to_datetime(
             frame["rebalance_date"], errors="coerce"
         ).dt.date
         frame = frame.dropna(subset=["calendar_name", "rebalance_date"])
-        rows: list[dict[str, Any]] = []
         ingested_at = _utc_now()
-        group_columns = ["calendar_name", "rebalance_date"]
-        for _, group in frame.groupby(group_columns, sort=True):
-            rows.append(_regime_score_row(group, ingested_at))
-        return pd.DataFrame(rows)
+        months = pd.to_datetime(frame["rebalance_date"]).dt.strftime("%Y-%m")
+        tasks = [(group, ingested_at) for _, group in frame.groupby(months, sort=True)]
+        month_rows = _map_derived_tasks(_regime_score_rows, tasks, max_workers)
+        score = pd.DataFrame([row for rows in month_rows for row in rows])
+        if score.empty:
+            return score
+        return score.sort_values(
+            ["calendar_name", "rebalance_date"], kind="mergesort"
+        ).reset_index(drop=True)
 
     def _write_etf_aw_regime_score(
         self, canonical: pd.DataFrame
@@ -2073,24 +3167,26 @@ class ETLService:
         )
 
     def _ensure_source_registry(self, source_name: str) -> None:
-        self.conn.execute(
-            "DELETE FROM source_registry WHERE source_name = ?", [source_name]
-        )
-        self.conn.execute(
-            """
-            INSERT INTO source_registry (
-                source_name, source_type, source_role, is_active, base_note, updated_at
-            ) VALUES (?, ?, ?, ?, ?, ?)
-            """,
-            [
-                source_name,
-                "market_data",
-                "primary",
-                True,
-                "Stage B ETL source",
-                _utc_now(),
-            ],
-        )
+        with self._locks.metadata:
+            self.conn.execute(
+                "DELETE FROM source_registry WHERE source_name = ?", [source_name]
+            )
+            self.conn.execute(
+                """
+                INSERT INTO source_registry (
+                    source_name, source_type, source_role, is_active, base_note,
+                    updated_at
+                ) VALUES (?, ?, ?, ?, ?, ?)
+                """,
+                [
+                    source_name,
+                    "market_data",
+                    "primary",
+                    True,
+                    "Stage B ETL source",
+                    _utc_now(),
+                ],
+            )
 
     def _mark_stale_running_runs(self, dataset_name: str) -> None:
         self.conn.execute(
@@ -2223,7 +3319,7 @@ def _business_keys(frame: pd.DataFrame, key_columns: tuple[str, ...]) -> set[tup
 def _etf_aw_sleeve_codes_frame() -> pd.DataFrame:
     """Return the frozen ETF all-weather sleeve universe as a query frame."""
 
-    return pd.DataFrame({"sleeve_code": _ETF_AW_SLEEVE_CODES})
+    return pd.DataFrame({"sleeve_code": ETF_AW_SLEEVE_CODES})
 
 
 def _trading_calendar_exchange_frame(exchanges: Iterable[str]) -> pd.DataFrame:
@@ -2250,51 +3346,266 @@ def _validate_sleeve_daily_frame(frame: pd.DataFrame) -> dict[str, bool]:
         "no_duplicate_business_keys": duplicate_count == 0,
         "adj_factor_present": bool(frame["adj_factor"].notna().all()),
         "adj_close_positive": bool((frame["adj_close"] > 0).all()),
-        "known_frozen_sleeves_only": known_codes.issubset(set(_ETF_AW_SLEEVE_CODES)),
+        "known_frozen_sleeves_only": known_codes.issubset(set(ETF_AW_SLEEVE_CODES)),
     }
 
 
-def _snapshot_features(
-    available: pd.DataFrame,
-) -> tuple[dict[str, float | None], dict[str, dict[str, int | bool]]]:
-    available = available.sort_values("trade_date").copy()
-    features: dict[str, float | None] = {}
-    checks: dict[str, dict[str, int | bool]] = {}
-    for key in ("return_1m", "return_3m", "return_6m"):
-        window, minimum = _ETF_AW_SNAPSHOT_WINDOWS[key]
-        values = available["adj_close"].dropna().astype(float).tail(window + 1)
-        observations = max(len(values) - 1, 0)
-        checks[key] = {
-            "observations": observations,
-            "partial": observations < minimum,
-        }
-        features[key] = (
-            float(values.iloc[-1] / values.iloc[0] - 1)
-            if observations >= minimum and values.iloc[0] > 0
-            else None
+def _map_derived_tasks(
+    function: Callable[..., list[dict[str, Any]]],
+    tasks: list[tuple],
+    max_workers: int | None,
+) -> list[list[dict[str, Any]]]:
+    """Apply ``function`` to each argument tuple, in worker processes if asked.
+
+    Results keep task order. A single worker or task runs in this process.
+    """
+
+    workers = min(max(1, max_workers or 1), len(tasks))
+    if workers <= 1:
+        return [function(*task) for task in tasks]
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=multiprocessing.get_context(_DERIVED_WORKER_START_METHOD),
+    ) as pool:
+        return list(pool.map(function, *zip(*tasks)))
+
+
+def _sleeve_snapshot_rows(
+    rebalance: pd.DataFrame,
+    sleeve_code: str,
+    sleeve_role: str,
+    sleeve_panel: pd.DataFrame,
+    panel_max_trade_date: date | None,
+    watermarks: dict[str, date | None],
+    ingested_at: datetime,
+) -> list[dict[str, Any]]:
+    """Return one sleeve's snapshot rows in rebalance calendar order."""
+
+    sleeve_panel = sleeve_panel.dropna(subset=["trade_date"])
+    rows_by_date = sleeve_panel.drop_duplicates("trade_date", keep="last").set_index(
+        "trade_date", drop=False
+    )
+    source_max_trade_date = rows_by_date.index.max() if not rows_by_date.empty else None
+    features = _sample_snapshot_features(
+        sleeve_panel, rebalance["rebalance_date"].tolist()
+    )
+    rows: list[dict[str, Any]] = []
+    for _, rebalance_row in rebalance.iterrows():
+        rebalance_date = rebalance_row["rebalance_date"]
+        rows.append(
+            _snapshot_row(
+                rebalance_row=rebalance_row,
+                sleeve_code=sleeve_code,
+                sleeve_role=sleeve_role,
+                target_row=(
+                    rows_by_date.loc[rebalance_date]
+                    if rebalance_date in rows_by_date.index
+                    else None
+                ),
+                source_max_trade_date=source_max_trade_date,
+                features=features[rebalance_date],
+                rebalance_date=rebalance_date,
+                panel_max_trade_date=panel_max_trade_date,
+                watermarks=watermarks,
+                ingested_at=ingested_at,
+            )
         )
-    window, minimum = _ETF_AW_SNAPSHOT_WINDOWS["volatility_3m"]
-    returns = available["adj_pct_chg"].dropna().astype(float).tail(window) / 100
-    checks["volatility_3m"] = {
-        "observations": len(returns),
-        "partial": len(returns) < minimum,
+    return rows
+
+
+def _snapshot_row(
+    *,
+    rebalance_row: pd.Series,
+    sleeve_code: str,
+    sleeve_role: str,
+    target_row: pd.Series | None,
+    source_max_trade_date: date | None,
+    features: _SnapshotFeatures,
+    rebalance_date: date,
+    panel_max_trade_date: date | None,
+    watermarks: dict[str, date | None],
+    ingested_at: datetime,
+) -> dict[str, Any]:
+    row = {
+        "calendar_name": str(rebalance_row["calendar_name"]),
+        "calendar_month": str(rebalance_row["calendar_month"]),
+        "rebalance_date": rebalance_date,
+        "effective_date": rebalance_row["effective_date"],
+        "sleeve_code": sleeve_code,
+        "sleeve_role": sleeve_role,
+        "close": None,
+        "adj_factor": None,
+        "adj_close": None,
+        "return_1m": None,
+        "return_3m": None,
+        "return_6m": None,
+        "volatility_3m": None,
+        "max_drawdown_6m": None,
+        "data_status": "missing",
+        "quality_notes": "",
+        "source_max_trade_date": source_max_trade_date,
+        "ingested_at": ingested_at,
     }
-    features["volatility_3m"] = (
-        float(returns.std(ddof=1) * math.sqrt(252)) if len(returns) >= minimum else None
-    )
-    window, minimum = _ETF_AW_SNAPSHOT_WINDOWS["max_drawdown_6m"]
-    values = available["adj_close"].dropna().astype(float).tail(window)
-    checks["max_drawdown_6m"] = {
-        "observations": len(values),
-        "partial": len(values) < minimum,
+    notes: dict[str, Any] = {
+        "window_observations": {},
+        "minimum_observations": {
+            key: minimum for key, (_, minimum) in _ETF_AW_SNAPSHOT_WINDOWS.items()
+        },
+        "calculation": "trailing available observations ending at rebalance_date",
     }
-    if len(values) >= minimum:
-        running_max = values.cummax()
-        drawdown = values / running_max - 1
-        features["max_drawdown_6m"] = float(drawdown.min())
+    core_missing = target_row is None
+    if not core_missing:
+        row["close"] = _nullable_float(target_row.get("close"))
+        row["adj_factor"] = _nullable_float(target_row.get("adj_factor"))
+        row["adj_close"] = _nullable_float(target_row.get("adj_close"))
+        core_missing = (
+            row["close"] is None
+            or row["adj_factor"] is None
+            or row["adj_factor"] <= 0
+            or row["adj_close"] is None
+            or row["adj_close"] <= 0
+        )
+    stale_sources = [
+        dataset
+        for dataset in (
+            "market.etf_daily",
+            "market.etf_adj_factor",
+            "reference.trading_calendar",
+        )
+        if watermarks.get(dataset) is None or watermarks[dataset] < rebalance_date
+    ]
+    source_lagged = (
+        panel_max_trade_date is None or panel_max_trade_date < rebalance_date
+    )
+    if source_lagged:
+        notes["source_lag"] = {
+            "panel_max_trade_date": (
+                panel_max_trade_date.isoformat()
+                if panel_max_trade_date is not None
+                else None
+            ),
+            "rebalance_date": rebalance_date.isoformat(),
+        }
+    if stale_sources:
+        notes["stale_sources"] = stale_sources
+
+    if stale_sources or source_lagged:
+        row["data_status"] = "stale"
+        if not core_missing:
+            feature_values, partial_reasons = features
+            row.update(feature_values)
+            notes["window_observations"] = {
+                key: value["observations"] for key, value in partial_reasons.items()
+            }
+            if any(value["partial"] for value in partial_reasons.values()):
+                notes["partial_features"] = [
+                    key for key, value in partial_reasons.items() if value["partial"]
+                ]
+    elif core_missing:
+        notes["missing_reason"] = "rebalance_date row or core price fields missing"
+        row["data_status"] = "missing"
     else:
-        features["max_drawdown_6m"] = None
-    return features, checks
+        feature_values, partial_reasons = features
+        row.update(feature_values)
+        notes["window_observations"] = {
+            key: value["observations"] for key, value in partial_reasons.items()
+        }
+        if any(value["partial"] for value in partial_reasons.values()):
+            row["data_status"] = "partial"
+            notes["partial_features"] = [
+                key for key, value in partial_reasons.items() if value["partial"]
+            ]
+        else:
+            row["data_status"] = "complete"
+    row["quality_notes"] = json.dumps(notes, sort_keys=True)
+    return row
+
+
+def _sample_snapshot_features(
+    sleeve_panel: pd.DataFrame, rebalance_dates: Iterable[date]
+) -> dict[date, _SnapshotFeatures]:
+    """Return one sleeve's trailing-window features at each rebalance date.
+
+    Rolling windows run once over the sorted history and are then sampled at
+    the last observation on or before every rebalance date.
+    """
+
+    ordered = sleeve_panel.dropna(subset=["trade_date"]).sort_values(
+        "trade_date", kind="mergesort"
+    )
+    closes = ordered.dropna(subset=["adj_close"])
+    close = closes["adj_close"].astype(float).reset_index(drop=True)
+    changes = ordered.dropna(subset=["adj_pct_chg"])
+    change = changes["adj_pct_chg"].astype(float).reset_index(drop=True) / 100
+    sample_dates = pd.to_datetime(pd.Series(list(dict.fromkeys(rebalance_dates))))
+    close_positions = (
+        np.searchsorted(
+            pd.to_datetime(closes["trade_date"]).to_numpy(),
+            sample_dates.to_numpy(),
+            side="right",
+        )
+        - 1
+    )
+    change_positions = (
+        np.searchsorted(
+            pd.to_datetime(changes["trade_date"]).to_numpy(),
+            sample_dates.to_numpy(),
+            side="right",
+        )
+        - 1
+    )
+    rolling: dict[str, pd.Series] = {}
+    for key in ("return_1m", "return_3m", "return_6m"):
+        window, _ = _ETF_AW_SNAPSHOT_WINDOWS[key]
+        first = close.shift(window).fillna(close.iloc[0]) if len(close) else close
+        rolling[key] = (close / first - 1).where(first > 0)
+    volatility_window, _ = _ETF_AW_SNAPSHOT_WINDOWS["volatility_3m"]
+    volatility = change.rolling(volatility_window, min_periods=2).std(ddof=1)
+    rolling["volatility_3m"] = volatility * math.sqrt(252)
+    drawdown_window, _ = _ETF_AW_SNAPSHOT_WINDOWS["max_drawdown_6m"]
+    drawdowns = _trailing_max_drawdowns(
+        close.to_numpy(), close_positions, drawdown_window
+    )
+
+    sampled: dict[date, _SnapshotFeatures] = {}
+    for index, sample_date in enumerate(sample_dates.dt.date):
+        close_count = int(close_positions[index]) + 1
+        change_count = int(change_positions[index]) + 1
+        features: dict[str, float | None] = {}
+        checks: dict[str, dict[str, int | bool]] = {}
+        for key, (key_window, minimum) in _ETF_AW_SNAPSHOT_WINDOWS.items():
+            if key == "volatility_3m":
+                observations = min(change_count, key_window)
+            elif key == "max_drawdown_6m":
+                observations = min(close_count, key_window)
+            else:
+                observations = max(min(close_count, key_window + 1) - 1, 0)
+            checks[key] = {
+                "observations": observations,
+                "partial": observations < minimum,
+            }
+            if observations < minimum:
+                features[key] = None
+            elif key == "max_drawdown_6m":
+                features[key] = float(drawdowns[index])
+            else:
+                count = change_count if key == "volatility_3m" else close_count
+                features[key] = _nullable_float(rolling[key].iloc[count - 1])
+        sampled[sample_date] = (features, checks)
+    return sampled
+
+
+def _trailing_max_drawdowns(
+    values: np.ndarray, positions: np.ndarray, window: int
+) -> np.ndarray:
+    """Return the max drawdown of the ``window`` values ending at each position."""
+
+    if not len(values):
+        return np.full(len(positions), np.nan)
+    # Leading copies of the first value leave every running maximum unchanged.
+    padded = np.concatenate([np.full(window - 1, values[0]), values])
+    windows = sliding_window_view(padded, window)[np.clip(positions, 0, None)]
+    return (windows / np.maximum.accumulate(windows, axis=1) - 1).min(axis=1)
 
 
 def _validate_rebalance_snapshot_frame(
@@ -2342,7 +3653,7 @@ def _validate_rebalance_snapshot_frame(
         "rebalance_dates_from_calendar": set(
             frame["rebalance_date"].dropna().tolist()
         ).issubset(valid_rebalance_dates),
-        "known_frozen_sleeves_only": known_codes.issubset(set(_ETF_AW_SLEEVE_CODES)),
+        "known_frozen_sleeves_only": known_codes.issubset(set(ETF_AW_SLEEVE_CODES)),
         "data_status_allowed": statuses.issubset(_ETF_AW_SNAPSHOT_STATUSES),
         "quality_notes_json": all(
             _is_json_text(value) for value in frame["quality_notes"]
@@ -2351,6 +3662,17 @@ def _validate_rebalance_snapshot_frame(
     }
 
 
+def _regime_score_rows(
+    snapshot: pd.DataFrame, ingested_at: datetime
+) -> list[dict[str, Any]]:
+    """Return one regime score row per calendar and rebalance date."""
+
+    return [
+        _regime_score_row(group, ingested_at)
+        for _, group in snapshot.groupby(["calendar_name", "rebalance_date"], sort=True)
+    ]
+
+
 def _regime_score_row(group: pd.DataFrame, ingested_at: datetime) -> dict[str, Any]:
     ordered = group.sort_values(["sleeve_role", "sleeve_code"]).copy()
     first = ordered.iloc[0]
@@ -2488,7 +3810,7 @@ def _score_value(value: float | None) -> float:
 def _regime_confidence_cap(frame: pd.DataFrame) -> tuple[float, str, list[str]]:
     statuses = set(frame["data_status"].dropna().astype(str).tolist())
     roles = set(frame["sleeve_role"].dropna().astype(str).tolist())
-    if len(frame) < len(_ETF_AW_SLEEVE_CODES) or not _ETF_AW_REQUIRED_ROLES.issubset(
+    if len(frame) < len(ETF_AW_SLEEVE_CODES) or not _ETF_AW_REQUIRED_ROLES.issubset(
         roles
     ):
         return 0.20, "unavailable", ["frozen_sleeve_rows_incomplete"]
@@ -2703,6 +4025,80 @@ def _nullable_float(value: object) -> float | None:
     return number
 
 
+def _frame_nbytes(frame: pd.DataFrame) -> int:
+    """Return a frame's shallow in-memory size, without walking object values."""
+
+    return int(frame.memory_usage(index=False).sum())
+
+
+class _RssSampler:
+    """Sample resident memory on a background thread while blocks are open.
+
+    Each open block keeps the highest resident set size seen since it
+    opened, so a stage reports its own high-water mark rather than the
+    process's lifetime peak. Platforms without ``/proc`` report nothing.
+    """
+
+    def __init__(self, interval: float = 0.02) -> None:
+        self._interval = interval
+        self._lock = threading.Lock()
+        self._peaks: dict[int, int] = {}
+        self._next_token = 0
+        self._thread: threading.Thread | None = None
+
+    def enter(self) -> int | None:
+        """Open a block and return its token, or None when RSS is unknown."""
+
+        rss = _current_rss_bytes()
+        if rss is None:
+            return None
+        with self._lock:
+            token = self._next_token
+            self._next_token += 1
+            self._peaks[token] = rss
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._sample, name="stage-rss-sampler", daemon=True
+                )
+                self._thread.start()
+        return token
+
+    def exit(self, token: int | None) -> float | None:
+        """Close a block and return its sampled peak in MiB."""
+
+        if token is None:
+            return None
+        rss = _current_rss_bytes() or 0
+        with self._lock:
+            peak = max(self._peaks.pop(token), rss)
+        return round(peak / (1024 * 1024), 1)
+
+    def _sample(self) -> None:
+        while True:
+            time.sleep(self._interval)
+            rss = _current_rss_bytes() or 0
+            with self._lock:
+                if not self._peaks:
+                    self._thread = None
+                    return
+                for token, peak in self._peaks.items():
+                    self._peaks[token] = max(peak, rss)
+
+
+_rss_sampler = _RssSampler()
+
+
+def _current_rss_bytes() -> int | None:
+    """Return this process's resident set size, where ``/proc`` reports it."""
+
+    try:
+        with open("/proc/self/statm", "rb") as statm:
+            pages = int(statm.read().split()[1])
+    except (OSError, IndexError, ValueError):
+        return None
+    return pages * mmap.PAGESIZE
+
+
 def _is_json_text(value: object) -> bool:
     if not isinstance(value, str):
         return False
@@ -2721,8 +4117,11 @@ def _instrument_type_for_dataset(dataset_name: str) -> str | None:
     return None
 
 
-def _quality_status(results: list[ValidationResultRecord]) -> str:
-    statuses = {result.status for result in results}
+def _quality_status(results: list[ValidationResultRecord] | pd.DataFrame) -> str:
+    if isinstance(results, pd.DataFrame):
+        statuses = set(results["status"].astype(str))
+    else:
+        statuses = {result.status for result in results}
     if ValidationStatus.WARNING in statuses:
         return ValidationStatus.WARNING.value
     if ValidationStatus.PASS_WITH_CAVEAT in statuses:
@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
+from collections.abc import Iterator
 from enum import StrEnum
 from tradepilot.etl.models import IngestionRequest, SourceFetchResult
 
@@ -20,6 +21,9 @@ class BaseSourceAdapter(ABC):
 
     source_name: str
     source_role: SourceRole
+    # Upper bound on concurrent dataset syncs the DAG executor may run against
+    # this source; adapters backed by rate-limited APIs should keep this small.
+    max_parallelism: int = 1
 
     @abstractmethod
     def supports_dataset(self, dataset_name: str) -> bool:
@@ -32,3 +36,15 @@ class BaseSourceAdapter(ABC):
         """Fetch raw data for one dataset."""
 
         raise NotImplementedError
+
+    def fetch_batches(
+        self, dataset_name: str, request: IngestionRequest
+    ) -> Iterator[SourceFetchResult]:
+        """Yield raw data for one dataset as one or more record batches.
+
+        Every batch shares the lineage fields of a single fetch. The default
+        yields one batch from ``fetch``; adapters that page through large
+        pulls override this to bound memory per batch.
+        """
+
+        yield self.fetch(dataset_name, request)
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+from collections.abc import Iterator
 from datetime import UTC, date, datetime
 from typing import Any
 
@@ -21,6 +22,17 @@ class TushareSourceAdapter(BaseSourceAdapter):
 
     source_name = "tushare"
     source_role = SourceRole.PRIMARY
+    max_parallelism = 2
+
+    # Per-instrument datasets are fetched in groups of this many instruments
+    # when streamed; override per request with context["fetch_batch_size"].
+    _INSTRUMENTS_PER_BATCH = 50
+
+    _PER_INSTRUMENT = {
+        "market.etf_adj_factor",
+        "market.etf_daily",
+        "market.index_daily",
+    }
 
     _SUPPORTED = {
         "reference.trading_calendar",
@@ -30,8 +42,16 @@ class TushareSourceAdapter(BaseSourceAdapter):
         "market.index_daily",
     }
 
-    def __init__(self, client: TushareClient | Any | None = None) -> None:
+    def __init__(
+        self,
+        client: TushareClient | Any | None = None,
+        max_parallelism: int | None = None,
+    ) -> None:
         self._client = client or TushareClient()
+        if max_parallelism is not None:
+            if max_parallelism < 1:
+                raise ValueError("max_parallelism must be positive")
+            self.max_parallelism = max_parallelism
 
     def supports_dataset(self, dataset_name: str) -> bool:
         """Return whether this adapter can fetch one dataset."""
@@ -73,6 +93,26 @@ class TushareSourceAdapter(BaseSourceAdapter):
             is_fallback_source=False,
         )
 
+    def fetch_batches(
+        self, dataset_name: str, request: IngestionRequest
+    ) -> Iterator[SourceFetchResult]:
+        """Yield per-instrument datasets in instrument groups, others whole."""
+
+        instrument_ids = _unique_list(_context_list(request, "instrument_ids"))
+        if dataset_name not in self._PER_INSTRUMENT or not instrument_ids:
+            yield self.fetch(dataset_name, request)
+            return
+        batch_size = max(
+            1,
+            int(request.context.get("fetch_batch_size") or self._INSTRUMENTS_PER_BATCH),
+        )
+        for offset in range(0, len(instrument_ids), batch_size):
+            context = dict(request.context)
+            context["instrument_ids"] = instrument_ids[offset : offset + batch_size]
+            yield self.fetch(
+                dataset_name, request.model_copy(update={"context": context})
+            )
+
     def _fetch_trading_calendar(self, request: IngestionRequest) -> pd.DataFrame:
         start_date, end_date = _date_window(request)
         exchanges = _context_list(request, "exchanges")
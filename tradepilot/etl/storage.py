@@ -3,25 +3,49 @@
 from __future__ import annotations
 
 from collections.abc import Mapping, Sequence
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
+from datetime import date
 import hashlib
 import os
 from pathlib import Path
+import shutil
 
+import duckdb
 import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
 
 from tradepilot.config import (
+    LAKEHOUSE_PARTITION_LAYOUT,
     LAKEHOUSE_ROOT,
     LAKEHOUSE_DERIVED_ROOT,
     LAKEHOUSE_NORMALIZED_ROOT,
     LAKEHOUSE_RAW_ROOT,
 )
-from tradepilot.etl.models import StorageZone
+from tradepilot.etl.manifest import (
+    DATE_RANGE_COLUMNS,
+    PartitionFileEntry,
+    dataset_is_cataloged,
+    delete_partition_files,
+    list_partition_files,
+    upsert_partition_files,
+)
+from tradepilot.etl.models import ParquetWriteProfile, PartitionLayout, StorageZone
 from tradepilot.etl.path_safety import validate_safe_path_component
 
 PartitionValue = str | int
 PartitionParts = Mapping[str, PartitionValue] | Sequence[tuple[str, PartitionValue]]
 
+_BASE_FILE_NAME = "part-00000.parquet"
+_DELTA_FILE_PREFIX = "part-delta-"
+# Parquet footer key holding the hash of the Arrow data a file was written from.
+_CONTENT_HASH_METADATA_KEY = b"tradepilot.content_hash"
+# Per-load lineage columns left out of content hashes, so reloading identical
+# rows keeps the file, and the lineage, of the load that first wrote them.
+_LINEAGE_COLUMNS = frozenset({"ingested_at", "raw_batch_id"})
+_YEAR_MONTH_KEYS = ("year", "month")
+
 
 @dataclass(frozen=True)
 class ParquetWriteResult:
@@ -31,6 +55,7 @@ class ParquetWriteResult:
     relative_path: str
     row_count: int
     content_hash: str
+    unchanged: bool = False
 
 
 def ensure_zone_roots(lakehouse_root: Path | None = None) -> dict[StorageZone, Path]:
@@ -65,11 +90,80 @@ def build_partition_path(
     path = build_zone_path(
         dataset_name=dataset_name, zone=zone, lakehouse_root=lakehouse_root
     )
-    for key, value in _normalize_partition_parts(partition_parts):
-        _validate_partition_key(key)
-        partition_value = _validate_partition_value(value)
-        path = path / partition_value
-    return path
+    layout = dataset_partition_layout(dataset_name, zone, lakehouse_root)
+    return path.joinpath(*_partition_dir_names(partition_parts, layout))
+
+
+def dataset_partition_layout(
+    dataset_name: str,
+    zone: StorageZone,
+    lakehouse_root: Path | None = None,
+) -> PartitionLayout:
+    """Return the layout of a dataset's existing partitions.
+
+    Datasets without partitions yet use ``LAKEHOUSE_PARTITION_LAYOUT``.
+    """
+
+    root = build_zone_path(dataset_name, zone, lakehouse_root=lakehouse_root)
+    if root.is_dir():
+        for child in root.iterdir():
+            if child.is_dir() and not child.name.startswith("."):
+                if "=" in child.name:
+                    return PartitionLayout.HIVE
+                return PartitionLayout.PLAIN
+    return PartitionLayout(LAKEHOUSE_PARTITION_LAYOUT)
+
+
+def list_dataset_partitions(
+    dataset_name: str,
+    zone: StorageZone,
+    partition_keys: Sequence[str] = _YEAR_MONTH_KEYS,
+    lakehouse_root: Path | None = None,
+) -> list[tuple[tuple[str, ...], Path]]:
+    """Return the partition values and directory of every dataset partition.
+
+    Both plain and hive-style directory names are understood. Hive names
+    whose key differs from ``partition_keys`` are skipped.
+    """
+
+    root = build_zone_path(dataset_name, zone, lakehouse_root=lakehouse_root)
+    if not root.is_dir() or not partition_keys:
+        return []
+    partitions: list[tuple[tuple[str, ...], Path]] = []
+    for path in root.glob("/".join(["*"] * len(partition_keys))):
+        if not path.is_dir():
+            continue
+        values = _partition_values(path.relative_to(root).parts, partition_keys)
+        if values is not None:
+            partitions.append((values, path))
+    return sorted(partitions)
+
+
+def list_month_partitions(
+    dataset_name: str,
+    zone: StorageZone,
+    lakehouse_root: Path | None = None,
+    start: date | None = None,
+    end: date | None = None,
+) -> list[tuple[tuple[int, int], Path]]:
+    """Return year/month partitions of a dataset overlapping a window."""
+
+    lower = (start.year, start.month) if start is not None else None
+    upper = (end.year, end.month) if end is not None else None
+    months: list[tuple[tuple[int, int], Path]] = []
+    for (year, month), path in list_dataset_partitions(
+        dataset_name, zone, _YEAR_MONTH_KEYS, lakehouse_root
+    ):
+        try:
+            key = (int(year), int(month))
+        except ValueError:
+            continue
+        if lower is not None and key < lower:
+            continue
+        if upper is not None and key > upper:
+            continue
+        months.append((key, path))
+    return sorted(months)
 
 
 def build_raw_batch_path(
@@ -126,8 +220,142 @@ def build_dataset_file_path(
             partition_parts=partition_parts,
             lakehouse_root=lakehouse_root,
         )
-        / "part-00000.parquet"
+        / _BASE_FILE_NAME
+    )
+
+
+def build_delta_file_path(
+    dataset_name: str,
+    zone: StorageZone,
+    partition_parts: PartitionParts,
+    run_id: int,
+    lakehouse_root: Path | None = None,
+) -> Path:
+    """Return the append-only delta parquet file one run adds to a partition."""
+
+    if run_id <= 0:
+        raise ValueError("run_id must be positive")
+    return (
+        build_partition_path(
+            dataset_name=dataset_name,
+            zone=zone,
+            partition_parts=partition_parts,
+            lakehouse_root=lakehouse_root,
+        )
+        / f"{_DELTA_FILE_PREFIX}{run_id}.parquet"
+    )
+
+
+def list_delta_files(partition_path: Path) -> list[Path]:
+    """Return one partition's delta files ordered by the run that wrote them."""
+
+    if not partition_path.is_dir():
+        return []
+    deltas: list[tuple[int, Path]] = []
+    for path in partition_path.glob(f"{_DELTA_FILE_PREFIX}*.parquet"):
+        try:
+            run_id = int(path.stem.removeprefix(_DELTA_FILE_PREFIX))
+        except ValueError:
+            continue
+        deltas.append((run_id, path))
+    return [path for _, path in sorted(deltas)]
+
+
+def partition_file_paths(partition_path: Path) -> list[Path]:
+    """Return a partition's base file, if present, followed by its deltas."""
+
+    base_path = partition_path / _BASE_FILE_NAME
+    deltas = list_delta_files(partition_path)
+    return [base_path, *deltas] if base_path.exists() else deltas
+
+
+def list_dataset_files(
+    dataset_name: str,
+    zone: StorageZone,
+    lakehouse_root: Path | None = None,
+    start: date | None = None,
+    end: date | None = None,
+) -> list[Path]:
+    """Return base and delta files of year/month partitions overlapping a window.
+
+    Partitions are discovered from the dataset directory in month order, for
+    datasets that the partition manifest does not track yet.
+    """
+
+    return [
+        file_path
+        for _, path in list_month_partitions(
+            dataset_name, zone, lakehouse_root, start, end
+        )
+        for file_path in partition_file_paths(path)
+    ]
+
+
+def partition_has_files(partition_path: Path) -> bool:
+    """Return whether a partition directory holds a base file or any delta."""
+
+    return (partition_path / _BASE_FILE_NAME).exists() or bool(
+        list_delta_files(partition_path)
+    )
+
+
+def stored_content_hash(path: Path) -> str | None:
+    """Return the content hash recorded in a parquet footer, if any."""
+
+    if not path.is_file():
+        return None
+    try:
+        metadata = pq.read_metadata(path).metadata or {}
+    except (OSError, pa.ArrowInvalid):
+        return None
+    value = metadata.get(_CONTENT_HASH_METADATA_KEY)
+    return value.decode() if value is not None else None
+
+
+def read_dataset_partition(
+    dataset_name: str,
+    zone: StorageZone,
+    partition_parts: PartitionParts,
+    key_columns: Sequence[str],
+    lakehouse_root: Path | None = None,
+    columns: Sequence[str] | None = None,
+) -> pd.DataFrame:
+    """Return one partition with its delta files merged over the base file.
+
+    Deltas apply in run order, so the newest row wins for each business key.
+    Partitions without deltas are returned exactly as stored.
+    """
+
+    base_path = build_dataset_file_path(
+        dataset_name=dataset_name,
+        zone=zone,
+        partition_parts=partition_parts,
+        lakehouse_root=lakehouse_root,
     )
+    read_columns = None
+    if columns is not None:
+        read_columns = list(dict.fromkeys([*key_columns, *columns]))
+    frames: list[pd.DataFrame] = []
+    if base_path.exists():
+        frames.append(pd.read_parquet(base_path, columns=read_columns))
+    deltas = list_delta_files(base_path.parent)
+    for path in deltas:
+        frames.append(pd.read_parquet(path, columns=read_columns))
+    if not frames:
+        return pd.DataFrame()
+    if not deltas:
+        merged = frames[0]
+    else:
+        merged = pd.concat(frames, ignore_index=True)
+        if key_columns:
+            merged = (
+                merged.drop_duplicates(list(key_columns), keep="last")
+                .sort_values(list(key_columns))
+                .reset_index(drop=True)
+            )
+    if columns is not None:
+        merged = merged.loc[:, list(columns)]
+    return merged
 
 
 def write_raw_parquet(
@@ -148,20 +376,179 @@ def write_raw_parquet(
     return _write_parquet_atomic(frame, final_path, lakehouse_root=lakehouse_root)
 
 
+class ParquetStreamWriter:
+    """Append DataFrame chunks to one parquet file as separate row groups.
+
+    Chunks go to a same-directory temporary file that replaces the final path
+    only on ``close``; ``abort`` discards it. Column types are unified across
+    chunks: all-null columns are written as strings until a chunk brings real
+    values, and numeric columns widen as later chunks require. When the file
+    schema has to change, the rows written so far are rewritten under it.
+    """
+
+    def __init__(self, final_path: Path, lakehouse_root: Path | None) -> None:
+        self._final_path = final_path
+        self._lakehouse_root = lakehouse_root
+        self._tmp_path = final_path.with_name(f".{final_path.name}.{os.getpid()}.tmp")
+        self._writer: pq.ParquetWriter | None = None
+        self._hasher: _ContentHasher | None = None
+        self._schema: pa.Schema | None = None
+        # Columns that have held only nulls so far, stored as strings.
+        self._placeholders: set[str] = set()
+        self._empty_frame: pd.DataFrame | None = None
+        self._row_count = 0
+
+    def write(self, frame: pd.DataFrame) -> None:
+        """Append one chunk as a row group."""
+
+        if frame.empty:
+            if self._empty_frame is None:
+                self._empty_frame = frame
+            return
+        table = pa.Table.from_pandas(frame, preserve_index=False)
+        if self._writer is None:
+            self._schema = pa.schema([], metadata=table.schema.metadata)
+            self._final_path.parent.mkdir(parents=True, exist_ok=True)
+            self._open(self._unified_schema(table.schema))
+        else:
+            schema = self._unified_schema(table.schema)
+            if not schema.equals(self._schema):
+                self._rewrite(schema)
+        table = _conform_table(table, self._schema)
+        self._writer.write_table(table)
+        self._hasher.update(table)
+        self._row_count += len(frame)
+
+    def _open(self, schema: pa.Schema) -> None:
+        self._schema = schema
+        self._writer = pq.ParquetWriter(self._tmp_path, schema)
+        self._hasher = _ContentHasher()
+
+    def _unified_schema(self, incoming: pa.Schema) -> pa.Schema:
+        """Return the file schema widened to hold ``incoming`` as well."""
+
+        incoming_fields = {field.name: field for field in incoming}
+        fields: list[pa.Field] = []
+        placeholders: set[str] = set()
+        for field in self._schema:
+            other = incoming_fields.pop(field.name, None)
+            if other is None or pa.types.is_null(other.type):
+                fields.append(field)
+                if field.name in self._placeholders:
+                    placeholders.add(field.name)
+            elif field.name in self._placeholders:
+                fields.append(field.with_type(other.type))
+            else:
+                merged = pa.unify_schemas(
+                    [pa.schema([field]), pa.schema([other])],
+                    promote_options="permissive",
+                )
+                fields.append(merged.field(0))
+        for field in incoming_fields.values():
+            if pa.types.is_null(field.type):
+                placeholders.add(field.name)
+                field = field.with_type(pa.string())
+            fields.append(field)
+        self._placeholders = placeholders
+        return pa.schema(fields, metadata=self._schema.metadata)
+
+    def _rewrite(self, schema: pa.Schema) -> None:
+        """Reopen the temporary file under ``schema``, keeping its rows."""
+
+        self._writer.close()
+        written = pq.read_table(self._tmp_path)
+        self._open(schema)
+        if written.num_rows:
+            written = _conform_table(written, schema)
+            self._writer.write_table(written)
+            self._hasher.update(written)
+
+    def close(self) -> ParquetWriteResult:
+        """Finish the file, move it into place, and return its manifest details."""
+
+        if self._writer is None:
+            return _write_parquet_atomic(
+                self._empty_frame if self._empty_frame is not None else pd.DataFrame(),
+                self._final_path,
+                lakehouse_root=self._lakehouse_root,
+            )
+        content_hash = self._hasher.hexdigest()
+        self._writer.add_key_value_metadata(
+            {_CONTENT_HASH_METADATA_KEY: content_hash.encode()}
+        )
+        try:
+            self._writer.close()
+            os.replace(self._tmp_path, self._final_path)
+        finally:
+            if self._tmp_path.exists():
+                self._tmp_path.unlink()
+        return ParquetWriteResult(
+            path=self._final_path,
+            relative_path=_relative_to_lakehouse(
+                self._final_path, self._lakehouse_root
+            ),
+            row_count=self._row_count,
+            content_hash=content_hash,
+        )
+
+    def abort(self) -> None:
+        """Drop everything written so far."""
+
+        if self._writer is not None:
+            self._writer.close()
+        if self._tmp_path.exists():
+            self._tmp_path.unlink()
+
+
+def open_raw_parquet_stream(
+    dataset_name: str,
+    partition_parts: PartitionParts,
+    raw_batch_id: int,
+    lakehouse_root: Path | None = None,
+) -> ParquetStreamWriter:
+    """Return a streaming writer for one immutable raw parquet batch."""
+
+    final_path = build_raw_batch_path(
+        dataset_name=dataset_name,
+        partition_parts=partition_parts,
+        raw_batch_id=raw_batch_id,
+        lakehouse_root=lakehouse_root,
+    )
+    return ParquetStreamWriter(final_path, lakehouse_root=lakehouse_root)
+
+
 def write_normalized_parquet(
     frame: pd.DataFrame,
     dataset_name: str,
     partition_parts: PartitionParts,
     lakehouse_root: Path | None = None,
+    *,
+    conn: duckdb.DuckDBPyConnection | None = None,
+    schema_version: str | None = None,
 ) -> ParquetWriteResult:
-    """Write one normalized partition with tmp-write then atomic replace."""
+    """Write one normalized partition with tmp-write then atomic replace.
+
+    With a connection the file is also recorded in the partition manifest.
+    """
 
     final_path = build_normalized_file_path(
         dataset_name=dataset_name,
         partition_parts=partition_parts,
         lakehouse_root=lakehouse_root,
     )
-    return _write_parquet_atomic(frame, final_path, lakehouse_root=lakehouse_root)
+    result = _write_parquet_atomic(frame, final_path, lakehouse_root=lakehouse_root)
+    if conn is not None:
+        _catalog_write(
+            conn,
+            dataset_name,
+            StorageZone.NORMALIZED,
+            partition_parts,
+            frame,
+            result,
+            schema_version,
+            lakehouse_root,
+        )
+    return result
 
 
 def write_dataset_parquet(
@@ -170,8 +557,17 @@ def write_dataset_parquet(
     zone: StorageZone,
     partition_parts: PartitionParts,
     lakehouse_root: Path | None = None,
+    *,
+    conn: duckdb.DuckDBPyConnection | None = None,
+    schema_version: str | None = None,
+    profile: ParquetWriteProfile | None = None,
 ) -> ParquetWriteResult:
-    """Write one canonical parquet partition in a requested storage zone."""
+    """Write one canonical parquet partition in a requested storage zone.
+
+    A write profile sorts the rows and sets row groups, compression,
+    dictionary columns and bloom filters. With a connection the file is also
+    recorded in the partition manifest.
+    """
 
     final_path = build_dataset_file_path(
         dataset_name=dataset_name,
@@ -179,7 +575,243 @@ def write_dataset_parquet(
         partition_parts=partition_parts,
         lakehouse_root=lakehouse_root,
     )
-    return _write_parquet_atomic(frame, final_path, lakehouse_root=lakehouse_root)
+    result = _write_parquet_atomic(
+        _sort_for_profile(frame, profile),
+        final_path,
+        lakehouse_root=lakehouse_root,
+        profile=profile,
+    )
+    if conn is not None:
+        _catalog_write(
+            conn,
+            dataset_name,
+            zone,
+            partition_parts,
+            frame,
+            result,
+            schema_version,
+            lakehouse_root,
+        )
+    return result
+
+
+def write_dataset_delta_parquet(
+    frame: pd.DataFrame,
+    dataset_name: str,
+    zone: StorageZone,
+    partition_parts: PartitionParts,
+    run_id: int,
+    lakehouse_root: Path | None = None,
+    *,
+    conn: duckdb.DuckDBPyConnection | None = None,
+    schema_version: str | None = None,
+    profile: ParquetWriteProfile | None = None,
+) -> ParquetWriteResult:
+    """Write one run's rows as an append-only delta file next to the base."""
+
+    final_path = build_delta_file_path(
+        dataset_name=dataset_name,
+        zone=zone,
+        partition_parts=partition_parts,
+        run_id=run_id,
+        lakehouse_root=lakehouse_root,
+    )
+    result = _write_parquet_atomic(
+        _sort_for_profile(frame, profile),
+        final_path,
+        lakehouse_root=lakehouse_root,
+        profile=profile,
+    )
+    if conn is not None:
+        _catalog_write(
+            conn,
+            dataset_name,
+            zone,
+            partition_parts,
+            frame,
+            result,
+            schema_version,
+            lakehouse_root,
+        )
+    return result
+
+
+def remove_dataset_files(
+    paths: Sequence[Path],
+    lakehouse_root: Path | None = None,
+    *,
+    conn: duckdb.DuckDBPyConnection | None = None,
+) -> None:
+    """Delete partition files and, with a connection, their manifest rows."""
+
+    for path in paths:
+        path.unlink(missing_ok=True)
+    if conn is not None:
+        delete_partition_files(
+            conn, [_relative_to_lakehouse(path, lakehouse_root) for path in paths]
+        )
+
+
+def catalog_dataset_files(
+    conn: duckdb.DuckDBPyConnection,
+    dataset_name: str,
+    zone: StorageZone,
+    lakehouse_root: Path | None = None,
+    schema_version: str | None = None,
+) -> int:
+    """Record every existing year/month file of a dataset in the manifest.
+
+    Row counts, hashes and date ranges come from parquet footers, so no data
+    pages are read. Returns the number of files recorded.
+    """
+
+    entries: list[PartitionFileEntry] = []
+    for values, partition_path in list_dataset_partitions(
+        dataset_name, zone, _YEAR_MONTH_KEYS, lakehouse_root
+    ):
+        for path in partition_file_paths(partition_path):
+            try:
+                metadata = pq.read_metadata(path)
+            except (OSError, pa.ArrowInvalid):
+                continue
+            min_date, max_date = _footer_date_range(metadata)
+            entries.append(
+                _manifest_entry(
+                    dataset_name,
+                    zone,
+                    list(zip(_YEAR_MONTH_KEYS, values)),
+                    path,
+                    lakehouse_root,
+                    row_count=metadata.num_rows,
+                    min_date=min_date,
+                    max_date=max_date,
+                    schema_version=schema_version,
+                    content_hash=stored_content_hash(path),
+                )
+            )
+    upsert_partition_files(conn, entries)
+    return len(entries)
+
+
+def compact_dataset_partition(
+    dataset_name: str,
+    zone: StorageZone,
+    partition_parts: PartitionParts,
+    key_columns: Sequence[str],
+    lakehouse_root: Path | None = None,
+    *,
+    conn: duckdb.DuckDBPyConnection | None = None,
+    schema_version: str | None = None,
+    profile: ParquetWriteProfile | None = None,
+) -> tuple[ParquetWriteResult, int] | None:
+    """Fold one partition's delta files into its base file.
+
+    The merged base is replaced atomically before any delta is removed, so an
+    interrupted compaction leaves deltas that re-merge to the same rows.
+    Returns the base write and the number of deltas removed, or ``None`` when
+    the partition has no deltas.
+    """
+
+    partition_path = build_partition_path(
+        dataset_name=dataset_name,
+        zone=zone,
+        partition_parts=partition_parts,
+        lakehouse_root=lakehouse_root,
+    )
+    deltas = list_delta_files(partition_path)
+    if not deltas:
+        return None
+    merged = read_dataset_partition(
+        dataset_name,
+        zone,
+        partition_parts,
+        key_columns,
+        lakehouse_root=lakehouse_root,
+    )
+    write_result = write_dataset_parquet(
+        merged,
+        dataset_name,
+        zone,
+        partition_parts,
+        lakehouse_root=lakehouse_root,
+        conn=conn,
+        schema_version=schema_version,
+        profile=profile,
+    )
+    remove_dataset_files(deltas, lakehouse_root, conn=conn)
+    return write_result, len(deltas)
+
+
+def migrate_dataset_layout(
+    dataset_name: str,
+    zone: StorageZone,
+    layout: PartitionLayout,
+    partition_keys: Sequence[str] = _YEAR_MONTH_KEYS,
+    lakehouse_root: Path | None = None,
+    *,
+    conn: duckdb.DuckDBPyConnection | None = None,
+) -> dict[str, str]:
+    """Rename a dataset's partition directories into another layout in place.
+
+    Files are hard-linked into a staged copy of the dataset directory, which
+    is then swapped in with two renames; a swap interrupted between them is
+    finished by the next call. With a connection, manifest rows are rebuilt
+    for the new paths. Returns old to new lakehouse-relative file paths.
+    """
+
+    root = build_zone_path(dataset_name, zone, lakehouse_root=lakehouse_root)
+    staged = root.with_name(f".{root.name}.migrating")
+    previous = root.with_name(f".{root.name}.previous")
+    _recover_layout_swap(root, staged, previous)
+    if not root.is_dir():
+        return {}
+    if dataset_partition_layout(dataset_name, zone, lakehouse_root) == layout:
+        return {}
+    partitions = list_dataset_partitions(
+        dataset_name, zone, partition_keys, lakehouse_root
+    )
+    files = [
+        path
+        for _, partition in partitions
+        for path in partition.iterdir()
+        if path.is_file()
+    ]
+    if sum(1 for path in root.rglob("*") if path.is_file()) != len(files):
+        raise ValueError(
+            f"dataset has files outside {len(partition_keys)}-level partitions: "
+            f"{dataset_name}/{zone.value}"
+        )
+    renames: dict[str, str] = {}
+    try:
+        for values, partition in partitions:
+            names = _partition_dir_names(list(zip(partition_keys, values)), layout)
+            staged.joinpath(*names).mkdir(parents=True)
+            for path in partition.iterdir():
+                if not path.is_file():
+                    continue
+                _link_or_copy(path, staged.joinpath(*names, path.name))
+                renames[_relative_to_lakehouse(path, lakehouse_root)] = (
+                    _relative_to_lakehouse(
+                        root.joinpath(*names, path.name), lakehouse_root
+                    )
+                )
+    except BaseException:
+        shutil.rmtree(staged, ignore_errors=True)
+        raise
+    root.rename(previous)
+    staged.rename(root)
+    shutil.rmtree(previous)
+    if conn is not None and dataset_is_cataloged(conn, dataset_name, zone):
+        rows = list_partition_files(conn, dataset_name, zone)
+        delete_partition_files(conn, [row["file_path"] for row in rows])
+        catalog_dataset_files(
+            conn,
+            dataset_name,
+            zone,
+            lakehouse_root=lakehouse_root,
+            schema_version=rows[0]["schema_version"],
+        )
+    return renames
 
 
 def cleanup_temp_files(dataset_name: str, lakehouse_root: Path | None = None) -> None:
@@ -216,26 +848,263 @@ def _write_parquet_atomic(
     frame: pd.DataFrame,
     final_path: Path,
     lakehouse_root: Path | None,
+    profile: ParquetWriteProfile | None = None,
 ) -> ParquetWriteResult:
-    """Write a parquet file through a same-directory temporary file."""
+    """Write a parquet file through a same-directory temporary file.
+
+    The content hash is taken from the in-memory Arrow table and stored in the
+    file footer. When the existing file already records the same hash, the
+    write is skipped and the result is marked ``unchanged``.
+    """
+
+    table = pa.Table.from_pandas(frame, preserve_index=False)
+    hasher = _ContentHasher()
+    hasher.update(table)
+    content_hash = hasher.hexdigest()
+    result = ParquetWriteResult(
+        path=final_path,
+        relative_path=_relative_to_lakehouse(final_path, lakehouse_root),
+        row_count=len(frame),
+        content_hash=content_hash,
+    )
+    if stored_content_hash(final_path) == content_hash:
+        return replace(result, unchanged=True)
 
+    table = table.replace_schema_metadata(
+        {
+            **(table.schema.metadata or {}),
+            _CONTENT_HASH_METADATA_KEY: content_hash.encode(),
+        }
+    )
     final_path.parent.mkdir(parents=True, exist_ok=True)
     tmp_path = final_path.with_name(f".{final_path.name}.{os.getpid()}.tmp")
     try:
-        frame.to_parquet(tmp_path, index=False)
+        pq.write_table(table, tmp_path, **_profile_write_options(table, profile))
         os.replace(tmp_path, final_path)
     finally:
         if tmp_path.exists():
             tmp_path.unlink()
-    content_hash = _sha256_file(final_path)
-    return ParquetWriteResult(
-        path=final_path,
-        relative_path=_relative_to_lakehouse(final_path, lakehouse_root),
-        row_count=len(frame),
+    return result
+
+
+def _sort_for_profile(
+    frame: pd.DataFrame, profile: ParquetWriteProfile | None
+) -> pd.DataFrame:
+    """Return rows in the profile's sort order, keeping ties in input order."""
+
+    if profile is None:
+        return frame
+    sort_columns = [column for column in profile.sort_columns if column in frame]
+    if not sort_columns:
+        return frame
+    return frame.sort_values(sort_columns, kind="mergesort", ignore_index=True)
+
+
+def _profile_write_options(
+    table: pa.Table, profile: ParquetWriteProfile | None
+) -> dict:
+    """Return ``pq.write_table`` options for a profile's columns in ``table``."""
+
+    if profile is None:
+        return {}
+    names = table.column_names
+    options: dict = {
+        "compression": profile.compression,
+        "compression_level": profile.compression_level,
+        "row_group_size": profile.row_group_size,
+    }
+    if profile.dictionary_columns is not None:
+        options["use_dictionary"] = [
+            column for column in profile.dictionary_columns if column in names
+        ]
+    sort_columns = [column for column in profile.sort_columns if column in names]
+    if sort_columns:
+        options["sorting_columns"] = [
+            pq.SortingColumn(names.index(column)) for column in sort_columns
+        ]
+    bloom_filters = {
+        column: {"ndv": max(pc.count_distinct(table[column]).as_py(), 1)}
+        for column in profile.bloom_filter_columns
+        if column in names
+    }
+    if bloom_filters:
+        options["bloom_filter_options"] = bloom_filters
+    return options
+
+
+def _catalog_write(
+    conn: duckdb.DuckDBPyConnection,
+    dataset_name: str,
+    zone: StorageZone,
+    partition_parts: PartitionParts,
+    frame: pd.DataFrame,
+    result: ParquetWriteResult,
+    schema_version: str | None,
+    lakehouse_root: Path | None,
+) -> None:
+    """Record one written file, cataloging the dataset's older files first."""
+
+    if not dataset_is_cataloged(conn, dataset_name, zone):
+        catalog_dataset_files(
+            conn,
+            dataset_name,
+            zone,
+            lakehouse_root=lakehouse_root,
+            schema_version=schema_version,
+        )
+    min_date, max_date = _frame_date_range(frame)
+    upsert_partition_files(
+        conn,
+        [
+            _manifest_entry(
+                dataset_name,
+                zone,
+                partition_parts,
+                result.path,
+                lakehouse_root,
+                row_count=result.row_count,
+                min_date=min_date,
+                max_date=max_date,
+                schema_version=schema_version,
+                content_hash=result.content_hash,
+            )
+        ],
+    )
+
+
+def _manifest_entry(
+    dataset_name: str,
+    zone: StorageZone,
+    partition_parts: PartitionParts,
+    path: Path,
+    lakehouse_root: Path | None,
+    *,
+    row_count: int,
+    min_date: date | None,
+    max_date: date | None,
+    schema_version: str | None,
+    content_hash: str | None,
+) -> PartitionFileEntry:
+    parts = dict(_normalize_partition_parts(partition_parts))
+    return PartitionFileEntry(
+        file_path=_relative_to_lakehouse(path, lakehouse_root),
+        dataset_name=dataset_name,
+        storage_zone=zone.value,
+        partition_path=_relative_to_lakehouse(path.parent, lakehouse_root),
+        file_kind="delta" if path.name.startswith(_DELTA_FILE_PREFIX) else "base",
+        partition_year=_optional_part_int(parts.get("year")),
+        partition_month=_optional_part_int(parts.get("month")),
+        row_count=row_count,
+        min_date=min_date,
+        max_date=max_date,
+        byte_size=path.stat().st_size,
+        schema_version=schema_version,
         content_hash=content_hash,
     )
 
 
+def _frame_date_range(frame: pd.DataFrame) -> tuple[date | None, date | None]:
+    for column in DATE_RANGE_COLUMNS:
+        if column not in frame.columns:
+            continue
+        dates = pd.to_datetime(frame[column], errors="coerce").dropna()
+        if dates.empty:
+            return None, None
+        return dates.min().date(), dates.max().date()
+    return None, None
+
+
+def _footer_date_range(
+    metadata: pq.FileMetaData,
+) -> tuple[date | None, date | None]:
+    names = metadata.schema.names
+    for column in DATE_RANGE_COLUMNS:
+        if column not in names:
+            continue
+        index = names.index(column)
+        lows: list[date] = []
+        highs: list[date] = []
+        for group in range(metadata.num_row_groups):
+            stats = metadata.row_group(group).column(index).statistics
+            if stats is None or not stats.has_min_max:
+                return None, None
+            low = pd.to_datetime(stats.min, errors="coerce")
+            high = pd.to_datetime(stats.max, errors="coerce")
+            if pd.isna(low) or pd.isna(high):
+                return None, None
+            lows.append(low.date())
+            highs.append(high.date())
+        if not lows:
+            return None, None
+        return min(lows), max(highs)
+    return None, None
+
+
+def _optional_part_int(value: PartitionValue | None) -> int | None:
+    if value is None:
+        return None
+    try:
+        return int(value)
+    except ValueError:
+        return None
+
+
+def _conform_table(table: pa.Table, schema: pa.Schema) -> pa.Table:
+    """Cast a table to ``schema``, filling columns it lacks with nulls."""
+
+    columns = [
+        (
+            table.column(field.name).cast(field.type)
+            if field.name in table.column_names
+            else pa.nulls(table.num_rows, field.type)
+        )
+        for field in schema
+    ]
+    return pa.Table.from_arrays(columns, schema=schema)
+
+
+class _ContentHasher:
+    """SHA-256 over the Arrow IPC stream of the tables fed to it, minus lineage."""
+
+    def __init__(self) -> None:
+        self._sink = _DigestSink()
+        self._stream: pa.ipc.RecordBatchStreamWriter | None = None
+
+    def update(self, table: pa.Table) -> None:
+        table = table.drop_columns(
+            [name for name in table.column_names if name in _LINEAGE_COLUMNS]
+        )
+        if self._stream is None:
+            self._stream = pa.ipc.new_stream(
+                pa.PythonFile(self._sink, mode="w"), table.schema
+            )
+        self._stream.write_table(table)
+
+    def hexdigest(self) -> str:
+        if self._stream is not None:
+            self._stream.close()
+        return self._sink.digest.hexdigest()
+
+
+class _DigestSink:
+    """Write-only file object that feeds bytes into a hash."""
+
+    closed = False
+
+    def __init__(self) -> None:
+        self.digest = hashlib.sha256()
+
+    def write(self, data: bytes) -> int:
+        self.digest.update(data)
+        return len(data)
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        self.closed = True
+
+
 def _relative_to_lakehouse(path: Path, lakehouse_root: Path | None) -> str:
     """Return a POSIX path relative to the lakehouse root."""
 
@@ -243,14 +1112,59 @@ def _relative_to_lakehouse(path: Path, lakehouse_root: Path | None) -> str:
     return path.relative_to(root).as_posix()
 
 
-def _sha256_file(path: Path) -> str:
-    """Return the SHA-256 hash of one file."""
+def _partition_dir_names(
+    partition_parts: PartitionParts, layout: PartitionLayout
+) -> list[str]:
+    """Return validated directory names for partition parts in one layout."""
+
+    names: list[str] = []
+    for key, value in _normalize_partition_parts(partition_parts):
+        _validate_partition_key(key)
+        partition_value = _validate_partition_value(value)
+        if layout == PartitionLayout.HIVE:
+            names.append(f"{key}={partition_value}")
+        else:
+            names.append(partition_value)
+    return names
+
+
+def _partition_values(
+    names: Sequence[str], partition_keys: Sequence[str]
+) -> tuple[str, ...] | None:
+    """Return partition values from plain or hive directory names."""
 
-    digest = hashlib.sha256()
-    with path.open("rb") as handle:
-        for chunk in iter(lambda: handle.read(1024 * 1024), b""):
-            digest.update(chunk)
-    return digest.hexdigest()
+    values: list[str] = []
+    for key, name in zip(partition_keys, names):
+        if name.startswith("."):
+            return None
+        name_key, separator, value = name.partition("=")
+        if not separator:
+            value = name
+        elif name_key != key:
+            return None
+        values.append(value)
+    return tuple(values)
+
+
+def _recover_layout_swap(root: Path, staged: Path, previous: Path) -> None:
+    """Finish or discard a layout migration left behind by a crash."""
+
+    if previous.exists():
+        if not root.exists():
+            (staged if staged.exists() else previous).rename(root)
+        if previous.exists():
+            shutil.rmtree(previous)
+    if staged.exists():
+        shutil.rmtree(staged)
+
+
+def _link_or_copy(source: Path, target: Path) -> None:
+    """Hard-link a file, copying it on filesystems without hard links."""
+
+    try:
+        os.link(source, target)
+    except OSError:
+        shutil.copy2(source, target)
 
 
 def _normalize_partition_parts(
@@ -4,8 +4,10 @@ from __future__ import annotations
 
 from abc import ABC, abstractmethod
 from datetime import UTC, date, datetime, timedelta
+from collections.abc import Callable
 import json
 import re
+import threading
 from typing import Any
 
 import pandas as pd
@@ -22,10 +24,83 @@ class ValidationRuleDefinition(BaseModel):
     description: str | None = None
 
 
+_ResultChunks = list[dict[str, Any] | pd.DataFrame]
+
+_RESULT_COLUMNS = [
+    "run_id",
+    "raw_batch_id",
+    "dataset_name",
+    "check_name",
+    "check_level",
+    "status",
+    "subject_key",
+    "metric_value",
+    "threshold_value",
+    "details_json",
+    "created_at",
+]
+_ROW_RECORD_LIMIT = 50
+
+
+class ReferenceDataCache:
+    """Reference lookups shared by validators across one sync session.
+
+    Entries are keyed by the write generation of their source table. Writers
+    call ``invalidate`` after committing, so a lookup is reloaded only when
+    the table it was read from actually changed.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._generations: dict[str, int] = {}
+        self._entries: dict[str, tuple[int, pd.DataFrame]] = {}
+
+    def generation(self, table_name: str) -> int:
+        """Return the current write generation of one table."""
+
+        with self._lock:
+            return self._generations.get(table_name, 0)
+
+    def invalidate(self, table_name: str) -> None:
+        """Advance one table's generation after a committed write."""
+
+        with self._lock:
+            self._generations[table_name] = self._generations.get(table_name, 0) + 1
+
+    def get(
+        self,
+        key: str,
+        table_name: str,
+        loader: Callable[[], pd.DataFrame],
+    ) -> pd.DataFrame:
+        """Return a cached lookup, loading it when its table generation moved."""
+
+        generation = self.generation(table_name)
+        with self._lock:
+            cached = self._entries.get(key)
+        if cached is not None and cached[0] == generation:
+            return cached[1]
+        frame = loader()
+        with self._lock:
+            # Keep the generation observed before loading so a concurrent
+            # write during the load still forces the next reader to reload.
+            self._entries[key] = (generation, frame)
+        return frame
+
+
 class BaseValidator(ABC):
     """Base interface for dataset validators."""
 
     @abstractmethod
+    def validate_frame(
+        self,
+        payload: pd.DataFrame,
+        context: dict[str, Any] | None = None,
+    ) -> pd.DataFrame:
+        """Validate a payload and return one row per validation result."""
+
+        raise NotImplementedError
+
     def validate(
         self,
         payload: pd.DataFrame,
@@ -33,43 +108,31 @@ class BaseValidator(ABC):
     ) -> list[ValidationResultRecord]:
         """Validate a payload and return structured validation results."""
 
-        raise NotImplementedError
+        return validation_records(self.validate_frame(payload, context))
 
 
 class TradingCalendarValidator(BaseValidator):
     """Validate canonical trading calendar rows."""
 
-    def validate(
+    def validate_frame(
         self,
         payload: pd.DataFrame,
         context: dict[str, Any] | None = None,
-    ) -> list[ValidationResultRecord]:
+    ) -> pd.DataFrame:
         """Validate a trading calendar DataFrame."""
 
         ctx = context or {}
-        results: list[ValidationResultRecord] = []
+        results: _ResultChunks = []
         _required_columns(payload, ["exchange", "trade_date", "is_open"], ctx, results)
         if results:
-            return results
+            return _results_frame(results)
 
-        duplicate_count = int(payload.duplicated(["exchange", "trade_date"]).sum())
-        results.append(
-            _record(
-                ctx,
-                "calendar.duplicate_key",
-                "dataset",
-                ValidationStatus.FAIL if duplicate_count else ValidationStatus.PASS,
-                metric_value=duplicate_count,
-                threshold_value=0,
-                details={
-                    "sample": _sample_keys(
-                        payload[
-                            payload.duplicated(["exchange", "trade_date"], keep=False)
-                        ],
-                        ["exchange", "trade_date"],
-                    )
-                },
-            )
+        _duplicate_check(
+            results,
+            ctx,
+            payload,
+            "calendar.duplicate_key",
+            ["exchange", "trade_date"],
         )
         missing_dates = payload[payload["trade_date"].isna()]
         _row_records(
@@ -115,7 +178,7 @@ class TradingCalendarValidator(BaseValidator):
         )
         _open_day_pretrade_sequence(results, ctx, payload)
         _calendar_date_continuity(results, ctx, payload)
-        return results
+        return _results_frame(results)
 
 
 class InstrumentValidator(BaseValidator):
@@ -123,15 +186,15 @@ class InstrumentValidator(BaseValidator):
 
     _ID_RE = re.compile(r"^\d{6}\.(SH|SZ)$")
 
-    def validate(
+    def validate_frame(
         self,
         payload: pd.DataFrame,
         context: dict[str, Any] | None = None,
-    ) -> list[ValidationResultRecord]:
+    ) -> pd.DataFrame:
         """Validate an instrument metadata DataFrame."""
 
         ctx = context or {}
-        results: list[ValidationResultRecord] = []
+        results: _ResultChunks = []
         _required_columns(
             payload,
             ["instrument_id", "instrument_name", "instrument_type", "exchange"],
@@ -139,7 +202,7 @@ class InstrumentValidator(BaseValidator):
             results,
         )
         if results:
-            return results
+            return _results_frame(results)
 
         _row_records(
             results,
@@ -164,22 +227,12 @@ class InstrumentValidator(BaseValidator):
             ["instrument_id"],
             "instrument_id must match NNNNNN.SH or NNNNNN.SZ",
         )
-        duplicate_count = int(payload.duplicated(["instrument_id"]).sum())
-        results.append(
-            _record(
-                ctx,
-                "instruments.duplicate_instrument_id",
-                "dataset",
-                ValidationStatus.FAIL if duplicate_count else ValidationStatus.PASS,
-                metric_value=duplicate_count,
-                threshold_value=0,
-                details={
-                    "sample": _sample_keys(
-                        payload[payload.duplicated(["instrument_id"], keep=False)],
-                        ["instrument_id"],
-                    )
-                },
-            )
+        _duplicate_check(
+            results,
+            ctx,
+            payload,
+            "instruments.duplicate_instrument_id",
+            ["instrument_id"],
         )
         mismatch = payload[
             payload["instrument_id"].notna()
@@ -241,47 +294,33 @@ class InstrumentValidator(BaseValidator):
             ["instrument_id"],
             "is_active must be boolean",
         )
-        return results
+        return _results_frame(results)
 
 
 class MarketDailyValidator(BaseValidator):
     """Validate canonical market daily rows."""
 
-    def validate(
+    def validate_frame(
         self,
         payload: pd.DataFrame,
         context: dict[str, Any] | None = None,
-    ) -> list[ValidationResultRecord]:
+    ) -> pd.DataFrame:
         """Validate ETF or index daily market rows."""
 
         ctx = context or {}
-        results: list[ValidationResultRecord] = []
+        results: _ResultChunks = []
         _required_columns(
             payload, ["instrument_id", "trade_date", "close"], ctx, results
         )
         if results:
-            return results
+            return _results_frame(results)
 
-        duplicate_count = int(payload.duplicated(["instrument_id", "trade_date"]).sum())
-        results.append(
-            _record(
-                ctx,
-                "market_daily.duplicate_business_key",
-                "dataset",
-                ValidationStatus.FAIL if duplicate_count else ValidationStatus.PASS,
-                metric_value=duplicate_count,
-                threshold_value=0,
-                details={
-                    "sample": _sample_keys(
-                        payload[
-                            payload.duplicated(
-                                ["instrument_id", "trade_date"], keep=False
-                            )
-                        ],
-                        ["instrument_id", "trade_date"],
-                    )
-                },
-            )
+        _duplicate_check(
+            results,
+            ctx,
+            payload,
+            "market_daily.duplicate_business_key",
+            ["instrument_id", "trade_date"],
         )
         instruments = _instrument_lookup(ctx)
         if instruments is not None:
@@ -405,47 +444,33 @@ class MarketDailyValidator(BaseValidator):
         )
         _market_daily_change_consistency(results, ctx, payload)
         _market_daily_pct_chg_consistency(results, ctx, payload)
-        return results
+        return _results_frame(results)
 
 
 class EtfAdjFactorValidator(BaseValidator):
     """Validate canonical ETF adjustment factor rows."""
 
-    def validate(
+    def validate_frame(
         self,
         payload: pd.DataFrame,
         context: dict[str, Any] | None = None,
-    ) -> list[ValidationResultRecord]:
+    ) -> pd.DataFrame:
         """Validate ETF adjustment factors."""
 
         ctx = context or {}
-        results: list[ValidationResultRecord] = []
+        results: _ResultChunks = []
         _required_columns(
             payload, ["instrument_id", "trade_date", "adj_factor"], ctx, results
         )
         if results:
-            return results
+            return _results_frame(results)
 
-        duplicate_count = int(payload.duplicated(["instrument_id", "trade_date"]).sum())
-        results.append(
-            _record(
-                ctx,
-                "etf_adj_factor.duplicate_business_key",
-                "dataset",
-                ValidationStatus.FAIL if duplicate_count else ValidationStatus.PASS,
-                metric_value=duplicate_count,
-                threshold_value=0,
-                details={
-                    "sample": _sample_keys(
-                        payload[
-                            payload.duplicated(
-                                ["instrument_id", "trade_date"], keep=False
-                            )
-                        ],
-                        ["instrument_id", "trade_date"],
-                    )
-                },
-            )
+        _duplicate_check(
+            results,
+            ctx,
+            payload,
+            "etf_adj_factor.duplicate_business_key",
+            ["instrument_id", "trade_date"],
         )
         _row_records(
             results,
@@ -496,7 +521,122 @@ class EtfAdjFactorValidator(BaseValidator):
                 ["instrument_id", "trade_date"],
                 "instrument must exist as an ETF in canonical_instruments",
             )
-        return results
+        return _results_frame(results)
+
+
+class ChunkedValidation:
+    """Validate a payload that arrives in chunks with whole-payload results.
+
+    Row-level checks accumulate flagged keys and counts per check, while
+    cross-row checks such as duplicate keys and calendar continuity keep only
+    the columns they need and run once in ``finish``.
+    """
+
+    def __init__(
+        self, validator: BaseValidator, context: dict[str, Any] | None = None
+    ) -> None:
+        self._validator = validator
+        self._state = _ChunkState()
+        self._context = dict(context or {})
+        self._context["chunk_state"] = self._state
+        self._immediate: list[pd.DataFrame] = []
+
+    def add(self, chunk: pd.DataFrame) -> None:
+        """Validate one chunk, deferring results that depend on other chunks."""
+
+        frame = self._validator.validate_frame(chunk, self._context)
+        if not frame.empty:
+            self._immediate.append(frame)
+
+    def finish(self) -> pd.DataFrame:
+        """Return the validation results for every chunk added so far."""
+
+        context = {
+            key: value for key, value in self._context.items() if key != "chunk_state"
+        }
+        results: _ResultChunks = []
+        if self._immediate:
+            # Contract failures repeat for every chunk missing the same columns.
+            results.append(
+                pd.concat(self._immediate, ignore_index=True).drop_duplicates(
+                    ["check_name", "check_level", "status", "details_json"]
+                )
+            )
+        self._state.emit(results, context)
+        return _results_frame(results)
+
+
+class _ChunkState:
+    """Per-check accumulators behind ``ChunkedValidation``."""
+
+    def __init__(self) -> None:
+        self._slots: dict[str, dict[str, Any]] = {}
+
+    def add_rows(
+        self,
+        check_name: str,
+        frame: pd.DataFrame,
+        key_columns: list[str],
+        message: str,
+        status: ValidationStatus,
+        threshold_value: float | None,
+    ) -> None:
+        slot = self._slots.setdefault(
+            check_name,
+            {
+                "kind": "rows",
+                "frames": [],
+                "kept": 0,
+                "total": 0,
+                "key_columns": key_columns,
+                "message": message,
+                "status": status,
+                "threshold_value": threshold_value,
+            },
+        )
+        slot["total"] += len(frame)
+        room = _ROW_RECORD_LIMIT - slot["kept"]
+        if room > 0 and not frame.empty:
+            kept = frame.head(room).loc[
+                :, [column for column in key_columns if column in frame.columns]
+            ]
+            slot["frames"].append(kept)
+            slot["kept"] += len(kept)
+
+    def defer(
+        self,
+        name: str,
+        frame: pd.DataFrame,
+        check: Callable[[_ResultChunks, dict[str, Any], pd.DataFrame], None],
+    ) -> None:
+        slot = self._slots.setdefault(
+            name, {"kind": "deferred", "frames": [], "check": check}
+        )
+        slot["frames"].append(frame)
+
+    def emit(self, results: _ResultChunks, context: dict[str, Any]) -> None:
+        for check_name, slot in self._slots.items():
+            non_empty = [frame for frame in slot["frames"] if not frame.empty]
+            if non_empty:
+                combined = pd.concat(non_empty, ignore_index=True)
+            elif slot["frames"]:
+                combined = slot["frames"][0]
+            else:
+                combined = pd.DataFrame()
+            if slot["kind"] == "deferred":
+                slot["check"](results, context, combined)
+                continue
+            _append_row_results(
+                results,
+                context,
+                combined,
+                slot["total"],
+                check_name,
+                slot["key_columns"],
+                slot["message"],
+                slot["status"],
+                slot["threshold_value"],
+            )
 
 
 def get_validator(dataset_name: str) -> BaseValidator:
@@ -513,18 +653,27 @@ def get_validator(dataset_name: str) -> BaseValidator:
     raise KeyError(f"no validator registered for dataset: {dataset_name}")
 
 
-def has_blocking_failures(results: list[ValidationResultRecord]) -> bool:
+def has_blocking_failures(
+    results: list[ValidationResultRecord] | pd.DataFrame,
+) -> bool:
     """Return whether validation results contain a blocking status."""
 
-    return any(
-        result.status in {ValidationStatus.FAIL, ValidationStatus.DEFER}
-        for result in results
-    )
+    blocking = {ValidationStatus.FAIL.value, ValidationStatus.DEFER.value}
+    if isinstance(results, pd.DataFrame):
+        return bool(results["status"].isin(blocking).any()) if len(results) else False
+    return any(result.status in blocking for result in results)
 
 
-def validation_counts(results: list[ValidationResultRecord]) -> dict[str, int]:
+def validation_counts(
+    results: list[ValidationResultRecord] | pd.DataFrame,
+) -> dict[str, int]:
     """Count validation results by status."""
 
+    if isinstance(results, pd.DataFrame):
+        if results.empty:
+            return {}
+        counts = results["status"].astype(str).value_counts(sort=False)
+        return {str(status): int(count) for status, count in counts.items()}
     counts: dict[str, int] = {}
     for result in results:
         key = result.status.value
@@ -532,11 +681,62 @@ def validation_counts(results: list[ValidationResultRecord]) -> dict[str, int]:
     return counts
 
 
+def validation_results_frame(
+    results: list[ValidationResultRecord] | pd.DataFrame,
+) -> pd.DataFrame:
+    """Return validation results in the columnar result layout."""
+
+    if isinstance(results, pd.DataFrame):
+        return results.loc[:, _RESULT_COLUMNS] if len(results) else _empty_results()
+    if not results:
+        return _empty_results()
+    frame = pd.DataFrame([result.model_dump() for result in results])
+    frame["status"] = frame["status"].map(lambda status: ValidationStatus(status).value)
+    return frame.loc[:, _RESULT_COLUMNS]
+
+
+def validation_records(frame: pd.DataFrame) -> list[ValidationResultRecord]:
+    """Convert columnar validation results into API records."""
+
+    if frame.empty:
+        return []
+    values = frame.loc[:, _RESULT_COLUMNS].astype(object)
+    values = values.where(values.notna(), None)
+    return [
+        ValidationResultRecord(validation_id=0, **row)
+        for row in values.to_dict(orient="records")
+    ]
+
+
+def _results_frame(results: _ResultChunks) -> pd.DataFrame:
+    """Concatenate dataset-level rows and row-level chunks in check order."""
+
+    frames: list[pd.DataFrame] = []
+    pending: list[dict[str, Any]] = []
+    for chunk in results:
+        if isinstance(chunk, dict):
+            pending.append(chunk)
+            continue
+        if pending:
+            frames.append(pd.DataFrame(pending, columns=_RESULT_COLUMNS))
+            pending = []
+        frames.append(chunk)
+    if pending:
+        frames.append(pd.DataFrame(pending, columns=_RESULT_COLUMNS))
+    if not frames:
+        return _empty_results()
+    return pd.concat(frames, ignore_index=True).loc[:, _RESULT_COLUMNS]
+
+
+def _empty_results() -> pd.DataFrame:
+    return pd.DataFrame(columns=_RESULT_COLUMNS)
+
+
 def _required_columns(
     payload: pd.DataFrame,
     columns: list[str],
     context: dict[str, Any],
-    results: list[ValidationResultRecord],
+    results: _ResultChunks,
 ) -> None:
     """Append a contract failure if required columns are missing."""
 
@@ -555,7 +755,7 @@ def _required_columns(
 
 
 def _row_records(
-    results: list[ValidationResultRecord],
+    results: _ResultChunks,
     context: dict[str, Any],
     frame: pd.DataFrame,
     check_name: str,
@@ -564,38 +764,124 @@ def _row_records(
     status: ValidationStatus = ValidationStatus.FAIL,
     threshold_value: float | None = None,
 ) -> None:
-    """Append row-level records or one pass record for a check."""
+    """Append row-level results as one chunk, or one pass record for a check."""
 
-    if frame.empty:
+    state = context.get("chunk_state")
+    if isinstance(state, _ChunkState):
+        state.add_rows(check_name, frame, key_columns, message, status, threshold_value)
+        return
+    _append_row_results(
+        results,
+        context,
+        frame.head(_ROW_RECORD_LIMIT),
+        len(frame),
+        check_name,
+        key_columns,
+        message,
+        status,
+        threshold_value,
+    )
+
+
+def _append_row_results(
+    results: _ResultChunks,
+    context: dict[str, Any],
+    flagged: pd.DataFrame,
+    total: int,
+    check_name: str,
+    key_columns: list[str],
+    message: str,
+    status: ValidationStatus,
+    threshold_value: float | None,
+) -> None:
+    if total == 0:
         results.append(_record(context, check_name, "row", ValidationStatus.PASS))
         return
-    for _, row in frame.head(50).iterrows():
-        results.append(
-            _record(
-                context,
-                check_name,
-                "row",
-                status,
-                subject_key=_subject_key(row, key_columns),
-                metric_value=None,
-                threshold_value=threshold_value,
-                details={"message": message},
-            )
-        )
-    if len(frame) > 50:
+    chunk = pd.DataFrame(
+        {
+            "run_id": int(context.get("run_id", 0) or 0),
+            "raw_batch_id": context.get("raw_batch_id"),
+            "dataset_name": str(context.get("dataset_name", "")),
+            "check_name": check_name,
+            "check_level": "row",
+            "status": status.value,
+            "subject_key": _subject_keys(flagged, key_columns).to_numpy(),
+            "metric_value": None,
+            "threshold_value": (
+                float(threshold_value) if threshold_value is not None else None
+            ),
+            "details_json": json.dumps({"message": message}, ensure_ascii=False),
+            "created_at": _utc_now(),
+        },
+        index=range(len(flagged)),
+    )
+    results.append(chunk)
+    if total > _ROW_RECORD_LIMIT:
         results.append(
             _record(
                 context,
                 check_name,
                 "row",
                 status,
-                metric_value=float(len(frame)),
+                metric_value=float(total),
                 threshold_value=threshold_value,
                 details={"message": message, "truncated": True},
             )
         )
 
 
+def _duplicate_check(
+    results: _ResultChunks,
+    context: dict[str, Any],
+    payload: pd.DataFrame,
+    check_name: str,
+    key_columns: list[str],
+) -> None:
+    """Append one dataset-level duplicate business key result."""
+
+    if _deferred(
+        context,
+        check_name,
+        payload.loc[:, key_columns],
+        lambda chunk_results, chunk_context, frame: _duplicate_check(
+            chunk_results, chunk_context, frame, check_name, key_columns
+        ),
+    ):
+        return
+    duplicate_count = int(payload.duplicated(key_columns).sum())
+    results.append(
+        _record(
+            context,
+            check_name,
+            "dataset",
+            ValidationStatus.FAIL if duplicate_count else ValidationStatus.PASS,
+            metric_value=duplicate_count,
+            threshold_value=0,
+            details={
+                "sample": _sample_keys(
+                    payload[payload.duplicated(key_columns, keep=False)],
+                    key_columns,
+                )
+            },
+        )
+    )
+
+
+def _deferred(
+    context: dict[str, Any],
+    name: str,
+    frame: pd.DataFrame,
+    check: Callable[[_ResultChunks, dict[str, Any], pd.DataFrame], None],
+) -> bool:
+    """Hand a cross-row check to the chunk state when validating in chunks."""
+
+    state = context.get("chunk_state")
+    if not isinstance(state, _ChunkState):
+        return False
+    state.defer(name, frame, check)
+    return True
+
+
 def _record(
     context: dict[str, Any],
     check_name: str,
@@ -605,36 +891,50 @@ def _record(
     metric_value: float | int | None = None,
     threshold_value: float | int | None = None,
     details: dict[str, Any] | None = None,
-) -> ValidationResultRecord:
-    """Build one validation result with service-filled validation id."""
-
-    return ValidationResultRecord(
-        validation_id=int(context.get("validation_id", 0) or 0),
-        run_id=int(context.get("run_id", 0) or 0),
-        raw_batch_id=context.get("raw_batch_id"),
-        dataset_name=str(context.get("dataset_name", "")),
-        check_name=check_name,
-        check_level=level,
-        status=status,
-        subject_key=subject_key,
-        metric_value=float(metric_value) if metric_value is not None else None,
-        threshold_value=float(threshold_value) if threshold_value is not None else None,
-        details_json=json.dumps(details or {}, default=str, ensure_ascii=False),
-        created_at=_utc_now(),
-    )
+) -> dict[str, Any]:
+    """Build one validation result row; the service fills the validation id."""
+
+    return {
+        "run_id": int(context.get("run_id", 0) or 0),
+        "raw_batch_id": context.get("raw_batch_id"),
+        "dataset_name": str(context.get("dataset_name", "")),
+        "check_name": check_name,
+        "check_level": level,
+        "status": status.value,
+        "subject_key": subject_key,
+        "metric_value": float(metric_value) if metric_value is not None else None,
+        "threshold_value": (
+            float(threshold_value) if threshold_value is not None else None
+        ),
+        "details_json": json.dumps(details or {}, default=str, ensure_ascii=False),
+        "created_at": _utc_now(),
+    }
+
+
+def _subject_keys(frame: pd.DataFrame, columns: list[str]) -> pd.Series:
+    """Build stable ``a|b`` subject keys for every row with string ops."""
+
+    parts = [
+        (
+            _key_text(frame[column])
+            if column in frame.columns
+            else pd.Series("", index=frame.index)
+        )
+        for column in columns
+    ]
+    if not parts:
+        return pd.Series("", index=frame.index)
+    return parts[0].str.cat(parts[1:], sep="|")
 
 
-def _subject_key(row: pd.Series, columns: list[str]) -> str:
-    """Build a stable subject key from row values."""
+def _key_text(series: pd.Series) -> pd.Series:
+    """Render one key column the way ``isoformat``/``str`` would per value."""
 
-    values = []
-    for column in columns:
-        value = row.get(column)
-        if isinstance(value, (datetime, date)):
-            values.append(value.isoformat())
-        else:
-            values.append("" if pd.isna(value) else str(value))
-    return "|".join(values)
+    if pd.api.types.is_datetime64_any_dtype(series):
+        text = series.dt.strftime("%Y-%m-%dT%H:%M:%S")
+    else:
+        text = series.astype(str)
+    return text.where(series.notna(), "").astype(str)
 
 
 def _sample_keys(frame: pd.DataFrame, columns: list[str]) -> list[str]:
@@ -642,34 +942,52 @@ def _sample_keys(frame: pd.DataFrame, columns: list[str]) -> list[str]:
 
     if frame.empty:
         return []
-    return [_subject_key(row, columns) for _, row in frame.head(10).iterrows()]
+    return _subject_keys(frame.head(10), columns).tolist()
 
 
 def _instrument_lookup(context: dict[str, Any]) -> pd.DataFrame | None:
-    """Return canonical instruments from context or DuckDB."""
+    """Return canonical instruments from context, the session cache, or DuckDB."""
 
     if isinstance(context.get("canonical_instruments"), pd.DataFrame):
         return context["canonical_instruments"]
     conn = context.get("conn")
     if conn is None:
         return None
-    return conn.execute(
-        "SELECT instrument_id, instrument_type, exchange FROM canonical_instruments"
-    ).fetchdf()
+
+    def load() -> pd.DataFrame:
+        return conn.execute(
+            "SELECT instrument_id, instrument_type, exchange FROM canonical_instruments"
+        ).fetchdf()
+
+    cache = context.get("reference_cache")
+    if isinstance(cache, ReferenceDataCache):
+        return cache.get("instruments", "canonical_instruments", load)
+    return load()
 
 
 def _open_day_lookup(context: dict[str, Any]) -> pd.DataFrame | None:
-    """Return open trading days from context or DuckDB."""
+    """Return open trading days from context, the session cache, or DuckDB."""
 
     if isinstance(context.get("canonical_trading_calendar"), pd.DataFrame):
-        frame = context["canonical_trading_calendar"]
-    else:
-        conn = context.get("conn")
-        if conn is None:
-            return None
-        frame = conn.execute(
-            "SELECT exchange, trade_date FROM canonical_trading_calendar WHERE is_open = TRUE"
-        ).fetchdf()
+        return _parse_open_days(context["canonical_trading_calendar"])
+    conn = context.get("conn")
+    if conn is None:
+        return None
+
+    def load() -> pd.DataFrame:
+        return _parse_open_days(
+            conn.execute(
+                "SELECT exchange, trade_date FROM canonical_trading_calendar WHERE is_open = TRUE"
+            ).fetchdf()
+        )
+
+    cache = context.get("reference_cache")
+    if isinstance(cache, ReferenceDataCache):
+        return cache.get("open_days", "canonical_trading_calendar", load)
+    return load()
+
+
+def _parse_open_days(frame: pd.DataFrame) -> pd.DataFrame:
     if frame.empty:
         return frame
     frame = frame.copy()
@@ -678,12 +996,19 @@ def _open_day_lookup(context: dict[str, Any]) -> pd.DataFrame | None:
 
 
 def _open_day_pretrade_sequence(
-    results: list[ValidationResultRecord],
+    results: _ResultChunks,
     context: dict[str, Any],
     payload: pd.DataFrame,
 ) -> None:
     """Validate that open-day pretrade_date points to the prior open day."""
 
+    if _deferred(
+        context,
+        "calendar.open_day_pretrade_sequence",
+        payload.loc[:, ["exchange", "trade_date", "is_open", "pretrade_date"]],
+        _open_day_pretrade_sequence,
+    ):
+        return
     open_days = payload[payload["is_open"].eq(True)].copy()
     if open_days.empty:
         results.append(
@@ -720,12 +1045,19 @@ def _open_day_pretrade_sequence(
 
 
 def _calendar_date_continuity(
-    results: list[ValidationResultRecord],
+    results: _ResultChunks,
     context: dict[str, Any],
     payload: pd.DataFrame,
 ) -> None:
     """Validate that each exchange has a continuous daily date spine."""
 
+    if _deferred(
+        context,
+        "calendar.date_continuity",
+        payload.loc[:, ["exchange", "trade_date"]],
+        _calendar_date_continuity,
+    ):
+        return
     frame = payload.dropna(subset=["exchange", "trade_date"]).copy()
     frame["trade_date"] = pd.to_datetime(frame["trade_date"], errors="coerce").dt.date
     missing: list[str] = []
@@ -753,7 +1085,7 @@ def _calendar_date_continuity(
 
 
 def _market_daily_change_consistency(
-    results: list[ValidationResultRecord],
+    results: _ResultChunks,
     context: dict[str, Any],
     payload: pd.DataFrame,
 ) -> None:
@@ -788,7 +1120,7 @@ def _market_daily_change_consistency(
 
 
 def _market_daily_pct_chg_consistency(
-    results: list[ValidationResultRecord],
+    results: _ResultChunks,
     context: dict[str, Any],
     payload: pd.DataFrame,
 ) -> None:
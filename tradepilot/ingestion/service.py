@@ -8,6 +8,15 @@ from loguru import logger
 
 from tradepilot.config import DATA_PROVIDER, DataProviderType
 from tradepilot.data import get_provider
+from tradepilot.data.caching_provider import DEFAULT_CACHE_RULES, CachingProvider
+from tradepilot.data.trade_ranges import (
+    market_now,
+    materialized_ranges,
+    missing_trade_ranges,
+    open_trade_days,
+    record_materialized_range,
+    record_trade_dates,
+)
 from tradepilot.db import get_conn
 from tradepilot.ingestion.models import (
     BilibiliSyncRequest,
@@ -43,6 +52,60 @@ def _insert_df(conn, table: str, columns: str, df_name: str, df) -> None:
     conn.unregister(df_name)
 
 
+def _missing_daily_ranges(
+    conn,
+    table: str,
+    code_column: str,
+    code: str,
+    start: date_cls,
+    end: date_cls,
+    full_refresh: bool = False,
+) -> list[tuple[date_cls, date_cls]]:
+    """Return the trade-date ranges a daily table still lacks for one code.
+
+    Codes synced before ranges were tracked are seeded from the dates the
+    table already holds, up to the last settled session. A full refresh
+    refetches the whole window.
+    """
+    if full_refresh:
+        return [(start, end)]
+    if not materialized_ranges(conn, table, code):
+        settled = DEFAULT_CACHE_RULES[table].last_settled_date(market_now())
+        rows = conn.execute(
+            f"SELECT date FROM {table} WHERE {code_column} = ? AND date <= ?",
+            [code, settled],
+        ).fetchall()
+        record_trade_dates(conn, table, code, [row[0] for row in rows])
+    return missing_trade_ranges(conn, table, code, start, end)
+
+
+def _record_daily_range(
+    conn, table: str, code: str, start: date_cls, end: date_cls
+) -> None:
+    """Mark a fetched range as materialized up to the last settled session."""
+    settled = DEFAULT_CACHE_RULES[table].last_settled_date(market_now())
+    record_materialized_range(conn, table, code, start, min(end, settled))
+
+
+def _gap_sessions(conn, gaps_by_code: dict) -> dict[date_cls, list[str]]:
+    """Map each open session inside the missing ranges to the codes lacking it."""
+    sessions: dict[date_cls, list[str]] = {}
+    for code, gaps in gaps_by_code.items():
+        for gap_start, gap_end in gaps:
+            for session in open_trade_days(conn, gap_start, gap_end):
+                sessions.setdefault(session, []).append(code)
+    return dict(sorted(sessions.items()))
+
+
+def _prefer_cross_section(gaps_by_code: dict, sessions: dict) -> bool:
+    """Return whether one query per session beats one query per code range.
+
+    Many codes over a short span favour market-wide trade-date queries; a
+    few codes over a long history favour per-code range queries.
+    """
+    return 0 < len(sessions) < sum(len(gaps) for gaps in gaps_by_code.values())
+
+
 class IngestionService:
     """Coordinate manual sync flows and persist run history."""
 
@@ -145,6 +208,8 @@ class IngestionService:
     def _do_market_sync(self, request: SyncRequest) -> int:
         """Fetch market data from provider and write to DuckDB."""
         provider = get_provider()
+        if request.full_refresh and isinstance(provider, CachingProvider):
+            provider = provider.refreshed()
         conn = get_conn()
 
         stock_codes = request.stock_codes
@@ -158,11 +223,29 @@ class IngestionService:
                 "stock_codes or index_codes is required when DATA_PROVIDER is not MOCK"
             )
 
+        start = date_cls.fromisoformat(request.start_date)
+        end = date_cls.fromisoformat(request.end_date)
         inserted = 0
-        for stock_code in stock_codes:
-            daily_df = provider.get_stock_daily(
-                stock_code, request.start_date, request.end_date
+        stock_gaps = {
+            stock_code: _missing_daily_ranges(
+                conn,
+                "stock_daily",
+                "stock_code",
+                stock_code,
+                start,
+                end,
+                request.full_refresh,
             )
+            for stock_code in stock_codes
+        }
+        sessions = _gap_sessions(conn, stock_gaps)
+        if self._cross_section_enabled() and _prefer_cross_section(
+            stock_gaps, sessions
+        ):
+            inserted += self._sync_stock_daily_by_date(conn, stock_gaps, sessions)
+        else:
+            inserted += self._sync_stock_daily_by_code(conn, provider, stock_gaps)
+        for stock_code in stock_codes:
             weekly_df = provider.get_stock_weekly(
                 stock_code, request.start_date, request.end_date
             )
@@ -170,21 +253,34 @@ class IngestionService:
                 stock_code, request.start_date, request.end_date
             )
 
-            _insert_df(conn, "stock_daily", _STOCK_DAILY_COLS, "tmp_daily", daily_df)
             _insert_df(
                 conn, "stock_weekly", _STOCK_WEEKLY_COLS, "tmp_weekly", weekly_df
             )
             _insert_df(
                 conn, "stock_monthly", _STOCK_MONTHLY_COLS, "tmp_monthly", monthly_df
             )
-            inserted += len(daily_df) + len(weekly_df) + len(monthly_df)
+            inserted += len(weekly_df) + len(monthly_df)
 
         for index_code in index_codes:
-            index_df = provider.get_index_daily(
-                index_code, request.start_date, request.end_date
-            )
-            _insert_df(conn, "index_daily", _INDEX_DAILY_COLS, "tmp_index", index_df)
-            inserted += len(index_df)
+            for gap_start, gap_end in _missing_daily_ranges(
+                conn,
+                "index_daily",
+                "index_code",
+                index_code,
+                start,
+                end,
+                request.full_refresh,
+            ):
+                index_df = provider.get_index_daily(
+                    index_code, gap_start.isoformat(), gap_end.isoformat()
+                )
+                if index_df.empty:
+                    continue
+                _insert_df(
+                    conn, "index_daily", _INDEX_DAILY_COLS, "tmp_index", index_df
+                )
+                _record_daily_range(conn, "index_daily", index_code, gap_start, gap_end)
+                inserted += len(index_df)
 
         inserted += self._sync_tushare_supplement(
             conn, request.start_date, request.end_date
@@ -192,6 +288,62 @@ class IngestionService:
 
         return inserted
 
+    def _cross_section_enabled(self) -> bool:
+        """Return whether stock bars may be fetched one trade date at a time."""
+        return DATA_PROVIDER == DataProviderType.TUSHARE and self._tushare.enabled
+
+    def _sync_stock_daily_by_code(self, conn, provider, stock_gaps: dict) -> int:
+        """Fetch each code's missing ranges with one provider call per range."""
+        inserted = 0
+        for stock_code, gaps in stock_gaps.items():
+            for gap_start, gap_end in gaps:
+                daily_df = provider.get_stock_daily(
+                    stock_code, gap_start.isoformat(), gap_end.isoformat()
+                )
+                # An empty answer may come from a disabled source, so it is
+                # not recorded and the range is retried on the next sync.
+                if daily_df.empty:
+                    continue
+                _insert_df(
+                    conn, "stock_daily", _STOCK_DAILY_COLS, "tmp_daily", daily_df
+                )
+                _record_daily_range(conn, "stock_daily", stock_code, gap_start, gap_end)
+                inserted += len(daily_df)
+        return inserted
+
+    def _sync_stock_daily_by_date(
+        self, conn, stock_gaps: dict, sessions: dict[date_cls, list[str]]
+    ) -> int:
+        """Fetch missing stock bars with one market-wide query per session.
+
+        A code's range is recorded once every session in it was answered, so
+        days a stock was suspended do not keep it refetching.
+        """
+        inserted = 0
+        answered: set[date_cls] = set()
+        for session, codes in sessions.items():
+            daily_df, reported = self._tushare.get_stock_daily_cross_section(
+                session.isoformat(), codes
+            )
+            if not reported:
+                continue
+            answered.add(session)
+            if daily_df.empty:
+                continue
+            _insert_df(conn, "stock_daily", _STOCK_DAILY_COLS, "tmp_daily", daily_df)
+            inserted += len(daily_df)
+        for stock_code, gaps in stock_gaps.items():
+            for gap_start, gap_end in gaps:
+                if all(
+                    session in answered
+                    for session, codes in sessions.items()
+                    if gap_start <= session <= gap_end and stock_code in codes
+                ):
+                    _record_daily_range(
+                        conn, "stock_daily", stock_code, gap_start, gap_end
+                    )
+        return inserted
+
     def _sync_tushare_supplement(self, conn, start_date: str, end_date: str) -> int:
         if not self._tushare.enabled:
             return 0
@@ -7,7 +7,11 @@ from typing import Any
 
 from loguru import logger
 
-from tradepilot.scheduler.jobs import post_market_workflow_job, pre_market_workflow_job
+from tradepilot.scheduler.jobs import (
+    lakehouse_compaction_job,
+    post_market_workflow_job,
+    pre_market_workflow_job,
+)
 
 _scheduler: Any | None = None
 
@@ -48,6 +52,12 @@ def start_scheduler() -> None:
         id="post_market_workflow",
         replace_existing=True,
     )
+    scheduler.add_job(
+        lakehouse_compaction_job,
+        cron.CronTrigger(hour=2, minute=0),
+        id="lakehouse_compaction",
+        replace_existing=True,
+    )
     scheduler.start()
     logger.info("scheduler started with {} jobs", len(scheduler.get_jobs()))
 
@@ -7,6 +7,7 @@ import time
 from loguru import logger
 
 from tradepilot.db import get_conn
+from tradepilot.etl.service import ETLService
 from tradepilot.scanner.daily import DailyScanner
 from tradepilot.workflow.models import WorkflowTrigger
 from tradepilot.workflow.service import DailyWorkflowService
@@ -97,6 +98,31 @@ def post_market_workflow_job() -> dict:
     )
 
 
+def lakehouse_compaction_job() -> dict:
+    job_name = "lakehouse_compaction"
+    started_at = datetime.now()
+    try:
+        service = ETLService()
+        results = [
+            service.compact_dataset_partitions(definition.dataset_name)
+            for definition in service.registry.list_datasets()
+            if definition.business_key_columns
+        ]
+        removed = sum(result["delta_files_removed"] for result in results)
+        _record_history(job_name, started_at, "success", removed)
+        return {
+            "status": "success",
+            "partitions_compacted": sum(
+                result["partitions_compacted"] for result in results
+            ),
+            "delta_files_removed": removed,
+        }
+    except Exception as exc:
+        logger.exception("scheduler {} failed", job_name)
+        _record_history(job_name, started_at, "failed", 0, str(exc))
+        return {"status": "failed", "error": str(exc)}
+
+
 def get_scheduler_history(limit: int = 20) -> list[dict]:
     conn = get_conn()
     rows = conn.execute(
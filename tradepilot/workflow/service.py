@@ -513,14 +513,14 @@ class DailyWorkflowService:
     def get_latest_etf_aw_context(self, as_of_date: date | None = None) -> dict | None:
         """Return the latest ETF all-weather snapshot context."""
 
-        return get_latest_etf_aw_snapshot(as_of_date=as_of_date)
+        return get_latest_etf_aw_snapshot(as_of_date=as_of_date, conn=get_conn())
 
     def get_latest_etf_aw_regime_context(
         self, as_of_date: date | None = None
     ) -> dict | None:
         """Return the latest ETF all-weather regime context."""
 
-        return get_latest_etf_aw_regime_context(as_of_date=as_of_date)
+        return get_latest_etf_aw_regime_context(as_of_date=as_of_date, conn=get_conn())
 
     def build_context_payload(self, run: WorkflowRunRecord) -> WorkflowContextPayload:
         """Convert one workflow run into the stage-1 context contract.
@@ -531,10 +531,10 @@ class DailyWorkflowService:
         """
         summary = run.summary
         etf_aw_context = get_latest_etf_aw_snapshot(
-            as_of_date=date.fromisoformat(run.workflow_date)
+            as_of_date=date.fromisoformat(run.workflow_date), conn=get_conn()
         )
         etf_aw_regime_context = get_latest_etf_aw_regime_context(
-            as_of_date=date.fromisoformat(run.workflow_date)
+            as_of_date=date.fromisoformat(run.workflow_date), conn=get_conn()
         )
         if run.phase == WorkflowPhase.POST_MARKET:
             context = {